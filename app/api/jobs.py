@@ -0,0 +1,182 @@
+"""Persistent priority job queue with a fixed number of worker threads."""
+
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional
+
+from config import JOB_DB_PATH, JOB_WORKERS, JOB_QUEUE_MAX, JOB_DEFAULT_DURATION_SEC
+
+
+class QueueFullError(Exception):
+    """Raised by JobQueue.submit when the queue is at capacity."""
+
+    def __init__(self, queued: int, estimated_wait_sec: float):
+        super().__init__(f"Job queue is full ({queued} jobs waiting)")
+        self.queued = queued
+        self.estimated_wait_sec = estimated_wait_sec
+
+
+class JobQueue:
+    """Queue of jobs persisted in SQLite and run by `workers` threads.
+
+    Higher priority jobs run first; jobs of equal priority run in submission
+    order. Queued jobs, and jobs that were running when the process died, are
+    reloaded by start() so they survive a restart.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, dict], None],
+        db_path: str = JOB_DB_PATH,
+        workers: int = JOB_WORKERS,
+        max_queued: int = JOB_QUEUE_MAX,
+    ):
+        self.handler = handler
+        self.db_path = db_path
+        self.workers = workers
+        self.max_queued = max_queued
+        self._cond = threading.Condition()
+        self._heap = []  # (-priority, seq, job_id)
+        self._params = {}
+        self._seq = itertools.count()
+        self._running = set()
+        self._threads = []
+        self._conn = None
+        self._avg_duration = float(JOB_DEFAULT_DURATION_SEC)
+        self._stopping = False
+
+    @property
+    def started(self) -> bool:
+        return bool(self._threads)
+
+    def start(self) -> List[dict]:
+        """Reload persisted jobs and start the workers.
+
+        Returns the reloaded jobs as dicts with id, params and priority.
+        """
+        with self._cond:
+            if self._threads:
+                return []
+            self._stopping = False
+            db = self._db()
+            rows = db.execute(
+                "SELECT id, params, priority FROM jobs ORDER BY created"
+            ).fetchall()
+            db.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+            db.commit()
+            restored = []
+            for job_id, params, priority in rows:
+                if job_id in self._params:
+                    continue
+                self._push(job_id, json.loads(params), priority)
+                restored.append({'id': job_id, 'params': json.loads(params), 'priority': priority})
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        if restored:
+            logging.info(f"Restored {len(restored)} queued jobs from {self.db_path}")
+        return restored
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers after their current job. Queued jobs stay persisted."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, job_id: str, params: dict, priority: int = 0) -> int:
+        """Persist and enqueue a job. Returns its 1-based queue position.
+
+        Raises QueueFullError when `max_queued` jobs are already waiting.
+        """
+        with self._cond:
+            queued = len(self._heap)
+            if queued >= self.max_queued:
+                raise QueueFullError(queued, self.estimate_wait(queued + 1))
+            db = self._db()
+            db.execute(
+                "INSERT INTO jobs (id, params, priority, status, created) VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, json.dumps(params), priority, time.time()),
+            )
+            db.commit()
+            self._push(job_id, params, priority)
+            self._cond.notify()
+            return self._position(job_id)
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position of a waiting job, or None if it is not queued."""
+        with self._cond:
+            return self._position(job_id)
+
+    def queued(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def estimate_wait(self, position: int) -> float:
+        """Rough seconds until the job at `position` starts, from recent job durations."""
+        busy = 1 if len(self._running) >= self.workers else 0
+        rounds = math.ceil(position / max(1, self.workers)) - 1 + busy
+        return round(max(0, rounds) * self._avg_duration, 1)
+
+    def _position(self, job_id: str) -> Optional[int]:
+        if job_id not in self._params:
+            return None
+        ordered = sorted(self._heap)
+        for idx, (_, _, queued_id) in enumerate(ordered):
+            if queued_id == job_id:
+                return idx + 1
+        return None
+
+    def _push(self, job_id: str, params: dict, priority: int) -> None:
+        self._params[job_id] = params
+        heapq.heappush(self._heap, (-priority, next(self._seq), job_id))
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, params TEXT NOT NULL, priority INTEGER NOT NULL, "
+                "status TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                _, _, job_id = heapq.heappop(self._heap)
+                params = self._params.pop(job_id)
+                self._running.add(job_id)
+                self._db().execute("UPDATE jobs SET status = 'running' WHERE id = ?", (job_id,))
+                self._db().commit()
+
+            started = time.monotonic()
+            try:
+                self.handler(job_id, params)
+            except Exception as e:
+                logging.error(f"Job {job_id} failed: {e}")
+
+            with self._cond:
+                self._running.discard(job_id)
+                duration = time.monotonic() - started
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+                self._db().execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                self._db().commit()
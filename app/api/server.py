@@ -4,22 +4,52 @@ API Server for Google Maps Scraper.
 Uses direct Python imports instead of subprocess calls.
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 from dataclasses import asdict
+import json
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 
-from scraper.core import scrape_places, Place
-from config import SERVER_HOST, SERVER_PORT, MIN_RESULTS_PER_CITY
+from scraper.core import iter_places, iter_places_by_url, Place, ScrapeStats
+from scraper.dedup import DedupIndex, scoped_dedup_index
+from scraper.checkpoint import JobCheckpoint
+from scraper.metrics import shared_metrics
+from scraper.place_ids import place_urls
+from scraper.tiling import grid_cells, iter_places_tiled, parse_bbox
+from scraper.response_cache import shared_response_cache
+from scraper.pool import BrowserPool
+from api.jobs import JobQueue, QueueFullError
+from api.store import create_result_store, ACTIVE_STATUSES
+from config import (
+    SERVER_HOST, SERVER_PORT, MIN_RESULTS_PER_CITY, MAX_CONCURRENT_CITIES, STREAM_KEEPALIVE_SEC,
+    PLACE_URL_CONCURRENCY, RESPONSE_CACHE, TILE_DEFAULT_ZOOM, CHECKPOINT_DB_PATH,
+)
 
 app = Flask(__name__)
 CORS(app)
 
-# Store for active search results
-active_searches = {}
+# Store for search records and results (backend selected in config.py)
+active_searches = create_result_store()
+
+# Signalled whenever a search record changes; streams wait on it
+_search_updates = threading.Condition()
+_update_seq = 0
+
+# Warm browsers reused by the city workers across searches
+browser_pool = BrowserPool()
+
+# Global limit on cities scraped at the same time, shared by all searches
+city_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CITIES, thread_name_prefix="city")
+
+# Job-level series served on /metrics next to the scraper's phase timings and events
+shared_metrics().describe('gms_searches_running', 'gauge', 'Searches being scraped right now')
+shared_metrics().describe('gms_searches_queued', 'gauge', 'Searches waiting in the job queue')
+shared_metrics().describe('gms_searches_stored', 'gauge', 'Search records held by the result store')
+shared_metrics().describe('gms_searches_finished_total', 'counter', 'Searches finished, by final status')
 
 # Path to the static directory (relative to project root)
 STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
@@ -39,8 +69,14 @@ def start_search():
         "query": "travel agency Milan",
         "maxResults": 20,
         "filters": "optional filters",
-        "cities": "Milan, Rome"
+        "cities": "Milan, Rome",
+        "dedupScope": "optional name",
+        "priority": 0
     }
+    Places are deduplicated across all cities of the search; with dedupScope,
+    also against every earlier search of that scope. Searches are queued and
+    run by a fixed number of workers. Returns 429 with a queue estimate when
+    the queue is full.
     """
     try:
         data = request.get_json()
@@ -48,6 +84,8 @@ def start_search():
         max_results = int(data.get('maxResults', 20))
         filters = data.get('filters', '').strip()
         cities = data.get('cities', '').strip()
+        dedup_scope = (data.get('dedupScope') or '').strip()
+        priority = int(data.get('priority', 0))
 
         if not query:
             return jsonify({'error': 'Search query required'}), 400
@@ -63,79 +101,304 @@ def start_search():
         total_target = max_results * len(city_list)   # total across all cities
 
         search_id = f"search_{int(time.time() * 1000)}"
-
-        active_searches[search_id] = {
-            'status': 'running',
+        params = {
             'query': query,
-            'full_query': f"{query} {filters}".strip(),
-            'max_results': max_results,
-            'min_per_city': min_per_city,
-            'total_target': total_target,
+            'filters': filters,
             'cities': city_list,
-            'start_time': datetime.now(),
-            'results': []
+            'max_results': max_results,
+            'dedup_scope': dedup_scope,
         }
 
-        thread = threading.Thread(
-            target=_run_scraper_multi_city,
-            args=(search_id, query, filters, city_list, min_per_city, max_results, total_target)
+        return _submit_search(
+            search_id, params, priority,
+            f'Search started for: {query} across {len(city_list)} cities ({min_per_city} results per city, {total_target} total)',
         )
-        thread.daemon = True
-        thread.start()
-
-        return jsonify({
-            'search_id': search_id,
-            'status': 'started',
-            'message': f'Search started for: {query} across {len(city_list)} cities ({min_per_city} results per city, {total_target} total)'
-        })
 
     except Exception as e:
         return jsonify({'error': f'Error starting search: {str(e)}'}), 500
 
 
+@app.route('/api/places', methods=['POST'])
+def start_place_refresh():
+    """
+    Re-scrape known places without searching.
+    Body: {
+        "places": ["https://www.google.com/maps/place/...", "ChIJ..."],
+        "concurrency": 4,
+        "priority": 0
+    }
+    Each place URL or place ID is opened directly and extracted. The job is
+    queued like a search and read through the same status/results/stream
+    endpoints.
+    """
+    try:
+        data = request.get_json()
+        refs = data.get('places') or []
+        concurrency = int(data.get('concurrency', PLACE_URL_CONCURRENCY))
+        priority = int(data.get('priority', 0))
+
+        if not isinstance(refs, list):
+            return jsonify({'error': 'places must be a list of place URLs or IDs'}), 400
+        try:
+            urls = place_urls(refs)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if not urls:
+            return jsonify({'error': 'At least one place URL or ID required'}), 400
+        if concurrency < 1:
+            return jsonify({'error': 'concurrency must be at least 1'}), 400
+
+        search_id = f"places_{int(time.time() * 1000)}"
+        params = {
+            'kind': 'places',
+            'places': urls,
+            'concurrency': concurrency,
+        }
+        return _submit_search(search_id, params, priority, f'Refresh started for {len(urls)} places')
+
+    except Exception as e:
+        return jsonify({'error': f'Error starting place refresh: {str(e)}'}), 500
+
+
+@app.route('/api/area', methods=['POST'])
+def start_area_search():
+    """
+    Search a whole area by tiling it into map viewports.
+    Body: {
+        "query": "bakeries",
+        "bbox": [43.58, -79.64, 43.86, -79.12],   (south, west, north, east; or "S,W,N,E")
+        "zoom": 14,
+        "maxResults": 0,                           (0 = everything in the area)
+        "filters": "optional filters",
+        "dedupScope": "optional name",
+        "priority": 0
+    }
+    Each viewport cell is searched separately and cells that hit the feed cap
+    are subdivided; places are deduplicated across cells (and, with
+    dedupScope, against earlier searches of that scope). Read the job through
+    the usual status/results/stream endpoints.
+    """
+    try:
+        data = request.get_json()
+        query = data.get('query', '').strip()
+        filters = data.get('filters', '').strip()
+        max_results = int(data.get('maxResults', 0))
+        zoom = float(data.get('zoom', TILE_DEFAULT_ZOOM))
+        dedup_scope = (data.get('dedupScope') or '').strip()
+        priority = int(data.get('priority', 0))
+
+        if not query:
+            return jsonify({'error': 'Search query required'}), 400
+        try:
+            bbox = parse_bbox(data.get('bbox') or '')
+            cells = grid_cells(bbox, zoom)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        search_id = f"area_{int(time.time() * 1000)}"
+        params = {
+            'kind': 'area',
+            'query': query,
+            'filters': filters,
+            'bbox': list(bbox),
+            'zoom': zoom,
+            'max_results': max_results,
+            'dedup_scope': dedup_scope,
+        }
+        return _submit_search(search_id, params, priority,
+                              f'Area search started for: {query} over {len(cells)} cells at zoom {zoom:g}')
+
+    except Exception as e:
+        return jsonify({'error': f'Error starting area search: {str(e)}'}), 500
+
+
+def _submit_search(search_id, params, priority, message):
+    """Register a search and queue it; 429 with a wait estimate when the queue is full."""
+    _ensure_job_queue()
+    # A resumed search already has a record, which a rejected resume keeps
+    previous = active_searches.get(search_id)
+    _register_search(search_id, params)
+    try:
+        position = job_queue.submit(search_id, params, priority=priority)
+    except QueueFullError as e:
+        if previous is not None:
+            active_searches[search_id] = previous
+        else:
+            del active_searches[search_id]
+        response = jsonify({
+            'error': 'Too many searches queued, try again later',
+            'queue_length': e.queued,
+            'estimated_wait_sec': e.estimated_wait_sec,
+        })
+        response.headers['Retry-After'] = str(int(e.estimated_wait_sec) or 1)
+        return response, 429
+
+    return jsonify({
+        'search_id': search_id,
+        'status': 'started',
+        'queue_position': position,
+        'estimated_wait_sec': job_queue.estimate_wait(position),
+        'message': message,
+    })
+
+
 @app.route('/api/search/<search_id>/status', methods=['GET'])
 def get_search_status(search_id):
     """Check search status."""
     try:
-        if search_id not in active_searches:
+        search_info = active_searches.summary(search_id)
+        if search_info is None:
             return jsonify({'error': 'Search not found'}), 404
 
-        search_info = active_searches[search_id]
+        return jsonify(_status_payload(search_id, search_info))
 
-        status_response = {
-            'search_id': search_id,
-            'status': search_info['status'],
-            'query': search_info['query'],
-            'results_count': len(search_info['results']),
-            'elapsed_time': str(datetime.now() - search_info['start_time'])
-        }
+    except Exception as e:
+        return jsonify({'error': f'Error checking status: {str(e)}'}), 500
+
+
+@app.route('/api/search/<search_id>/resume', methods=['POST'])
+def resume_search(search_id):
+    """
+    Resume a search that stopped before finishing, from its checkpoint.
+    Body (optional): {"priority": 0}
+    Places and cities saved before the stop are kept and only the rest is
+    scraped. Works for searches that failed, lost cities to errors or were
+    cut short by a crash. 404 if the search has no checkpoint, 409 while it is
+    still queued or running.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        priority = int(data.get('priority', 0))
 
-        if 'cities' in search_info and search_info['status'] == 'running':
-            current_city = search_info.get('current_city', 'Starting...')
-            total_target = search_info.get('total_target', search_info.get('max_results', 0))
-            status_response['current_city'] = current_city
-            status_response['target_total'] = total_target
-            status_response['progress'] = f"{len(search_info['results'])}/{total_target}"
+        search_info = active_searches.get(search_id)
+        if search_info is not None and search_info['status'] in ACTIVE_STATUSES:
+            return jsonify({'error': 'Search is still queued or running'}), 409
+        params = _job_checkpoint(search_id).params()
+        if params is None:
+            return jsonify({'error': 'No checkpoint for this search'}), 404
 
-        return jsonify(status_response)
+        return _submit_search(search_id, params, priority, f'Search {search_id} resumed from its checkpoint')
 
     except Exception as e:
-        return jsonify({'error': f'Error checking status: {str(e)}'}), 500
+        return jsonify({'error': f'Error resuming search: {str(e)}'}), 500
+
+
+def _status_payload(search_id, search_info):
+    """Status response of a search, from its record summary (see ResultStore.summary)."""
+    status_response = {
+        'search_id': search_id,
+        'status': search_info['status'],
+        'query': search_info['query'],
+        'results_count': search_info['results_count'],
+        'elapsed_time': str(datetime.now() - search_info['start_time'])
+    }
+
+    if search_info['status'] == 'queued':
+        position = job_queue.position(search_id)
+        if position is not None:
+            status_response['queue_position'] = position
+            status_response['estimated_wait_sec'] = job_queue.estimate_wait(position)
+
+    if 'cities' in search_info and search_info['status'] == 'running':
+        current_city = search_info.get('current_city', 'Starting...')
+        total_target = search_info.get('total_target', search_info.get('max_results', 0))
+        status_response['current_city'] = current_city
+        status_response['target_total'] = total_target
+        status_response['progress'] = f"{search_info['results_count']}/{total_target}"
+        if 'cities_progress' in search_info:
+            status_response['cities_progress'] = search_info['cities_progress']
+
+    if 'cache_hits' in search_info:
+        status_response['cache_hits'] = search_info['cache_hits']
+        status_response['fresh_results'] = search_info['fresh_results']
+
+    if 'summary' in search_info:
+        status_response['summary'] = search_info['summary']
+
+    if 'error' in search_info:
+        status_response['error'] = search_info['error']
+
+    return status_response
+
+
+@app.route('/api/search/<search_id>/stream', methods=['GET'])
+def stream_search_results(search_id):
+    """
+    Stream a search's results as they are scraped.
+    Server-Sent Events by default ("result", "status" and "done" events);
+    ?format=ndjson sends one JSON object per line instead. Clients can resume
+    with the Last-Event-ID header or ?from=<number of results already received>.
+    """
+    if search_id not in active_searches:
+        return jsonify({'error': 'Search not found'}), 404
+
+    ndjson = (request.args.get('format') == 'ndjson'
+              or 'application/x-ndjson' in request.headers.get('Accept', ''))
+    try:
+        sent = int(request.headers.get('Last-Event-ID') or request.args.get('from', 0))
+    except ValueError:
+        sent = 0
+
+    def encode(event, data, event_id=None):
+        if ndjson:
+            return json.dumps({'type': event, **data}) + '\n'
+        message = f"event: {event}\n"
+        if event_id is not None:
+            message += f"id: {event_id}\n"
+        return message + f"data: {json.dumps(data)}\n\n"
+
+    def generate(sent):
+        last_status = None
+        while True:
+            with _search_updates:
+                seen_seq = _update_seq
+            # Status first: rows are all appended before a search is marked finished
+            search_info = active_searches.summary(search_id)
+            if search_info is None:
+                return
+
+            # Only the rows not sent yet are read
+            for result in active_searches.results(search_id, sent):
+                sent += 1
+                yield encode('result', {'index': sent, 'result': result}, sent)
+
+            status = _status_payload(search_id, search_info)
+            # elapsed_time changes on every call; only resend on real changes
+            comparable = {k: v for k, v in status.items() if k != 'elapsed_time'}
+            if comparable != last_status:
+                yield encode('status', status)
+                last_status = comparable
+
+            if search_info['status'] not in ACTIVE_STATUSES:
+                yield encode('done', {
+                    'status': search_info['status'],
+                    'total_results': search_info['results_count'],
+                    'error': search_info.get('error'),
+                })
+                return
+
+            with _search_updates:
+                changed = _search_updates.wait_for(lambda: _update_seq != seen_seq, timeout=STREAM_KEEPALIVE_SEC)
+            if not changed and not ndjson:
+                yield ": keepalive\n\n"
+
+    mimetype = 'application/x-ndjson' if ndjson else 'text/event-stream'
+    return Response(generate(sent), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @app.route('/api/search/<search_id>/results', methods=['GET'])
 def get_search_results(search_id):
     """Get search results."""
     try:
-        if search_id not in active_searches:
+        search_info = active_searches.get(search_id)
+        if search_info is None:
             return jsonify({'error': 'Search not found'}), 404
 
-        search_info = active_searches[search_id]
-
-        if search_info['status'] == 'running':
+        if search_info['status'] in ('queued', 'running'):
             return jsonify({
                 'search_id': search_id,
-                'status': 'running',
+                'status': search_info['status'],
                 'message': 'Search still in progress...',
                 'results': []
             })
@@ -152,8 +415,11 @@ def get_search_results(search_id):
         return jsonify({'error': f'Error retrieving results: {str(e)}'}), 500
 
 
-def _place_to_result_dict(place: Place, city: str) -> dict:
-    """Convert a Place dataclass to the API result dict format."""
+def _place_to_result_dict(place: Place, city: str, cached: bool = False) -> dict:
+    """Convert a Place dataclass to the API result dict format.
+
+    `cached` marks places served from the place cache instead of scraped now.
+    """
     return {
         'name': place.name,
         'address': place.address,
@@ -163,103 +429,370 @@ def _place_to_result_dict(place: Place, city: str) -> dict:
         'reviews': f"{place.reviews_count or 0} reviews",
         'hours': place.opens_at,
         'city': city,
+        'place_id': place.place_id,
+        'cached': cached,
     }
 
 
-def _run_scraper_multi_city(search_id, query, filters, cities, min_per_city, max_results, total_target):
-    """Run the scraper across multiple cities using direct function calls."""
-    try:
-        print(f"Starting multi-city scraping for: {query}")
-        print(f"Target cities: {', '.join(cities)}")
-        print(f"Target: {total_target} total results, ~{min_per_city} per city")
+def _update_search(search_id, **fields):
+    """Update a search record and wake up its result streams."""
+    active_searches.update(search_id, **fields)
+    _notify_search_update()
 
-        all_results = []
 
-        for city_idx, city in enumerate(cities):
-            try:
-                print(f"Processing city {city_idx + 1}/{len(cities)}: {city}")
+def _append_search_results(search_id, rows):
+    """Append results to a search record and wake up its result streams."""
+    active_searches.append_results(search_id, rows)
+    _notify_search_update()
 
-                city_query = f"{query} {city}"
-                if filters:
-                    city_query += f" {filters}"
 
-                # Each city gets exactly min_per_city results
-                city_target = min_per_city
+def _notify_search_update():
+    global _update_seq
+    with _search_updates:
+        _update_seq += 1
+        _search_updates.notify_all()
 
-                print(f"Target for this city: {city_target} results")
 
-                # Direct function call instead of subprocess
-                places = scrape_places(city_query, city_target)
+def _register_search(search_id, params):
+    """Create the active_searches record for a queued search."""
+    if params.get('kind') == 'places':
+        active_searches[search_id] = {
+            'status': 'queued',
+            'query': f"{len(params['places'])} known places",
+            'total_target': len(params['places']),
+            'start_time': datetime.now(),
+            'results': []
+        }
+        return
+    if params.get('kind') == 'area':
+        active_searches[search_id] = {
+            'status': 'queued',
+            'query': params['query'],
+            'full_query': f"{params['query']} {params['filters']}".strip(),
+            'bbox': params['bbox'],
+            'zoom': params['zoom'],
+            'total_target': params['max_results'],
+            'start_time': datetime.now(),
+            'results': []
+        }
+        return
+    city_list = params['cities']
+    max_results = params['max_results']
+    active_searches[search_id] = {
+        'status': 'queued',
+        'query': params['query'],
+        'full_query': f"{params['query']} {params['filters']}".strip(),
+        'max_results': max_results,
+        'min_per_city': max_results,
+        'total_target': max_results * len(city_list),
+        'cities': city_list,
+        'start_time': datetime.now(),
+        'results': []
+    }
 
-                city_results = [_place_to_result_dict(place, city) for place in places if place.name]
-                all_results.extend(city_results)
 
-                print(f"City {city} completed: {len(city_results)} results (total so far: {len(all_results)})")
+def _run_search_job(search_id, params):
+    """Job queue handler: run a queued multi-city search."""
+    if search_id not in active_searches:
+        _register_search(search_id, params)
+    _update_search(search_id, status='running', start_time=datetime.now())
+    metrics = shared_metrics()
+    metrics.inc('gms_searches_running', 1)
+    try:
+        # Progress is checkpointed, so a job restarted with this ID resumes where it stopped
+        checkpoint = _job_checkpoint(search_id)
+        checkpoint.save_params(params)
+        if params.get('kind') == 'places':
+            _run_scraper_places(search_id, params['places'], params['concurrency'], checkpoint=checkpoint)
+            return
+        dedup = _job_dedup_index(params)
+        if params.get('kind') == 'area':
+            _run_scraper_area(search_id, f"{params['query']} {params['filters']}".strip(),
+                              params['bbox'], params['zoom'], params['max_results'], dedup=dedup,
+                              checkpoint=checkpoint)
+            return
+        search_info = active_searches[search_id]
+        _run_scraper_multi_city(
+            search_id, params['query'], params['filters'], params['cities'],
+            search_info['min_per_city'], search_info['max_results'], search_info['total_target'],
+            dedup=dedup, checkpoint=checkpoint,
+        )
+    finally:
+        metrics.inc('gms_searches_running', -1)
+        record = active_searches.get(search_id)
+        metrics.inc('gms_searches_finished_total', 1, status=record['status'] if record else 'unknown')
 
-                active_searches[search_id]['results'] = all_results
-                active_searches[search_id]['current_city'] = f"{city_idx + 1}/{len(cities)} - {city}"
 
-            except Exception as e:
-                print(f"Error during scraping city {city}: {str(e)}")
-                continue
+def _job_checkpoint(search_id):
+    return JobCheckpoint(search_id, db_path=CHECKPOINT_DB_PATH)
+
+
+def _job_dedup_index(params):
+    """The DedupIndex of a job: its dedup scope's persistent index, or a new one for this job only."""
+    scope = params.get('dedup_scope')
+    return scoped_dedup_index(scope) if scope else DedupIndex()
+
 
-        # If we don't have enough results, do additional scraping on first few cities
-        if len(all_results) < total_target:
-            print(f"Insufficient results: {len(all_results)}/{total_target}. Running additional scraping...")
+def _ensure_job_queue():
+    """Start the job queue on first use, re-registering searches persisted before a restart."""
+    if job_queue.started:
+        return
+    with _job_queue_lock:
+        if job_queue.started:
+            return
+        for job in job_queue.start():
+            _register_search(job['id'], job['params'])
 
-            for city in cities[:2]:
-                try:
-                    needed = total_target - len(all_results)
-                    if needed <= 0:
-                        break
 
-                    print(f"Additional scraping for {city}: target {needed} additional results")
+def _city_query(query, city, filters):
+    city_query = f"{query} {city}"
+    if filters:
+        city_query += f" {filters}"
+    return city_query
 
-                    city_query = f"{query} {city}"
-                    if filters:
-                        city_query += f" {filters}"
 
-                    places = scrape_places(city_query, needed + 10)
+def _run_scraper_places(search_id, urls, concurrency, checkpoint=None):
+    """Open known place URLs directly and publish each place as it is extracted.
+
+    Places saved in `checkpoint` are republished and their URLs not opened again.
+    """
+    try:
+        restored = [place for place, _, _ in checkpoint.places()] if checkpoint is not None else []
+        if restored:
+            done = checkpoint.urls()
+            urls = [url for url in urls if url not in done]
+            print(f"Resuming {search_id}: {len(restored)} places already refreshed")
+            _append_search_results(search_id, [_place_to_result_dict(place, '') for place in restored])
+        print(f"Refreshing {len(urls)} known places on {concurrency} tabs")
+        # Run on a city worker so the pooled browser stays on one thread
+        stats = ScrapeStats()
+
+        def run():
+            # Checkpointed under the input URL, whatever ID the page it landed on shows
+            for url, place in iter_places_by_url(urls, concurrency=concurrency, pool=browser_pool, stats=stats,
+                                                 with_urls=True):
+                if checkpoint is not None:
+                    checkpoint.add_place(place, url=url)
+                active_searches.update(search_id, summary=stats.summary())
+                _append_search_results(search_id, [_place_to_result_dict(place, '')])
+
+        try:
+            city_executor.submit(run).result()
+        finally:
+            active_searches.update(search_id, summary=stats.summary())
+        _update_search(search_id, status='completed')
+        if checkpoint is not None:
+            checkpoint.clear()
+        print(f"Place refresh completed: {len(active_searches[search_id]['results'])} places")
+    except Exception as e:
+        _update_search(search_id, status='error', error=str(e))
+        print(f"Error during place refresh: {str(e)}")
+
+
+def _run_scraper_area(search_id, query, bbox, zoom, max_results, dedup=None, checkpoint=None):
+    """Tile the bounding box, search every cell and publish each unique place as it arrives.
+
+    Places saved in `checkpoint` are republished and skipped by the cells.
+    """
+    dedup = dedup if dedup is not None else DedupIndex()
+    try:
+        restored = checkpoint.places() if checkpoint is not None else []
+        if restored:
+            print(f"Resuming {search_id}: {len(restored)} places already collected")
+            for place, _, _ in restored:
+                dedup.add(place)
+            _append_search_results(search_id, [_place_to_result_dict(place, '', cached=cached)
+                                               for place, _, cached in restored])
+        if max_results and len(restored) >= max_results:
+            _update_search(search_id, status='completed')
+            if checkpoint is not None:
+                checkpoint.clear()
+            return
+        print(f"Starting area search for: {query} (bbox {bbox}, zoom {zoom:g})")
+        stats = ScrapeStats()
+        # Cells run on the city workers, so area and city searches share the global browser limit
+        places = iter_places_tiled(query, bbox, zoom=zoom, total=(max_results - len(restored)) if max_results else None,
+                                   pool=browser_pool, stats=stats, executor=city_executor, dedup=dedup)
+        try:
+            for place in places:
+                cached = place.place_id in stats.cached_place_ids
+                if checkpoint is not None:
+                    checkpoint.add_place(place, cached=cached)
+                active_searches.update(search_id, summary=stats.summary())
+                _append_search_results(search_id, [_place_to_result_dict(place, '', cached=cached)])
+        finally:
+            places.close()
+            active_searches.update(search_id, summary=stats.summary())
+        _update_search(search_id, status='completed')
+        if checkpoint is not None:
+            checkpoint.clear()
+        print(f"Area search completed: {len(active_searches[search_id]['results'])} places")
+    except Exception as e:
+        _update_search(search_id, status='error', error=str(e))
+        print(f"Error during area search: {str(e)}")
 
-                    for place in places:
-                        if not place.name:
-                            continue
-                        # Simple duplicate check
-                        is_duplicate = any(
-                            r['name'] == place.name and r['address'] == place.address
-                            for r in all_results
-                        )
-                        if not is_duplicate:
-                            all_results.append(_place_to_result_dict(place, city))
 
-                    print(f"Additional scraping {city} complete")
+def _run_scraper_multi_city(search_id, query, filters, cities, min_per_city, max_results, total_target,
+                            dedup=None, checkpoint=None):
+    """Run the scraper across multiple cities, several cities at a time.
 
-                except Exception as e:
-                    print(f"Error in additional scraping for {city}: {str(e)}")
-                    continue
+    Each place is published to the result store as soon as it is scraped, so
+    results are in arrival order and only ever appended. Every city shares
+    `dedup`, so a place is published once per job.
 
-        active_searches[search_id]['status'] = 'completed'
-        active_searches[search_id]['results'] = all_results
+    With a JobCheckpoint, every place and completed city is saved as it
+    happens. A job resumed from its checkpoint publishes the saved places
+    first, skips the completed cities and asks the other cities only for the
+    places they still miss. The checkpoint is deleted once every city has
+    completed.
+    """
+    dedup = dedup if dedup is not None else DedupIndex()
+    try:
+        print(f"Starting multi-city scraping for: {query}")
+        print(f"Target cities: {', '.join(cities)}")
+        print(f"Target: {total_target} total results, ~{min_per_city} per city")
 
-        total_found = len(all_results)
+        cities_progress = {city: {'status': 'pending', 'results': 0} for city in cities}
+        lock = threading.Lock()
+        # Rows live in the result store only; these counts are all the runner keeps
+        counts = {'cache_hits': 0, 'fresh_results': 0}
+
+        def found():
+            return counts['cache_hits'] + counts['fresh_results']
+
+        # Resume: republish the saved places (their listings are skipped from now
+        # on) and mark the completed cities
+        restored = checkpoint.places() if checkpoint is not None else []
+        completed = checkpoint.completed_cities() if checkpoint is not None else {}
+        for place, city, cached in restored:
+            dedup.add(place)
+            counts['cache_hits' if cached else 'fresh_results'] += 1
+            if city in cities_progress:
+                cities_progress[city]['results'] += 1
+        for city, results in completed.items():
+            if city in cities_progress:
+                cities_progress[city] = {'status': 'completed', 'results': results}
+        if restored or completed:
+            print(f"Resuming {search_id}: {len(restored)} results and {len(completed)} cities already done")
+            _append_search_results(search_id, [_place_to_result_dict(place, city, cached=cached)
+                                               for place, city, cached in restored])
+            active_searches.update(search_id, **counts)
+        _update_search(search_id, cities_progress={c: dict(p) for c, p in cities_progress.items()})
+
+        def set_city_status(city, status, results=None):
+            # Caller holds `lock`
+            cities_progress[city]['status'] = status
+            if results is not None:
+                cities_progress[city]['results'] = results
+            done = sum(1 for p in cities_progress.values() if p['status'] in ('completed', 'error'))
+            running = [c for c, p in cities_progress.items() if p['status'] == 'running']
+            _update_search(
+                search_id,
+                cities_progress={c: dict(p) for c, p in cities_progress.items()},
+                current_city=f"{done}/{len(cities)} done" + (f" - {', '.join(running)}" if running else ""),
+            )
+
+        # One ScrapeStats per iter_places run; their totals are the job summary in /status
+        job_stats = []
+
+        def new_stats():
+            stats = ScrapeStats()
+            with lock:
+                job_stats.append(stats)
+            return stats
+
+        def job_summary():
+            # Caller holds `lock`
+            return ScrapeStats.combined(job_stats).summary()
+
+        def publish(place, city, cached):
+            # Caller holds `lock`
+            row = _place_to_result_dict(place, city, cached=cached)
+            if checkpoint is not None:
+                checkpoint.add_place(place, city, cached)
+            counts['cache_hits' if cached else 'fresh_results'] += 1
+            active_searches.update(search_id, summary=job_summary(), **counts)
+            _append_search_results(search_id, [row])
+
+        def run_city(city):
+            with lock:
+                city_count = cities_progress[city]['results']
+                set_city_status(city, 'running')
+            try:
+                print(f"Processing city: {city} (target {min_per_city} results)")
+                # Each city gets up to min_per_city results; iter_places keeps scrolling
+                # until it has them or the feed ends, so a short city is not retried
+                stats = new_stats()
+                if city_count < min_per_city:
+                    for place in iter_places(_city_query(query, city, filters), min_per_city - city_count,
+                                             pool=browser_pool, stats=stats, dedup=dedup):
+                        with lock:
+                            city_count += 1
+                            publish(place, city, place.place_id in stats.cached_place_ids)
+                            cities_progress[city]['results'] = city_count
+            except Exception as e:
+                print(f"Error during scraping city {city}: {str(e)}")
+                with lock:
+                    set_city_status(city, 'error')
+                return
+
+            with lock:
+                if checkpoint is not None:
+                    checkpoint.complete_city(city, city_count)
+                set_city_status(city, 'completed', city_count)
+                print(f"City {city} completed: {city_count} results (total so far: {found()})")
+
+        pending = [city for city in cities if city not in completed]
+        wait([city_executor.submit(run_city, city) for city in pending])
+
+        with lock:
+            summary = job_summary()
+            failed = [city for city, p in cities_progress.items() if p['status'] == 'error']
+        _update_search(search_id, status='completed', summary=summary)
+        if checkpoint is not None and not failed:
+            checkpoint.clear()
+
+        total_found = found()
         if total_found >= total_target:
             print(f"Multi-city scraping completed: {total_found} total results. Target reached ({total_target})")
         else:
             print(f"Multi-city scraping completed: {total_found} total results. Partial target ({total_found}/{total_target})")
+        if failed:
+            print(f"Failed cities kept in the checkpoint, resume {search_id} to retry: {', '.join(failed)}")
 
     except Exception as e:
-        active_searches[search_id]['status'] = 'error'
-        active_searches[search_id]['error'] = str(e)
+        _update_search(search_id, status='error', error=str(e))
         print(f"General error during multi-city scraping: {str(e)}")
 
 
+# Searches are run by a fixed pool of workers, started on first use
+job_queue = JobQueue(handler=_run_search_job)
+_job_queue_lock = threading.Lock()
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss counters and size of the on-disk response cache."""
+    return jsonify({'enabled': RESPONSE_CACHE, **shared_response_cache().stats()})
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics: phase timings and scrape events of all jobs, plus job gauges."""
+    metrics = shared_metrics()
+    metrics.set('gms_searches_queued', job_queue.queued())
+    metrics.set('gms_searches_stored', len(active_searches))
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'active_searches': len(active_searches)
+        'active_searches': len(active_searches),
+        'queued_searches': job_queue.queued()
     })
 
 
@@ -270,11 +803,17 @@ def run_server():
     print(f"Web interface at: http://localhost:{SERVER_PORT}")
     print("API endpoints:")
     print("   POST /api/search - Start search")
+    print("   POST /api/places - Re-scrape known place URLs/IDs")
+    print("   POST /api/area - Search a bounding box tile by tile")
     print("   GET /api/search/<id>/status - Search status")
     print("   GET /api/search/<id>/results - Search results")
+    print("   GET /api/search/<id>/stream - Stream results (SSE or ?format=ndjson)")
+    print("   GET /api/cache/stats - Response cache statistics")
+    print("   GET /metrics - Prometheus metrics (phase timings, retries, skips)")
     print("   GET /health - Health check")
     print("\n" + "=" * 50)
 
+    _ensure_job_queue()
     app.run(host=SERVER_HOST, port=SERVER_PORT, debug=False, use_reloader=False)
 
 
@@ -0,0 +1,336 @@
+"""Result stores for search records (status, progress and results).
+
+MemoryResultStore keeps records in process with TTL and LRU eviction of
+finished searches, optionally spilling evicted records to a SQLiteResultStore
+so they stay readable. SQLiteResultStore keeps every record on disk, with
+its result rows in their own table so appending a row does not rewrite the
+record.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from config import (
+    RESULT_STORE_BACKEND, RESULT_DB_PATH, RESULT_TTL_SEC, RESULT_MAX_FINISHED,
+    RESULT_SPILL_TO_DISK,
+)
+from scraper.sqlite_util import LazySQLite
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS results ("
+    "id TEXT PRIMARY KEY, record TEXT NOT NULL, finished INTEGER NOT NULL, updated REAL NOT NULL);"
+    "CREATE TABLE IF NOT EXISTS result_rows ("
+    "id TEXT NOT NULL, seq INTEGER NOT NULL, row TEXT NOT NULL, PRIMARY KEY (id, seq));"
+)
+
+# Statuses of searches that are still being worked on; everything else is finished
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+def _is_finished(record: dict) -> bool:
+    return record.get('status') not in ACTIVE_STATUSES
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode(obj: dict):
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+class ResultStore(ABC):
+    """Dict-like interface shared by the result store backends.
+
+    Records must be changed through update() and append_results(); records
+    returned by a disk backend are copies.
+    """
+
+    @abstractmethod
+    def get(self, search_id: str) -> Optional[dict]:
+        """The full record, results included, or None."""
+
+    @abstractmethod
+    def __setitem__(self, search_id: str, record: dict) -> None:
+        pass
+
+    @abstractmethod
+    def __delitem__(self, search_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def update(self, search_id: str, **fields) -> None:
+        """Set fields of a record; raises KeyError if it does not exist."""
+
+    @abstractmethod
+    def append_results(self, search_id: str, rows: list) -> None:
+        """Add result rows to a record (ignored if it does not exist)."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def summary(self, search_id: str) -> Optional[dict]:
+        """The record without its results, with their number as results_count, or None."""
+        record = self.get(search_id)
+        if record is None:
+            return None
+        summary = {k: v for k, v in record.items() if k != 'results'}
+        summary['results_count'] = len(record.get('results', []))
+        return summary
+
+    def results(self, search_id: str, start: int = 0) -> list:
+        """Result rows of a record from index `start` on."""
+        record = self.get(search_id)
+        return record.get('results', [])[start:] if record is not None else []
+
+    def __getitem__(self, search_id: str) -> dict:
+        record = self.get(search_id)
+        if record is None:
+            raise KeyError(search_id)
+        return record
+
+    def __contains__(self, search_id: str) -> bool:
+        return self.get(search_id) is not None
+
+
+class MemoryResultStore(ResultStore):
+    """In-process store that evicts finished searches by TTL and LRU order.
+
+    Running and queued searches are never evicted. Evicted records are written
+    to `spill` when one is given, and read back from it on lookup.
+    """
+
+    def __init__(
+        self,
+        ttl: float = RESULT_TTL_SEC,
+        max_finished: int = RESULT_MAX_FINISHED,
+        spill: Optional[ResultStore] = None,
+    ):
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self.spill = spill
+        self._records = OrderedDict()
+        self._finished_at = {}
+        self._lock = threading.RLock()
+
+    def get(self, search_id: str) -> Optional[dict]:
+        with self._lock:
+            self._evict()
+            record = self._records.get(search_id)
+            if record is not None:
+                self._records.move_to_end(search_id)
+                return record
+        if self.spill is not None:
+            return self.spill.get(search_id)
+        return None
+
+    def __setitem__(self, search_id: str, record: dict) -> None:
+        with self._lock:
+            self._records[search_id] = record
+            self._records.move_to_end(search_id)
+            self._track(search_id, record)
+            self._evict()
+
+    def __delitem__(self, search_id: str) -> None:
+        with self._lock:
+            self._records.pop(search_id, None)
+            self._finished_at.pop(search_id, None)
+        if self.spill is not None and search_id in self.spill:
+            del self.spill[search_id]
+
+    def update(self, search_id: str, **fields) -> None:
+        with self._lock:
+            record = self._records.get(search_id)
+            if record is None:
+                if self.spill is not None and search_id in self.spill:
+                    self.spill.update(search_id, **fields)
+                    return
+                raise KeyError(search_id)
+            record.update(fields)
+            self._track(search_id, record)
+            self._evict()
+
+    def append_results(self, search_id: str, rows: list) -> None:
+        with self._lock:
+            record = self._records.get(search_id)
+            if record is not None:
+                record.setdefault('results', []).extend(rows)
+                return
+        if self.spill is not None:
+            self.spill.append_results(search_id, rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._finished_at.clear()
+
+    def _track(self, search_id: str, record: dict) -> None:
+        if _is_finished(record):
+            self._finished_at.setdefault(search_id, time.monotonic())
+        else:
+            self._finished_at.pop(search_id, None)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [sid for sid, at in self._finished_at.items() if now - at >= self.ttl]
+        for search_id in expired:
+            self._evict_one(search_id)
+        if len(self._finished_at) > self.max_finished:
+            # Least recently used finished searches first
+            finished = [sid for sid in self._records if sid in self._finished_at]
+            for search_id in finished[:len(finished) - self.max_finished]:
+                self._evict_one(search_id)
+
+    def _evict_one(self, search_id: str) -> None:
+        record = self._records.pop(search_id, None)
+        self._finished_at.pop(search_id, None)
+        if record is not None and self.spill is not None:
+            self.spill[search_id] = record
+
+
+class SQLiteResultStore(ResultStore):
+    """Store that keeps every record as JSON in a SQLite database.
+
+    Result rows are kept one per row in their own table, so appending them
+    and reading the new ones costs the same however many a record holds.
+    Finished records older than `ttl` seconds are purged on writes, if ttl
+    is given.
+    """
+
+    def __init__(self, db_path: str = RESULT_DB_PATH, ttl: Optional[float] = None):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._db = LazySQLite(db_path, _SCHEMA)
+
+    def _record(self, db: sqlite3.Connection, search_id: str) -> Optional[dict]:
+        row = db.execute("SELECT record FROM results WHERE id = ?", (search_id,)).fetchone()
+        return json.loads(row[0], object_hook=_decode) if row is not None else None
+
+    def _write_record(self, db: sqlite3.Connection, search_id: str, record: dict) -> None:
+        db.execute(
+            "INSERT OR REPLACE INTO results (id, record, finished, updated) VALUES (?, ?, ?, ?)",
+            (search_id, json.dumps(record, default=_encode), int(_is_finished(record)), time.time()),
+        )
+
+    def _write_rows(self, db: sqlite3.Connection, search_id: str, rows: list, start: int) -> None:
+        db.executemany("INSERT INTO result_rows (id, seq, row) VALUES (?, ?, ?)",
+                       [(search_id, start + i, json.dumps(row, default=_encode)) for i, row in enumerate(rows)])
+
+    def _count(self, db: sqlite3.Connection, search_id: str) -> int:
+        # Rows are numbered from 0 without gaps, so this is an index lookup instead of a scan
+        return db.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM result_rows WHERE id = ?",
+                          (search_id,)).fetchone()[0]
+
+    def get(self, search_id: str) -> Optional[dict]:
+        with self._lock:
+            db = self._db(create=False)
+            record = self._record(db, search_id) if db is not None else None
+            if record is None:
+                return None
+            record['results'] = self.results(search_id)
+        return record
+
+    def summary(self, search_id: str) -> Optional[dict]:
+        with self._lock:
+            db = self._db(create=False)
+            record = self._record(db, search_id) if db is not None else None
+            if record is None:
+                return None
+            record['results_count'] = self._count(db, search_id)
+        return record
+
+    def results(self, search_id: str, start: int = 0) -> list:
+        with self._lock:
+            db = self._db(create=False)
+            if db is None:
+                return []
+            rows = db.execute("SELECT row FROM result_rows WHERE id = ? AND seq >= ? ORDER BY seq",
+                              (search_id, start)).fetchall()
+        return [json.loads(row, object_hook=_decode) for (row,) in rows]
+
+    def __setitem__(self, search_id: str, record: dict) -> None:
+        record = dict(record)
+        rows = record.pop('results', [])
+        with self._lock:
+            db = self._db()
+            self._write_record(db, search_id, record)
+            db.execute("DELETE FROM result_rows WHERE id = ?", (search_id,))
+            self._write_rows(db, search_id, rows, 0)
+            if self.ttl is not None:
+                expired = [(sid,) for (sid,) in db.execute(
+                    "SELECT id FROM results WHERE finished = 1 AND updated < ?", (time.time() - self.ttl,))]
+                db.executemany("DELETE FROM results WHERE id = ?", expired)
+                db.executemany("DELETE FROM result_rows WHERE id = ?", expired)
+            db.commit()
+
+    def __delitem__(self, search_id: str) -> None:
+        with self._lock:
+            db = self._db(create=False)
+            if db is not None:
+                db.execute("DELETE FROM results WHERE id = ?", (search_id,))
+                db.execute("DELETE FROM result_rows WHERE id = ?", (search_id,))
+                db.commit()
+
+    def update(self, search_id: str, **fields) -> None:
+        rows = fields.pop('results', None)
+        with self._lock:
+            db = self._db(create=False)
+            record = self._record(db, search_id) if db is not None else None
+            if record is None:
+                raise KeyError(search_id)
+            record.update(fields)
+            self._write_record(db, search_id, record)
+            if rows is not None:
+                db.execute("DELETE FROM result_rows WHERE id = ?", (search_id,))
+                self._write_rows(db, search_id, rows, 0)
+            db.commit()
+
+    def append_results(self, search_id: str, rows: list) -> None:
+        with self._lock:
+            db = self._db(create=False)
+            if db is None or db.execute("SELECT 1 FROM results WHERE id = ?", (search_id,)).fetchone() is None:
+                return
+            self._write_rows(db, search_id, rows, self._count(db, search_id))
+            db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            db = self._db(create=False)
+            return db.execute("SELECT COUNT(*) FROM results").fetchone()[0] if db is not None else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._db(create=False)
+            if db is not None:
+                db.execute("DELETE FROM results")
+                db.execute("DELETE FROM result_rows")
+                db.commit()
+
+
+def create_result_store(backend: str = RESULT_STORE_BACKEND) -> ResultStore:
+    """Build the result store selected in config.py ("memory" or "sqlite")."""
+    if backend == "sqlite":
+        return SQLiteResultStore()
+    if backend == "memory":
+        return MemoryResultStore(spill=SQLiteResultStore() if RESULT_SPILL_TO_DISK else None)
+    raise ValueError(f"Unknown result store backend: {backend}")
@@ -0,0 +1,6 @@
+"""Throughput benchmarks run against a local Google-Maps-like fixture server."""
+
+from benchmarks.fixtures import FixturePlace, fixture_places, expected_place
+from benchmarks.server import FixtureServer
+
+__all__ = ["FixturePlace", "fixture_places", "expected_place", "FixtureServer"]
@@ -0,0 +1,253 @@
+"""Google-Maps-like HTML fixtures for the benchmark server.
+
+The markup mirrors what the scraper reads on Google Maps: a search box, an
+optional cookie consent dialog, a lazily loaded results feed of place cards
+(CARD_XPATHS, END_OF_LIST_XPATH) and place detail panels laid out for
+config.XPATHS. Places are generated deterministically, so a run can be
+checked field by field against expected_place.
+"""
+
+import html
+import json
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from scraper.core import Place, parse_card, parse_place
+
+_TYPES = ("Grocery store", "Bakery", "Restaurant", "Pharmacy", "Hardware store", "Cafe", "Book store")
+_STREETS = ("King St W", "Queen St E", "Dundas St W", "Bloor St W", "Yonge St", "College St", "Spadina Ave")
+_SERVICES = ("In-store shopping", "In-store pickup", "Delivery")
+
+# Cards appended to the feed per lazy load (Google Maps loads about this many per scroll)
+FEED_BATCH_SIZE = 10
+
+
+@dataclass
+class FixturePlace:
+    index: int
+    name: str
+    street: str
+    city: str
+    website: str
+    phone_number: str
+    reviews_count: int
+    reviews_average: float
+    place_type: str
+    opens_at: str
+    introduction: str
+    services: Tuple[str, ...]
+    place_id: str
+    feature_id: str
+
+    @property
+    def address(self) -> str:
+        return f"{self.street}, {self.city}"
+
+    @property
+    def path(self) -> str:
+        """Site-relative place URL, shaped like a Google Maps place link."""
+        slug = self.name.replace(" ", "+")
+        return (f"/maps/place/{slug}/data=!4m7!3m6!1s{self.feature_id}"
+                f"!8m2!3d43.65!4d-79.38!16s%2Fg%2F11bench!19s{self.place_id}")
+
+
+def fixture_places(count: int) -> List[FixturePlace]:
+    """`count` distinct places, the same ones on every call."""
+    places = []
+    for i in range(count):
+        place_type = _TYPES[i % len(_TYPES)]
+        places.append(FixturePlace(
+            index=i,
+            name=f"Bench {place_type} {i + 1}",
+            street=f"{100 + i} {_STREETS[i % len(_STREETS)]}",
+            city="Toronto, ON M5V 2T6",
+            website=f"bench-{i + 1}.example.com",
+            phone_number=f"+1 416-555-{i % 10000:04d}",
+            reviews_count=(i * 37) % 2000 + 1,
+            reviews_average=round(3.0 + (i % 21) / 10, 1),
+            place_type=place_type,
+            opens_at=f"Open ⋅ Closes {5 + i % 7} PM",
+            introduction=f"Neighbourhood {place_type.lower()} number {i + 1}.",
+            services=_SERVICES[: 1 + i % len(_SERVICES)],
+            place_id=f"ChIJbenchFixture{i:06d}",
+            feature_id=f"0x882b34d68bf33a9b:0x{i + 1:016x}",
+        ))
+    return places
+
+
+def _raw_detail_fields(place: FixturePlace) -> dict:
+    # The strings the detail panel shows for each XPATHS entry
+    return {
+        "name": place.name,
+        "address": place.address,
+        "website": place.website,
+        "phone_number": place.phone_number,
+        "reviews_count": f"({place.reviews_count:,})",
+        "reviews_average": f"{place.reviews_average:.1f}",
+        "info1": f"·{place.services[0]}" if len(place.services) > 0 else "",
+        "info2": f"·{place.services[1]}" if len(place.services) > 1 else "",
+        "info3": f"·{place.services[2]}" if len(place.services) > 2 else "",
+        "opens_at": place.opens_at,
+        "place_type": place.place_type,
+        "introduction": place.introduction,
+    }
+
+
+def expected_place(place: FixturePlace, mode: str = "detail") -> Place:
+    """The Place a correct scrape of this fixture yields in `mode`."""
+    if mode == "list":
+        return parse_card({
+            "name": place.name,
+            "href": place.path,
+            "reviews_average": f"{place.reviews_average:.1f}",
+            "reviews_count": f"({place.reviews_count:,})",
+            "summary": f"{place.place_type} · {place.street}",
+        })
+    expected = parse_place(_raw_detail_fields(place))
+    expected.place_id = place.place_id
+    return expected
+
+
+# ---------- markup ----------
+
+def card_html(place: FixturePlace) -> str:
+    """One results-feed card; the place link covers the whole card, as on Google Maps."""
+    e = html.escape
+    return f"""
+<div class="Nv2PK THOPZb CpccDe" style="position:relative;height:96px;border-bottom:1px solid #ddd">
+  <div class="bfdHYd" style="padding:8px">
+    <div class="qBF1Pd fontHeadlineSmall">{e(place.name)}</div>
+    <div class="W4Efsd"><span class="ZkP5Je" role="img" aria-label="{place.reviews_average:.1f} stars {place.reviews_count:,} Reviews"><span class="MW4etd" aria-hidden="true">{place.reviews_average:.1f}</span><span class="UY7F9" aria-hidden="true">({place.reviews_count:,})</span></span></div>
+    <div class="W4Efsd"><div class="W4Efsd"><span>{e(place.place_type)}</span><span> · </span><span>{e(place.street)}</span></div></div>
+  </div>
+  <a class="hfpxzc" aria-label="{e(place.name)}" href="{e(place.path)}" style="position:absolute;inset:0;z-index:1"></a>
+</div>"""
+
+
+def feed_html(places: List[FixturePlace], offset: int, limit: int = FEED_BATCH_SIZE) -> str:
+    """The cards of one lazy load, followed by the end-of-list marker after the last place."""
+    batch = places[offset:offset + limit]
+    markup = "".join(card_html(place) for place in batch)
+    if offset + limit >= len(places):
+        markup += '<div class="m6QErb"><span class="HlvSq">You\'ve reached the end of the list.</span></div>'
+    return markup
+
+
+def panel_html(place: FixturePlace) -> str:
+    """The detail panel of a place, laid out for config.XPATHS."""
+    e = html.escape
+    services = "".join(
+        f'<div class="LTs0Rc"><span>·</span><span>{e(service)}</span></div>' for service in place.services
+    )
+    return f"""
+<div class="bJzME tTVLSc" id="panel">
+  <div class="TIHn2 ">
+    <h1 class="DUwDvf lfPIob">{e(place.name)}</h1>
+    <div class="fontBodyMedium dmRWX">
+      <div class="F7nice ">
+        <span><span aria-hidden="true">{place.reviews_average:.1f}</span><span role="img" aria-label="{place.reviews_average:.1f} stars"></span></span>
+        <span><span><span role="img" aria-label="{place.reviews_count:,} reviews">({place.reviews_count:,})</span></span></span>
+      </div>
+    </div>
+  </div>
+  <div class="LBgpqf"><button class="DkEaL ">{e(place.place_type)}</button></div>
+  <div class="WeS02d fontBodyMedium"><div class="PYvSYb ">{e(place.introduction)}</div></div>
+  <div class="E0DTEd">{services}</div>
+  <button data-item-id="address"><div class="Io6YTe fontBodyMedium kR99db">{e(place.address)}</div></button>
+  <button data-item-id="oh"><div class="Io6YTe fontBodyMedium">{e(place.opens_at)}</div></button>
+  <a data-item-id="authority" href="https://{e(place.website)}/"><div class="Io6YTe fontBodyMedium">{e(place.website)}</div></a>
+  <button data-item-id="phone:tel:{e(place.phone_number.replace(' ', '').replace('-', ''))}"><div class="Io6YTe fontBodyMedium">{e(place.phone_number)}</div></button>
+</div>"""
+
+
+_CONSENT_DIALOG = """
+<div id="consent" style="position:fixed;inset:0;z-index:10;background:rgba(0,0,0,.4)">
+  <form action="https://consent.google.com/save" onsubmit="return false" style="background:#fff;margin:20vh auto;width:320px;padding:16px">
+    <p>Before you continue to Google</p>
+    <button type="button" aria-label="Reject all" onclick="acceptConsent()">Reject all</button>
+    <button type="button" aria-label="Accept all" onclick="acceptConsent()">Accept all</button>
+  </form>
+</div>"""
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{title}</title>
+<style>
+  body {{ margin: 0; font-family: sans-serif; display: flex; height: 100vh; }}
+  #side {{ width: 420px; display: flex; flex-direction: column; }}
+  [role="feed"] {{ flex: 1; overflow-y: auto; }}
+  #pane {{ flex: 1; overflow-y: auto; padding: 16px; }}
+</style>
+</head>
+<body>
+{consent}
+<div id="side">
+  <input id="searchboxinput" name="q" aria-label="Search Google Maps" autocomplete="off">
+  <div role="feed" aria-label="Results"></div>
+</div>
+<div id="pane">{panel}</div>
+<script>
+const BATCH = {batch};
+const LOAD_DELAY_MS = {load_delay_ms};
+const feed = document.querySelector('[role="feed"]');
+const pane = document.getElementById('pane');
+let query = null, offset = 0, loading = false, done = false, panelRequest = 0;
+
+function acceptConsent() {{
+  document.cookie = 'SOCS=bench; path=/';
+  document.getElementById('consent').remove();
+}}
+
+function loadMore() {{
+  if (query === null || loading || done) return;
+  loading = true;
+  // Like Google Maps, the next batch shows up a little after the scroll
+  setTimeout(() => {{
+    fetch('/bench/feed?offset=' + offset + '&limit=' + BATCH + '&q=' + encodeURIComponent(query))
+      .then(r => r.text())
+      .then(markup => {{
+        feed.insertAdjacentHTML('beforeend', markup);
+        offset += BATCH;
+        done = !!feed.querySelector('.HlvSq');
+        loading = false;
+      }});
+  }}, LOAD_DELAY_MS);
+}}
+
+document.getElementById('searchboxinput').addEventListener('keydown', e => {{
+  if (e.key !== 'Enter') return;
+  query = e.target.value; offset = 0; done = false; feed.innerHTML = '';
+  loadMore();
+}});
+document.addEventListener('wheel', e => {{ if (e.deltaY > 0) loadMore(); }}, {{passive: true}});
+feed.addEventListener('scroll', () => {{
+  if (feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 200) loadMore();
+}});
+
+// Clicking a card swaps the detail panel in place, without a navigation
+feed.addEventListener('click', e => {{
+  const link = e.target.closest('a.hfpxzc');
+  if (!link) return;
+  e.preventDefault();
+  const request = ++panelRequest;
+  pane.innerHTML = '';
+  history.pushState(null, '', link.getAttribute('href'));
+  fetch(link.href + '?panel=1').then(r => r.text()).then(markup => {{
+    if (request === panelRequest) pane.innerHTML = markup;
+  }});
+}});
+</script>
+</body>
+</html>"""
+
+
+def start_page_html(consent: bool = True, load_delay_ms: int = 0) -> str:
+    """The Maps start page: search box, empty results feed and, if `consent`, the consent dialog."""
+    return _PAGE.format(title="Google Maps", consent=_CONSENT_DIALOG if consent else "", panel="",
+                        batch=json.dumps(FEED_BATCH_SIZE), load_delay_ms=json.dumps(load_delay_ms))
+
+
+def place_page_html(place: FixturePlace) -> str:
+    """A place URL opened directly: the detail panel next to an empty feed."""
+    return _PAGE.format(title=html.escape(place.name), consent="",
+                        panel=panel_html(place), batch=json.dumps(FEED_BATCH_SIZE), load_delay_ms="0")
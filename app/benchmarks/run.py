@@ -0,0 +1,213 @@
+"""Benchmark scrape_places against the local fixture server.
+
+    python -m benchmarks.run                         # detail and list mode, 60 places
+    python -m benchmarks.run -n 200 -m detail -c 1 4 --repeat 3
+    python -m benchmarks.run --json > bench.json
+
+Each run reports places/sec, the seconds spent in each phase (launch,
+navigation, consent, search, scroll, click, extract), peak RSS of the scraper and its browser
+processes, and how many places were extracted exactly as served. Nothing
+touches the network, and the persisted browser session, place cache and
+response cache are left alone.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, fields
+from typing import List, Optional
+
+import scraper.session
+from benchmarks.fixtures import expected_place
+from benchmarks.server import FixtureServer
+from config import SCRAPE_MODES
+from scraper.core import Place, ScrapeStats, scrape_places
+
+try:
+    import psutil
+except ImportError:  # peak RSS falls back to resource.getrusage
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ("launch", "navigation", "consent", "search", "scroll", "click", "extract")
+
+# Fields shown on feed cards, the only ones list mode fills in
+_LIST_FIELDS = ("name", "address", "place_type", "reviews_count", "reviews_average", "place_id")
+
+
+class RssSampler:
+    """Track the peak resident set size of this process plus its children (Chromium).
+
+    Samples every `interval` seconds with psutil when installed. Without it,
+    the peak of this process and of its largest reaped child is read from
+    getrusage at the end, which undercounts a multi-process browser.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_bytes = 0
+        self.method = "psutil" if psutil is not None else "getrusage"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        try:
+            process = psutil.Process()
+            total = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak_bytes = max(self.peak_bytes, total)
+        except psutil.Error:
+            pass
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        if psutil is not None:
+            self._sample()
+            self._thread = threading.Thread(target=self._loop, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+        elif resource is not None:
+            # ru_maxrss is in KiB on Linux and bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+            children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+            self.peak_bytes = own + children
+        else:
+            self.method = "unavailable"
+
+
+def _matches(place: Place, expected: Place, mode: str) -> bool:
+    names = _LIST_FIELDS if mode == "list" else [f.name for f in fields(Place)]
+    return all(getattr(place, name) == getattr(expected, name) for name in names)
+
+
+def accuracy(places: List[Place], server: FixtureServer, mode: str) -> dict:
+    """Count scraped places identical to the fixture they came from (matched by place ID)."""
+    by_id = {fixture.place_id: fixture for fixture in server.places}
+    exact = 0
+    mismatches = []
+    for place in places:
+        fixture = by_id.get(place.place_id)
+        if fixture is None:
+            mismatches.append({"place_id": place.place_id, "name": place.name, "error": "unknown place"})
+            continue
+        expected = expected_place(fixture, mode)
+        if _matches(place, expected, mode):
+            exact += 1
+        else:
+            diff = {k: [v, getattr(place, k)] for k, v in asdict(expected).items() if getattr(place, k) != v}
+            mismatches.append({"place_id": place.place_id, "name": place.name, "fields": diff})
+    return {"exact": exact, "of": len(places), "mismatches": mismatches[:5]}
+
+
+@contextmanager
+def _isolated_session_state():
+    # Every run starts without saved cookies, and the localhost ones never reach real runs
+    previous = scraper.session.SESSION_STATE_DIR
+    with tempfile.TemporaryDirectory(prefix="gms-bench-") as state_dir:
+        scraper.session.SESSION_STATE_DIR = state_dir
+        try:
+            yield
+        finally:
+            scraper.session.SESSION_STATE_DIR = previous
+
+
+def run_once(server: FixtureServer, total: int, mode: str, concurrency: int, headless: bool = True,
+             block_resources: bool = False) -> dict:
+    """Scrape `total` fixture places once and return the measurements."""
+    stats = ScrapeStats()
+    with _isolated_session_state(), RssSampler() as rss:
+        start = time.perf_counter()
+        places = scrape_places(
+            "bench places", total, headless=headless, concurrency=concurrency, mode=mode,
+            block_resources=block_resources, response_cache=False, place_cache=False,
+            stats=stats, start_url=server.start_url,
+        )
+        elapsed = time.perf_counter() - start
+    phases = {phase: round(stats.phase_seconds.get(phase, 0.0), 3) for phase in PHASES}
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "places": len(places),
+        "seconds": round(elapsed, 3),
+        "places_per_sec": round(len(places) / elapsed, 2) if elapsed > 0 else 0.0,
+        "phases": phases,
+        "peak_rss_mb": round(rss.peak_bytes / (1024 * 1024), 1),
+        "rss_method": rss.method,
+        "accuracy": accuracy(places, server, mode),
+    }
+
+
+def _print_table(results: List[dict]) -> None:
+    header = (f"{'mode':<7}{'tabs':>5}{'places':>8}{'sec':>9}{'places/s':>10}"
+              + "".join(f"{phase:>9}" for phase in PHASES) + f"{'RSS MB':>9}{'exact':>9}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['mode']:<7}{r['concurrency']:>5}{r['places']:>8}{r['seconds']:>9.2f}{r['places_per_sec']:>10.2f}"
+              + "".join(f"{r['phases'][phase]:>9.2f}" for phase in PHASES)
+              + f"{r['peak_rss_mb']:>9.1f}{r['accuracy']['exact']:>5}/{r['accuracy']['of']:<3}")
+    for r in results:
+        for mismatch in r["accuracy"]["mismatches"]:
+            print(f"[{r['mode']} x{r['concurrency']}] mismatch: {mismatch}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scrape_places against a local Maps-like server")
+    parser.add_argument("-n", "--places", type=int, default=60, help="Places served by the fixture server")
+    parser.add_argument("-t", "--total", type=int, default=None, help="Places to scrape (default: all served)")
+    parser.add_argument("-m", "--mode", nargs="+", choices=SCRAPE_MODES, default=list(SCRAPE_MODES),
+                        help="Scrape modes to compare")
+    parser.add_argument("-c", "--concurrency", nargs="+", type=int, default=[1, 4],
+                        help="Detail tabs to compare (list mode always runs once)")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="Runs per configuration")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every feed and place response")
+    parser.add_argument("--no-consent", action="store_false", dest="consent", help="Serve no consent dialog")
+    parser.add_argument("--block-resources", action="store_true", help="Enable request routing for resource blocking")
+    parser.add_argument("--visible", action="store_false", dest="headless", help="Show the browser window")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    configs = []
+    for mode in args.mode:
+        for concurrency in ([1] if mode == "list" else args.concurrency):
+            configs.append((mode, concurrency))
+
+    results = []
+    with FixtureServer(args.places, consent=args.consent, latency_ms=args.latency_ms) as server:
+        for mode, concurrency in configs:
+            for _ in range(args.repeat):
+                results.append(run_once(server, args.total or args.places, mode, concurrency,
+                                        headless=args.headless, block_resources=args.block_resources))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
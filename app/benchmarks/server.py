@@ -0,0 +1,135 @@
+"""Local HTTP server for the benchmark fixtures.
+
+Routes:
+    /                     Maps start page (search box, lazily loaded feed)
+    /bench/feed           one batch of feed cards (?offset=&limit=)
+    /maps/place/...       a place page, or only its detail panel with ?panel=1
+
+Responses can be delayed to approximate network latency. The server runs on a
+daemon thread and binds 127.0.0.1 on a free port.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import (
+    FEED_BATCH_SIZE, feed_html, fixture_places, panel_html, place_page_html, start_page_html,
+)
+from scraper.place_ids import parse_place_id
+
+
+class FixtureServer:
+    """Serve `count` fixture places like Google Maps would.
+
+    With `consent` the start page shows a cookie consent dialog until it has
+    been accepted in the browser context (place pages never show it).
+    `latency_ms` delays every feed and place response; `load_delay_ms` delays
+    each lazy load after a scroll.
+
+    Usable as a context manager:
+
+        with FixtureServer(100) as server:
+            scrape_places("bench", 100, start_url=server.start_url)
+    """
+
+    def __init__(self, count: int = 50, consent: bool = True, latency_ms: int = 0, load_delay_ms: int = 50):
+        self.places = fixture_places(count)
+        self.consent = consent
+        self.latency_ms = latency_ms
+        self.load_delay_ms = load_delay_ms
+        self.requests = 0
+        self._by_id = {place.place_id: place for place in self.places}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("FixtureServer is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def start_url(self) -> str:
+        return self.base_url + "/"
+
+    def place_url(self, place) -> str:
+        return self.base_url + place.path
+
+    def start(self) -> "FixtureServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---------- request handling ----------
+
+    def _delay(self) -> None:
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+    def respond(self, path: str, cookies: str):
+        """Return (status, body) for a GET of `path` sent with the `cookies` header."""
+        with self._lock:
+            self.requests += 1
+        url = urlsplit(path)
+        query = parse_qs(url.query)
+        consented = "SOCS=" in (cookies or "")
+        if url.path in ("/", "/maps", "/maps/"):
+            return 200, start_page_html(consent=self.consent and not consented, load_delay_ms=self.load_delay_ms)
+        if url.path == "/bench/feed":
+            self._delay()
+            try:
+                offset = int(query.get("offset", ["0"])[0])
+                limit = int(query.get("limit", [str(FEED_BATCH_SIZE)])[0])
+            except ValueError:
+                return 400, "bad offset or limit"
+            return 200, feed_html(self.places, max(0, offset), max(1, limit))
+        if url.path.startswith("/maps/place/"):
+            place = self._by_id.get(parse_place_id(url.path))
+            if place is None:
+                return 404, "unknown place"
+            self._delay()
+            if query.get("panel"):
+                return 200, panel_html(place)
+            return 200, place_page_html(place)
+        return 404, "not found"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = server.respond(self.path, self.headers.get("Cookie", ""))
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
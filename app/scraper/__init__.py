@@ -1 +1,12 @@
-from scraper.core import Place, extract_text, extract_place, scrape_places, save_places_to_csv, find_chromium
+from scraper.core import (
+    Place, ScrapeStats, extract_text, extract_place, iter_places, scrape_places, iter_places_by_url, scrape_places_by_url,
+    save_places_to_csv, find_chromium,
+)
+from scraper.place_ids import place_url, parse_place_id
+from scraper.place_cache import PlaceCache
+from scraper.dedup import DedupIndex
+from scraper.checkpoint import JobCheckpoint
+from scraper.pool import BrowserPool
+from scraper.tiling import iter_places_tiled, scrape_places_tiled, grid_cells
+from scraper.writers import open_place_writer
+from scraper.async_core import async_iter_places, async_scrape_places, async_scrape_many, scrape_many
@@ -0,0 +1,320 @@
+"""Asyncio scraping engine built on playwright.async_api.
+
+Runs many queries and detail pages inside one event loop and one browser,
+bounded by semaphores, instead of one thread and one Chromium per job. The
+parsing and selectors are shared with the sync engine in scraper.core.
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
+
+from config import (
+    XPATHS, SEARCH_INPUT_SELECTORS, CONSENT_SELECTORS,
+    DEFAULT_PAGE_TIMEOUT, NAVIGATION_TIMEOUT, PLACE_DETAIL_TIMEOUT,
+    PLACE_DETAIL_FALLBACK_TIMEOUT, MAX_NO_CHANGE_SCROLLS, SCROLL_MAX_WAIT_MS, END_OF_LIST_XPATH,
+    CONSENT_PROBE_TIMEOUT_MS, SEARCH_INPUT_TIMEOUT_MS,
+    MAPS_START_URL, DEFAULT_PROXY, DEFAULT_HEADLESS,
+    EXTRACT_RETRY_COUNT, EXTRACT_RETRY_DELAY_SEC, NAVIGATION_RETRY_COUNT,
+    DETAIL_CONCURRENCY, ASYNC_MAX_CONCURRENT_QUERIES, BLOCK_RESOURCES, RESPONSE_CACHE,
+    PERSIST_SESSION_STATE, DEFAULT_LOCALE,
+)
+from scraper.core import (
+    Place, PLACE_LINK_XPATH, _COLLECT_HREFS_JS, _EXTRACT_FIELDS_JS, _FEED_STATE_JS, _PROBE_SELECTORS_JS, _ARIA_FIELDS,
+    build_launch_kwargs, browser_context_options, feed_listings_wanted, new_listing_indexes, parse_place,
+    setup_logging,
+)
+from scraper.dedup import DedupIndex
+from scraper.network import install_resource_blocking_async
+from scraper.response_cache import install_response_cache_async
+from scraper.session import has_consent_cookie, save_storage_state_async
+
+
+async def async_extract_place(page: Page) -> Place:
+    """Extract place details from the current page. Retries if name is empty."""
+    for attempt in range(1 + EXTRACT_RETRY_COUNT):
+        try:
+            place = parse_place(await page.evaluate(_EXTRACT_FIELDS_JS, [XPATHS, list(_ARIA_FIELDS)]))
+        except Exception as e:
+            logging.warning(f"Extraction failed: {e}")
+            place = Place()
+        if place.name:
+            return place
+        if attempt < EXTRACT_RETRY_COUNT:
+            logging.warning(f"Empty name on attempt {attempt+1}, retrying...")
+            await asyncio.sleep(EXTRACT_RETRY_DELAY_SEC)
+    return place
+
+
+async def _wait_for_place_details(page: Page, idx: int) -> bool:
+    try:
+        await page.wait_for_selector(XPATHS["name"], timeout=PLACE_DETAIL_TIMEOUT)
+    except Exception:
+        try:
+            await page.wait_for_selector('//h1[contains(@class, "DUwDvf")]', timeout=PLACE_DETAIL_FALLBACK_TIMEOUT)
+        except Exception:
+            logging.warning(f"Could not load details for listing {idx+1}, skipping")
+            return False
+    return True
+
+
+async def _probe_selectors(page: Page, selectors: List[str], timeout: float) -> Optional[int]:
+    """Async counterpart of scraper.core._probe_selectors."""
+    try:
+        handle = await page.wait_for_function(_PROBE_SELECTORS_JS, arg=list(selectors), timeout=timeout)
+        result = await handle.json_value()
+    except PlaywrightTimeoutError:
+        return None
+    return result.get("index") if isinstance(result, dict) else None
+
+
+async def _dismiss_consent(page: Page) -> None:
+    idx = await _probe_selectors(page, CONSENT_SELECTORS, CONSENT_PROBE_TIMEOUT_MS)
+    if idx is None:
+        return
+    try:
+        await page.locator(CONSENT_SELECTORS[idx]).first.click()
+        logging.info(f"Dismissed consent dialog with: {CONSENT_SELECTORS[idx]}")
+        await page.wait_for_load_state("domcontentloaded")
+    except Exception as e:
+        logging.warning(f"Failed to dismiss consent dialog: {e}")
+
+
+async def _find_search_input(page: Page):
+    idx = await _probe_selectors(page, SEARCH_INPUT_SELECTORS, SEARCH_INPUT_TIMEOUT_MS)
+    if idx is None:
+        raise Exception(f"Could not find search input. Tried: {SEARCH_INPUT_SELECTORS}")
+    return page.locator(SEARCH_INPUT_SELECTORS[idx]).first
+
+
+async def _feed_state(page: Page, previous: int) -> Optional[dict]:
+    try:
+        handle = await page.wait_for_function(
+            _FEED_STATE_JS, arg=[PLACE_LINK_XPATH, END_OF_LIST_XPATH, previous],
+            timeout=SCROLL_MAX_WAIT_MS, polling="mutation",
+        )
+        return await handle.json_value()
+    except PlaywrightTimeoutError:
+        return None
+
+
+async def _scroll_feed(page: Page, target: int) -> Tuple[int, bool]:
+    """Async counterpart of scraper.core.scroll_feed."""
+    state = await _feed_state(page, -1) or {"count": 0, "ended": False}
+    found, ended = state["count"], state["ended"]
+    no_change_count = 0
+    while found < target and not ended:
+        await page.mouse.wheel(0, random.randint(12000, 18000))
+        state = await _feed_state(page, found)
+        if state is None:
+            no_change_count += 1
+            if no_change_count >= MAX_NO_CHANGE_SCROLLS:
+                break
+            await page.mouse.wheel(0, -5000)
+            await page.mouse.wheel(0, 20000)
+            continue
+        no_change_count = 0
+        found, ended = state["count"], state["ended"]
+    return found, ended
+
+
+async def _search(page: Page, search_for: str) -> None:
+    """Open Maps, dismiss the consent dialog if needed and run the search."""
+    for nav_attempt in range(NAVIGATION_RETRY_COUNT):
+        try:
+            await page.goto(MAPS_START_URL, timeout=NAVIGATION_TIMEOUT)
+            await page.wait_for_load_state("domcontentloaded")
+            if not has_consent_cookie(await page.context.cookies()):
+                await _dismiss_consent(page)
+            search_input = await _find_search_input(page)
+            await search_input.fill(search_for)
+            await page.keyboard.press("Enter")
+            await page.wait_for_selector(PLACE_LINK_XPATH)
+            await page.hover(PLACE_LINK_XPATH)
+            break
+        except Exception as e:
+            if nav_attempt < NAVIGATION_RETRY_COUNT - 1:
+                logging.warning(f"Navigation attempt {nav_attempt+1} failed: {e}, retrying...")
+                await asyncio.sleep(2)
+            else:
+                raise
+
+
+async def async_iter_places_from_urls(
+    context, urls: List[str], concurrency: int = DETAIL_CONCURRENCY
+) -> AsyncIterator[Place]:
+    """Open place URLs on up to `concurrency` pages at once and yield their Places in URL order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(idx: int, url: str) -> Optional[Place]:
+        async with semaphore:
+            page = await context.new_page()
+            page.set_default_timeout(DEFAULT_PAGE_TIMEOUT)
+            try:
+                await page.goto(url, timeout=NAVIGATION_TIMEOUT, wait_until="commit")
+                if not await _wait_for_place_details(page, idx):
+                    return None
+                return await async_extract_place(page)
+            except Exception as e:
+                logging.warning(f"Failed to extract listing {idx+1}: {e}")
+                return None
+            finally:
+                await page.close()
+
+    pending = deque(enumerate(urls))
+    tasks = deque()
+    # Schedule a bounded window of tasks, so stopping early does not open every URL
+    window = 2 * max(1, concurrency)
+
+    def schedule():
+        while pending and len(tasks) < window:
+            tasks.append(asyncio.ensure_future(fetch(*pending.popleft())))
+
+    schedule()
+    try:
+        while tasks:
+            place = await tasks.popleft()
+            schedule()
+            if place is not None and place.name:
+                yield place
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def async_iter_places(
+    search_for: str,
+    total: int,
+    headless: bool = DEFAULT_HEADLESS,
+    proxy: Optional[str] = DEFAULT_PROXY,
+    concurrency: int = DETAIL_CONCURRENCY,
+    browser=None,
+    block_resources: bool = BLOCK_RESOURCES,
+    response_cache: bool = RESPONSE_CACHE,
+) -> AsyncIterator[Place]:
+    """Async counterpart of scraper.core.iter_places.
+
+    Detail pages are opened directly from the feed hrefs, `concurrency` at a
+    time; listings repeated in the feed are dropped before they are opened.
+    Like the sync engine, it scrolls in rounds sized by feed_listings_wanted
+    and stops scrolling once `total` places are collected. Pass a running
+    `browser` to share it between queries; otherwise one is launched and
+    closed by this generator.
+    """
+    setup_logging()
+    if browser is None:
+        async with async_playwright() as p:
+            own_browser = await p.chromium.launch(**build_launch_kwargs(headless, proxy))
+            # The proxy also picks the storage state file, so it is passed on with the browser
+            places = async_iter_places(search_for, total, proxy=proxy, concurrency=concurrency, browser=own_browser,
+                                       block_resources=block_resources, response_cache=response_cache)
+            try:
+                async for place in places:
+                    yield place
+            finally:
+                await places.aclose()
+                await own_browser.close()
+        return
+
+    context = await browser.new_context(**browser_context_options(proxy))
+    if block_resources:
+        await install_resource_blocking_async(context)
+    if response_cache:
+        await install_response_cache_async(context)
+    dedup = DedupIndex()
+    feed_ids: Set[str] = set()
+    count = 0
+    try:
+        page = await context.new_page()
+        page.set_default_timeout(DEFAULT_PAGE_TIMEOUT)
+        await _search(page, search_for)
+        if PERSIST_SESSION_STATE:
+            await save_storage_state_async(context, DEFAULT_LOCALE, proxy)
+        processed = 0
+        while count < total:
+            _, ended = await _scroll_feed(page, processed + feed_listings_wanted(total, count, processed))
+            hrefs = list(await page.evaluate(_COLLECT_HREFS_JS, PLACE_LINK_XPATH) or [])
+            if len(hrefs) <= processed:
+                break
+            new = [hrefs[processed + i] for i in new_listing_indexes(hrefs[processed:], feed_ids=feed_ids)]
+            logging.info(f"[{search_for}] Total Found: {len(hrefs)}, {len(new)} new distinct places")
+            processed = len(hrefs)
+            places = async_iter_places_from_urls(context, new, concurrency)
+            try:
+                async for place in places:
+                    if not dedup.add(place):
+                        continue
+                    count += 1
+                    yield place
+                    if count >= total:
+                        break
+            finally:
+                await places.aclose()
+            if ended:
+                break
+    finally:
+        await context.close()
+    logging.info(f"[{search_for}] Final result: {count} places extracted")
+
+
+async def async_scrape_places(
+    search_for: str,
+    total: int,
+    headless: bool = DEFAULT_HEADLESS,
+    proxy: Optional[str] = DEFAULT_PROXY,
+    concurrency: int = DETAIL_CONCURRENCY,
+    browser=None,
+    block_resources: bool = BLOCK_RESOURCES,
+    response_cache: bool = RESPONSE_CACHE,
+) -> List[Place]:
+    """Collect the places of async_iter_places into a list."""
+    return [place async for place in async_iter_places(
+        search_for, total, headless=headless, proxy=proxy, concurrency=concurrency, browser=browser,
+        block_resources=block_resources, response_cache=response_cache)]
+
+
+async def async_scrape_many(
+    queries: List[str],
+    total: int,
+    max_concurrent_queries: int = ASYNC_MAX_CONCURRENT_QUERIES,
+    concurrency: int = DETAIL_CONCURRENCY,
+    headless: bool = DEFAULT_HEADLESS,
+    proxy: Optional[str] = DEFAULT_PROXY,
+    block_resources: bool = BLOCK_RESOURCES,
+    response_cache: bool = RESPONSE_CACHE,
+) -> Dict[str, List[Place]]:
+    """Scrape several queries on one browser, `max_concurrent_queries` at a time.
+
+    Each query runs in its own browser context. A failing query logs its error
+    and returns an empty list.
+    """
+    setup_logging()
+    semaphore = asyncio.Semaphore(max(1, max_concurrent_queries))
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(**build_launch_kwargs(headless, proxy))
+
+        async def run(query: str) -> List[Place]:
+            async with semaphore:
+                try:
+                    return await async_scrape_places(query, total, proxy=proxy, concurrency=concurrency,
+                                                     browser=browser, block_resources=block_resources,
+                                                     response_cache=response_cache)
+                except Exception as e:
+                    logging.warning(f"Query failed: {query}: {e}")
+                    return []
+
+        try:
+            results = await asyncio.gather(*(run(query) for query in queries))
+        finally:
+            await browser.close()
+    return dict(zip(queries, results))
+
+
+def scrape_many(queries: List[str], total: int, **kwargs) -> Dict[str, List[Place]]:
+    """Synchronous wrapper around async_scrape_many."""
+    return asyncio.run(async_scrape_many(queries, total, **kwargs))
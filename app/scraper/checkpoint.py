@@ -0,0 +1,112 @@
+"""On-disk checkpoints of long jobs, so a job restarted with the same ID resumes.
+
+A checkpoint holds the job's parameters, the places collected so far (with
+the city they belong to and, for places opened by URL, that URL) and the
+cities already completed. A resumed job publishes the saved places again,
+feeds them to its DedupIndex so their listings are skipped before they are
+opened, and skips the completed cities.
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict, fields
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import CHECKPOINT_DB_PATH
+from scraper.core import Place
+from scraper.sqlite_util import LazySQLite
+
+_PLACE_FIELDS = {f.name for f in fields(Place)}
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, params TEXT NOT NULL, updated REAL NOT NULL);"
+    "CREATE TABLE IF NOT EXISTS places ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL, city TEXT NOT NULL, "
+    "cached INTEGER NOT NULL, url TEXT NOT NULL DEFAULT '', place TEXT NOT NULL);"
+    "CREATE INDEX IF NOT EXISTS places_job ON places (job_id, id);"
+    "CREATE TABLE IF NOT EXISTS cities ("
+    "job_id TEXT NOT NULL, city TEXT NOT NULL, results INTEGER NOT NULL, PRIMARY KEY (job_id, city));"
+)
+
+
+class JobCheckpoint:
+    """Progress of one job in SQLite, written as it happens.
+
+    Every write is committed at once, so a crash loses at most the place
+    being extracted.
+    """
+
+    def __init__(self, job_id: str, db_path: str = CHECKPOINT_DB_PATH):
+        self.job_id = job_id
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._db = LazySQLite(db_path, _SCHEMA)
+
+    def save_params(self, params: dict) -> None:
+        """Record the job's parameters, so it can be resumed from its ID alone."""
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO jobs (job_id, params, updated) VALUES (?, ?, ?)",
+                       (self.job_id, json.dumps(params), time.time()))
+            db.commit()
+
+    def params(self) -> Optional[dict]:
+        """The saved parameters, or None if the job has no checkpoint."""
+        with self._lock:
+            db = self._db(create=False)
+            row = db.execute("SELECT params FROM jobs WHERE job_id = ?", (self.job_id,)).fetchone() if db else None
+        return json.loads(row[0]) if row else None
+
+    def add_place(self, place: Place, city: str = "", cached: bool = False, url: str = "") -> None:
+        """Save a collected place; `url` is the input URL it was opened from, if any."""
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT INTO places (job_id, city, cached, url, place) VALUES (?, ?, ?, ?, ?)",
+                       (self.job_id, city, int(cached), url, json.dumps(asdict(place))))
+            db.commit()
+
+    def places(self) -> List[Tuple[Place, str, bool]]:
+        """(place, city, cached) for every saved place, in the order they were collected."""
+        with self._lock:
+            db = self._db(create=False)
+            if db is None:
+                return []
+            rows = db.execute("SELECT place, city, cached FROM places WHERE job_id = ? ORDER BY id",
+                              (self.job_id,)).fetchall()
+        return [(Place(**{k: v for k, v in json.loads(raw).items() if k in _PLACE_FIELDS}), city, bool(cached))
+                for raw, city, cached in rows]
+
+    def urls(self) -> Set[str]:
+        """Input URLs of the saved places, so a resumed refresh does not open them again."""
+        with self._lock:
+            db = self._db(create=False)
+            if db is None:
+                return set()
+            return {url for (url,) in db.execute("SELECT url FROM places WHERE job_id = ? AND url != ''",
+                                                 (self.job_id,))}
+
+    def complete_city(self, city: str, results: int) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO cities (job_id, city, results) VALUES (?, ?, ?)",
+                       (self.job_id, city, results))
+            db.commit()
+
+    def completed_cities(self) -> Dict[str, int]:
+        """Results collected by each completed city."""
+        with self._lock:
+            db = self._db(create=False)
+            if db is None:
+                return {}
+            return dict(db.execute("SELECT city, results FROM cities WHERE job_id = ?", (self.job_id,)))
+
+    def clear(self) -> None:
+        """Delete the checkpoint once the job has finished."""
+        with self._lock:
+            db = self._db(create=False)
+            if db is None:
+                return
+            for table in ("jobs", "places", "cities"):
+                db.execute(f"DELETE FROM {table} WHERE job_id = ?", (self.job_id,))
+            db.commit()
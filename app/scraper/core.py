@@ -1,23 +1,145 @@
 import logging
 import glob as globmod
-from typing import List, Optional
-from playwright.sync_api import sync_playwright, Page
-from dataclasses import dataclass, asdict
-import pandas as pd
+import math
+from collections import deque
+from contextlib import closing, contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
+from dataclasses import dataclass, field
 import platform
+import threading
 import time
 import os
 import random
+import re
 
 from config import (
-    XPATHS, SEARCH_INPUT_SELECTORS, BROWSER_ARGS, HEADLESS_BROWSER_ARGS,
+    XPATHS, SEARCH_INPUT_SELECTORS, CONSENT_SELECTORS, BROWSER_ARGS, HEADLESS_BROWSER_ARGS,
     DEFAULT_VIEWPORT, DEFAULT_LOCALE,
     DEFAULT_PAGE_TIMEOUT, NAVIGATION_TIMEOUT, PLACE_DETAIL_TIMEOUT,
     PLACE_DETAIL_FALLBACK_TIMEOUT, MAX_NO_CHANGE_SCROLLS,
-    SCROLL_WAIT_MS, DETAIL_LOAD_WAIT_SEC, MAPS_START_URL,
+    SCROLL_MAX_WAIT_MS, END_OF_LIST_XPATH, CONSENT_PROBE_TIMEOUT_MS, SEARCH_INPUT_TIMEOUT_MS, DETAIL_LOAD_WAIT_SEC, MAPS_START_URL,
     USER_AGENTS, DEFAULT_PROXY, DEFAULT_HEADLESS,
     EXTRACT_RETRY_COUNT, EXTRACT_RETRY_DELAY_SEC, NAVIGATION_RETRY_COUNT,
+    BATCHED_EXTRACTION, DETAIL_CONCURRENCY, CARD_XPATHS, SCRAPE_MODES, DEFAULT_SCRAPE_MODE,
+    PLACE_URL_CONCURRENCY, BLOCK_RESOURCES, RESPONSE_CACHE, PLACE_CACHE, PERSIST_SESSION_STATE,
+    FEED_YIELD_PRIOR, FEED_YIELD_PRIOR_WEIGHT, FEED_MIN_BATCH,
 )
+from scraper.network import install_resource_blocking
+from scraper.response_cache import install_response_cache
+from scraper.session import has_consent_cookie, load_storage_state, save_storage_state
+from scraper.place_ids import listing_ids, parse_place_id, place_urls
+from scraper.dedup import DedupIndex
+from scraper.metrics import PHASE_SECONDS, SCRAPE_EVENTS, shared_metrics
+
+# Anchors in the results feed that link to a place detail page (scoped to the feed, like
+# END_OF_LIST_XPATH, so links in an open detail panel are not read as listings)
+PLACE_LINK_XPATH = '//div[@role="feed"]//a[contains(@href, "/maps/place/")]'
+
+# XPATHS entries whose matches are read as a list of aria-labels instead of text
+_ARIA_FIELDS = ("reviews_count_aria",)
+
+# The hrefs of every match of an XPath, in document order, read in one evaluation.
+_COLLECT_HREFS_JS = """
+(xpath) => {
+    const snap = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const hrefs = [];
+    for (let i = 0; i < snap.snapshotLength; i++) {
+        hrefs.push(snap.snapshotItem(i).href);
+    }
+    return hrefs;
+}
+"""
+
+# Resolves to the feed state once it has more than `previous` listings or its end
+# marker is visible; returns null (keep waiting) otherwise.
+_FEED_STATE_JS = """
+([xpath, endXpath, previous]) => {
+    const count = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    const marker = document.evaluate(endXpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const ended = !!(marker && marker.offsetParent !== null);
+    return (count > previous || ended) ? {count: count, ended: ended} : null;
+}
+"""
+
+# One record per feed card: the link's aria-label and href plus the CARD_XPATHS
+# matches, resolved relative to the card (the link's parent).
+_EXTRACT_CARDS_JS = """
+([xpath, cardXpaths, ariaFields]) => {
+    const links = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const cards = [];
+    for (let i = 0; i < links.snapshotLength; i++) {
+        const link = links.snapshotItem(i);
+        const card = link.parentElement || link;
+        const out = {name: link.getAttribute("aria-label") || "", href: link.href};
+        for (const [key, rel] of Object.entries(cardXpaths)) {
+            const snap = document.evaluate(rel, card, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            if (ariaFields.includes(key)) {
+                const labels = [];
+                for (let j = 0; j < snap.snapshotLength; j++) {
+                    labels.push(snap.snapshotItem(j).getAttribute("aria-label") || "");
+                }
+                out[key] = labels;
+            } else {
+                out[key] = snap.snapshotLength > 0 ? snap.snapshotItem(0).innerText : "";
+            }
+        }
+        cards.push(out);
+    }
+    return cards;
+}
+"""
+
+# Resolves to {index} of the first selector (CSS, or XPath when it starts with
+# "/" or "(") with a visible match, checking every candidate in one pass.
+_PROBE_SELECTORS_JS = """
+(selectors) => {
+    const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    for (let i = 0; i < selectors.length; i++) {
+        const sel = selectors[i];
+        let nodes = [];
+        try {
+            if (sel.startsWith("/") || sel.startsWith("(")) {
+                const snap = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (let j = 0; j < snap.snapshotLength; j++) nodes.push(snap.snapshotItem(j));
+            } else {
+                nodes = Array.from(document.querySelectorAll(sel));
+            }
+        } catch (e) {
+            continue;
+        }
+        if (nodes.some(visible)) return {index: i};
+    }
+    return null;
+}
+"""
+
+# Resolves every XPath in one evaluation: {key: first match innerText}, or a
+# list of aria-labels for the keys in _ARIA_FIELDS.
+_EXTRACT_FIELDS_JS = """
+([xpaths, ariaFields]) => {
+    const out = {};
+    for (const [key, xpath] of Object.entries(xpaths)) {
+        let snap;
+        try {
+            snap = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        } catch (e) {
+            out[key] = ariaFields.includes(key) ? [] : "";
+            continue;
+        }
+        if (ariaFields.includes(key)) {
+            const labels = [];
+            for (let i = 0; i < snap.snapshotLength; i++) {
+                labels.push(snap.snapshotItem(i).getAttribute("aria-label") || "");
+            }
+            out[key] = labels;
+        } else {
+            out[key] = snap.snapshotLength > 0 ? snap.snapshotItem(0).innerText : "";
+        }
+    }
+    return out;
+}
+"""
 
 @dataclass
 class Place:
@@ -33,6 +155,79 @@ class Place:
     place_type: str = ""
     opens_at: str = ""
     introduction: str = ""
+    place_id: str = ""
+
+
+@dataclass
+class ScrapeStats:
+    """Thread-safe cache hits, scrapes, phase timings and event counters of one scrape."""
+    cache_hits: int = 0
+    scraped: int = 0
+    cached_place_ids: Set[str] = field(default_factory=set)
+    # Listings the last search's feed loaded, and whether it showed its end-of-list marker
+    feed_listings: int = 0
+    feed_ended: bool = False
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    phase_counts: Dict[str, int] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+            self.phase_counts[phase] = self.phase_counts.get(phase, 0) + 1
+        shared_metrics().observe(PHASE_SECONDS, seconds, phase=phase)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Add the wall time of the block to phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def count(self, event: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[event] = self.counters.get(event, 0) + n
+        shared_metrics().inc(SCRAPE_EVENTS, n, event=event)
+
+    def summary(self) -> dict:
+        """JSON-ready totals: places, per-phase count/seconds and event counters."""
+        with self._lock:
+            return {
+                "scraped": self.scraped,
+                "cache_hits": self.cache_hits,
+                "phases": {name: {"count": self.phase_counts.get(name, 0), "seconds": round(seconds, 3)}
+                           for name, seconds in sorted(self.phase_seconds.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def merge(self, other: "ScrapeStats") -> None:
+        """Add the totals of `other` (not forwarded to the metrics registry again)."""
+        with other._lock:
+            cache_hits, scraped = other.cache_hits, other.scraped
+            cached_place_ids = set(other.cached_place_ids)
+            phases = [(name, seconds, other.phase_counts.get(name, 0)) for name, seconds in other.phase_seconds.items()]
+            counters = dict(other.counters)
+        with self._lock:
+            self.cache_hits += cache_hits
+            self.scraped += scraped
+            self.cached_place_ids |= cached_place_ids
+            for name, seconds, n in phases:
+                self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+                self.phase_counts[name] = self.phase_counts.get(name, 0) + n
+            for event, n in counters.items():
+                self.counters[event] = self.counters.get(event, 0) + n
+
+    @classmethod
+    def combined(cls, stats: List["ScrapeStats"]) -> "ScrapeStats":
+        """A new ScrapeStats holding the totals of `stats`."""
+        total = cls()
+        for item in stats:
+            total.merge(item)
+        return total
+
 
 def setup_logging():
     logging.basicConfig(
@@ -71,14 +266,16 @@ def extract_text(page: Page, xpath: str) -> str:
         logging.warning(f"Failed to extract text for xpath {xpath}: {e}")
     return ""
 
-def extract_place(page: Page, listing=None) -> Place:
-    """Extract place details from the current page. Retries if name is empty."""
+def extract_place(page: Page, listing=None, stats: Optional[ScrapeStats] = None) -> Place:
+    """Extract place details from the current page. Retries if name is empty (counted in `stats`)."""
     for attempt in range(1 + EXTRACT_RETRY_COUNT):
         place = _do_extract_place(page)
         if place.name:
             return place
         if attempt < EXTRACT_RETRY_COUNT:
             logging.warning(f"Empty name on attempt {attempt+1}, retrying...")
+            if stats is not None:
+                stats.count("extract_retry")
             time.sleep(EXTRACT_RETRY_DELAY_SEC)
             if listing is not None:
                 try:
@@ -89,34 +286,67 @@ def extract_place(page: Page, listing=None) -> Place:
     return place
 
 
-def _do_extract_place(page: Page) -> Place:
+def extract_fields(page: Page, batched: bool = BATCHED_EXTRACTION) -> dict:
+    """Read the raw text of every XPATHS entry from the current page.
+
+    In batched mode all XPaths are resolved by a single in-page evaluation,
+    which replaces the count()/inner_text() roundtrip pair per field. If the
+    evaluation fails the per-field path is used instead.
+    """
+    if batched:
+        try:
+            raw = page.evaluate(_EXTRACT_FIELDS_JS, [XPATHS, list(_ARIA_FIELDS)])
+            if isinstance(raw, dict):
+                return raw
+        except Exception as e:
+            logging.warning(f"Batched extraction failed, falling back to per-field: {e}")
+
+    raw = {}
+    for key, xpath in XPATHS.items():
+        if key in _ARIA_FIELDS:
+            raw[key] = _extract_aria_labels(page, xpath)
+        else:
+            raw[key] = extract_text(page, xpath)
+    return raw
+
+
+def _extract_aria_labels(page: Page, xpath: str) -> List[str]:
+    labels = []
+    try:
+        aria_loc = page.locator(xpath)
+        for i in range(aria_loc.count()):
+            labels.append(aria_loc.nth(i).get_attribute("aria-label") or "")
+    except Exception:
+        pass
+    return labels
+
+
+def _do_extract_place(page: Page, batched: bool = BATCHED_EXTRACTION) -> Place:
     """Single extraction attempt."""
+    return parse_place(extract_fields(page, batched=batched))
+
+
+def parse_place(raw: dict) -> Place:
+    """Build a Place from the raw field strings returned by extract_fields."""
     place = Place()
-    place.name = extract_text(page, XPATHS["name"])
-    place.address = extract_text(page, XPATHS["address"])
-    place.website = extract_text(page, XPATHS["website"])
-    place.phone_number = extract_text(page, XPATHS["phone_number"])
-    place.place_type = extract_text(page, XPATHS["place_type"])
-    place.introduction = extract_text(page, XPATHS["introduction"]) or "None Found"
+    place.name = raw.get("name") or ""
+    place.address = raw.get("address") or ""
+    place.website = raw.get("website") or ""
+    place.phone_number = raw.get("phone_number") or ""
+    place.place_type = raw.get("place_type") or ""
+    place.introduction = raw.get("introduction") or "None Found"
 
     # Reviews Count — try text "(N)" first, then aria-label fallback
-    reviews_count_raw = extract_text(page, XPATHS["reviews_count"])
+    reviews_count_raw = raw.get("reviews_count") or ""
     if not reviews_count_raw:
         # Fallback: extract count from aria-label like "2 948 avis" or "2,948 reviews"
-        try:
-            aria_loc = page.locator(XPATHS["reviews_count_aria"])
-            if aria_loc.count() > 0:
-                for i in range(aria_loc.count()):
-                    aria = aria_loc.nth(i).get_attribute("aria-label") or ""
-                    # Look for aria-labels containing review/avis keywords (not star ratings)
-                    if any(kw in aria.lower() for kw in ["avis", "review", "rezension", "recens"]):
-                        import re
-                        nums = re.sub(r'[^\d]', '', aria.replace('\xa0', '').replace('\u202f', ''))
-                        if nums:
-                            reviews_count_raw = nums
-                            break
-        except Exception:
-            pass
+        for aria in raw.get("reviews_count_aria") or []:
+            # Look for aria-labels containing review/avis keywords (not star ratings)
+            if any(kw in aria.lower() for kw in ["avis", "review", "rezension", "recens"]):
+                nums = re.sub(r'[^\d]', '', aria.replace('\xa0', '').replace('\u202f', ''))
+                if nums:
+                    reviews_count_raw = nums
+                    break
     if reviews_count_raw:
         try:
             temp = reviews_count_raw.replace('\xa0', '').replace('\u202f', '').replace('(','').replace(')','').replace(',','').replace('.','').replace(' ','')
@@ -124,7 +354,7 @@ def _do_extract_place(page: Page) -> Place:
         except Exception as e:
             logging.warning(f"Failed to parse reviews count: {e}")
     # Reviews Average
-    reviews_avg_raw = extract_text(page, XPATHS["reviews_average"])
+    reviews_avg_raw = raw.get("reviews_average") or ""
     if reviews_avg_raw:
         try:
             temp = reviews_avg_raw.replace(' ','').replace(',','.')
@@ -132,8 +362,8 @@ def _do_extract_place(page: Page) -> Place:
         except Exception as e:
             logging.warning(f"Failed to parse reviews average: {e}")
     # Store Info
-    for info_xpath in [XPATHS["info1"], XPATHS["info2"], XPATHS["info3"]]:
-        info_raw = extract_text(page, info_xpath)
+    for info_key in ["info1", "info2", "info3"]:
+        info_raw = raw.get(info_key) or ""
         if info_raw:
             temp = info_raw.split('·')
             if len(temp) > 1:
@@ -145,222 +375,689 @@ def _do_extract_place(page: Page) -> Place:
                 if 'delivery' in check:
                     place.store_delivery = "Yes"
     # Opens At
-    opens_at_raw = extract_text(page, XPATHS["opens_at"])
+    opens_at_raw = raw.get("opens_at") or raw.get("opens_at2") or ""
     if opens_at_raw:
         opens = opens_at_raw.split('⋅')
         if len(opens) > 1:
             place.opens_at = opens[1].replace("\u202f","")
         else:
             place.opens_at = opens_at_raw.replace("\u202f","")
-    else:
-        opens_at2_raw = extract_text(page, XPATHS["opens_at2"])
-        if opens_at2_raw:
-            opens = opens_at2_raw.split('⋅')
-            if len(opens) > 1:
-                place.opens_at = opens[1].replace("\u202f","")
-            else:
-                place.opens_at = opens_at2_raw.replace("\u202f","")
     return place
 
-def _find_search_input(page: Page):
-    """Find the search input using multiple selectors (Google changes these)."""
-    for selector in SEARCH_INPUT_SELECTORS:
+def parse_card(raw: dict) -> Place:
+    """Build a Place from one record of _EXTRACT_CARDS_JS (list-only mode).
+
+    Only the fields shown on a feed card are filled: name, reviews count and
+    average, place type and the address snippet.
+    """
+    place = parse_place({
+        "name": raw.get("name"),
+        "reviews_average": raw.get("reviews_average"),
+        "reviews_count": raw.get("reviews_count"),
+        "reviews_count_aria": raw.get("reviews_count_aria"),
+    })
+    place.introduction = ""
+    # "Category · $$ · Address snippet" — first part is the type, last the address
+    parts = [p.strip() for p in (raw.get("summary") or "").split("·") if p.strip()]
+    if parts:
+        place.place_type = parts[0]
+    if len(parts) > 1:
+        place.address = parts[-1]
+    place.place_id = parse_place_id(raw.get("href")) or ""
+    return place
+
+
+def extract_cards(page: Page) -> List[Place]:
+    """Read every loaded feed card in one in-page evaluation, in feed order."""
+    raw_cards = page.evaluate(_EXTRACT_CARDS_JS, [PLACE_LINK_XPATH, CARD_XPATHS, list(_ARIA_FIELDS)])
+    return [parse_card(raw) for raw in raw_cards or []]
+
+
+def _feed_state(page: Page, previous: int, timeout: float) -> Optional[dict]:
+    """Wait until the feed has more than `previous` listings or shows its end marker.
+
+    Returns {"count": int, "ended": bool}, or None if nothing changed within `timeout` ms.
+    """
+    try:
+        handle = page.wait_for_function(
+            _FEED_STATE_JS, arg=[PLACE_LINK_XPATH, END_OF_LIST_XPATH, previous],
+            timeout=timeout, polling="mutation",
+        )
+        return handle.json_value()
+    except PlaywrightTimeoutError:
+        return None
+
+
+def scroll_feed(page: Page, target: int, stats: Optional[ScrapeStats] = None) -> Tuple[int, bool]:
+    """Scroll the results feed until it holds `target` listings or reaches its end.
+
+    Each scroll waits for the feed to grow (or its end marker to appear) instead
+    of sleeping a fixed time, capped at SCROLL_MAX_WAIT_MS. Every step is timed
+    as a "scroll" phase in `stats`. Returns the number of listings loaded and
+    whether the end of the list was reached.
+    """
+    stats = stats if stats is not None else ScrapeStats()
+    with stats.phase("scroll"):
+        state = _feed_state(page, -1, SCROLL_MAX_WAIT_MS) or {"count": 0, "ended": False}
+    found, ended = state["count"], state["ended"]
+    no_change_count = 0
+
+    while found < target and not ended:
+        with stats.phase("scroll"):
+            page.mouse.wheel(0, random.randint(12000, 18000))
+            state = _feed_state(page, found, SCROLL_MAX_WAIT_MS)
+        if state is None:
+            no_change_count += 1
+            logging.info(f"No new results found, attempt {no_change_count}/{MAX_NO_CHANGE_SCROLLS}")
+            if no_change_count >= MAX_NO_CHANGE_SCROLLS:
+                logging.info("Reached maximum attempts with no new results")
+                break
+            # Nudge the feed: lazy loading sometimes needs a scroll back and forth
+            page.mouse.wheel(0, -5000)
+            page.mouse.wheel(0, 20000)
+            continue
+        no_change_count = 0
+        found, ended = state["count"], state["ended"]
+        logging.info(f"Currently Found: {found} (Target: {target})")
+
+    if ended:
+        logging.info(f"Reached the end of the results list with {found} listings")
+    elif found >= target:
+        logging.info(f"Reached target of {target} results")
+    return found, ended
+
+
+def collect_place_hrefs(page: Page) -> List[str]:
+    """Return the hrefs of all place listings currently loaded in the results feed."""
+    return list(page.evaluate(_COLLECT_HREFS_JS, PLACE_LINK_XPATH) or [])
+
+
+def new_listing_indexes(hrefs: List[str], dedup: Optional[DedupIndex] = None,
+                        stats: Optional[ScrapeStats] = None, feed_ids: Optional[Set[str]] = None) -> List[int]:
+    """Indexes of the feed hrefs worth opening: the first listing of each place not already in `dedup`.
+
+    Listings are compared by every ID in their href (place ID, feature ID,
+    CID); hrefs without one are always kept. Pass the same `feed_ids` set for
+    successive batches of one feed to compare them with the earlier batches
+    too. Dropped listings are counted as duplicates in `stats`.
+    """
+    keep = []
+    feed_ids = feed_ids if feed_ids is not None else set()
+    for idx, href in enumerate(hrefs):
+        ids = listing_ids(href)
+        if any(i in feed_ids for i in ids) or (dedup is not None and dedup.seen(href=href)):
+            if stats is not None:
+                stats.count("duplicate")
+            continue
+        feed_ids.update(ids)
+        keep.append(idx)
+    if len(keep) < len(hrefs):
+        logging.info(f"Skipping {len(hrefs) - len(keep)} listings already collected or repeated in the feed")
+    return keep
+
+
+def _wait_for_place_details(page: Page, idx: int) -> bool:
+    """Wait for the detail panel of listing idx to render. Returns False on timeout."""
+    try:
+        page.wait_for_selector(XPATHS["name"], timeout=PLACE_DETAIL_TIMEOUT)
+    except Exception:
         try:
-            locator = page.locator(selector)
-            if locator.count() > 0 and locator.first.is_visible(timeout=2000):
-                logging.info(f"Found search input with: {selector}")
-                return locator.first
+            page.wait_for_selector('//h1[contains(@class, "DUwDvf")]', timeout=PLACE_DETAIL_FALLBACK_TIMEOUT)
         except Exception:
-            continue
-    raise Exception(f"Could not find search input. Tried: {SEARCH_INPUT_SELECTORS}")
+            logging.warning(f"Could not load details for listing {idx+1}, skipping")
+            return False
+    return True
+
+
+def iter_places_from_urls(
+    context, urls: List[str], concurrency: int = DETAIL_CONCURRENCY, stats: Optional[ScrapeStats] = None,
+    with_urls: bool = False,
+) -> Iterator[Place]:
+    """Open place URLs on up to `concurrency` tabs and yield their Places in URL order.
+
+    Navigation is started on every free tab before waiting on the oldest one,
+    so up to `concurrency` detail pages load at the same time. Each Place gets
+    the place ID parsed from its URL. Loading is timed as "navigation" and
+    extraction as "extract" in `stats`; failed places are counted as skips.
+    With `with_urls`, (url, Place) pairs are yielded, `url` as passed in.
+    """
+    stats = stats if stats is not None else ScrapeStats()
+    pending = deque(enumerate(urls))
+    in_flight = deque()  # (idx, url, tab), oldest first
+    pages = []
+    try:
+        for _ in range(max(1, min(concurrency, len(urls)))):
+            tab = context.new_page()
+            tab.set_default_timeout(DEFAULT_PAGE_TIMEOUT)
+            pages.append(tab)
+        idle = list(pages)
+
+        while pending or in_flight:
+            while pending and idle:
+                idx, url = pending.popleft()
+                tab = idle.pop()
+                try:
+                    with stats.phase("navigation"):
+                        tab.goto(url, timeout=NAVIGATION_TIMEOUT, wait_until="commit")
+                    in_flight.append((idx, url, tab))
+                except Exception as e:
+                    logging.warning(f"Failed to open listing {idx+1}: {e}")
+                    stats.count("skipped_error")
+                    idle.append(tab)
+            if not in_flight:
+                continue
+
+            idx, url, tab = in_flight.popleft()
+            place = None
+            try:
+                # A direct place URL may land on the consent page first (once per context)
+                if "consent.google." in (tab.url or ""):
+                    with stats.phase("consent"):
+                        _dismiss_consent(tab)
+                with stats.phase("navigation"):
+                    loaded = _wait_for_place_details(tab, idx)
+                if loaded:
+                    with stats.phase("extract"):
+                        place = extract_place(tab, stats=stats)
+                    # Maps rewrites the address bar after load, so the requested URL's ID comes first
+                    place.place_id = parse_place_id(url) or parse_place_id(tab.url) or ""
+                else:
+                    stats.count("skipped_no_details")
+            except Exception as e:
+                logging.warning(f"Failed to extract listing {idx+1}: {e}")
+                stats.count("skipped_error")
+            idle.append(tab)
+            if place is not None:
+                yield (url, place) if with_urls else place
+    finally:
+        for tab in pages:
+            try:
+                tab.close()
+            except Exception:
+                pass
+
+
+def _probe_selectors(page: Page, selectors: List[str], timeout: float) -> Optional[int]:
+    """Race all `selectors` in one in-page check and return the index of the
+    first one with a visible match, or None if none shows up within `timeout` ms."""
+    try:
+        handle = page.wait_for_function(_PROBE_SELECTORS_JS, arg=list(selectors), timeout=timeout)
+        result = handle.json_value()
+    except PlaywrightTimeoutError:
+        return None
+    return result.get("index") if isinstance(result, dict) else None
+
+
+def _find_search_input(page: Page):
+    """Find the search input using multiple selectors (Google changes these)."""
+    idx = _probe_selectors(page, SEARCH_INPUT_SELECTORS, SEARCH_INPUT_TIMEOUT_MS)
+    if idx is None:
+        raise Exception(f"Could not find search input. Tried: {SEARCH_INPUT_SELECTORS}")
+    logging.info(f"Found search input with: {SEARCH_INPUT_SELECTORS[idx]}")
+    return page.locator(SEARCH_INPUT_SELECTORS[idx]).first
 
 
 def _dismiss_consent(page: Page) -> None:
     """Dismiss Google cookie consent dialog if present."""
-    # Common consent button selectors across Google consent forms
-    consent_selectors = [
-        # "Accept all" buttons (various languages/forms)
-        'button[aria-label="Accept all"]',
-        'button[aria-label="Accetta tutto"]',
-        'button[aria-label="Tout accepter"]',
-        'button[aria-label="Alle akzeptieren"]',
-        # Form-based consent buttons
-        '//button[contains(text(), "Accept all")]',
-        '//button[contains(text(), "Accetta tutto")]',
-        '//button[contains(text(), "Reject all")]',
-        '//button[contains(text(), "Rifiuta tutto")]',
-        # Generic consent dialog buttons
-        '[action="https://consent.google.com/save"] button',
-        'form[action*="consent"] button:first-of-type',
-    ]
-    for selector in consent_selectors:
-        try:
-            locator = page.locator(selector).first
-            if locator.is_visible(timeout=2000):
-                locator.click()
-                logging.info(f"Dismissed consent dialog with: {selector}")
-                page.wait_for_load_state("domcontentloaded")
-                return
-        except Exception:
-            continue
+    idx = _probe_selectors(page, CONSENT_SELECTORS, CONSENT_PROBE_TIMEOUT_MS)
+    if idx is None:
+        return
+    try:
+        page.locator(CONSENT_SELECTORS[idx]).first.click()
+        logging.info(f"Dismissed consent dialog with: {CONSENT_SELECTORS[idx]}")
+        page.wait_for_load_state("domcontentloaded")
+    except Exception as e:
+        logging.warning(f"Failed to dismiss consent dialog: {e}")
 
 
-def scrape_places(
-    search_for: str,
-    total: int,
-    headless: bool = DEFAULT_HEADLESS,
-    proxy: Optional[str] = DEFAULT_PROXY,
-) -> List[Place]:
-    setup_logging()
-    places: List[Place] = []
-    seen: set = set()  # (name, address) deduplication
+def build_launch_kwargs(headless: bool = DEFAULT_HEADLESS, proxy: Optional[str] = DEFAULT_PROXY) -> dict:
+    """Keyword arguments for chromium.launch with the configured arguments."""
+    browser_args = list(BROWSER_ARGS)
+    if headless:
+        browser_args.extend(HEADLESS_BROWSER_ARGS)
 
-    with sync_playwright() as p:
-        browser_args = list(BROWSER_ARGS)
-        if headless:
-            browser_args.extend(HEADLESS_BROWSER_ARGS)
+    launch_kwargs = {
+        "headless": headless,
+        "args": browser_args,
+    }
 
-        launch_kwargs = {
-            "headless": headless,
-            "args": browser_args,
-        }
+    # Auto-detect Chromium binary for cross-version compatibility
+    chromium_path = find_chromium()
+    if chromium_path:
+        launch_kwargs["executable_path"] = chromium_path
+        logging.info(f"Using Chromium: {chromium_path}")
 
-        # Auto-detect Chromium binary for cross-version compatibility
-        chromium_path = find_chromium()
-        if chromium_path:
-            launch_kwargs["executable_path"] = chromium_path
-            logging.info(f"Using Chromium: {chromium_path}")
+    if proxy:
+        launch_kwargs["proxy"] = {"server": proxy}
 
-        if proxy:
-            launch_kwargs["proxy"] = {"server": proxy}
+    return launch_kwargs
 
-        browser = p.chromium.launch(**launch_kwargs)
 
-        user_agent = random.choice(USER_AGENTS)
-        context = browser.new_context(
-            user_agent=user_agent,
-            viewport=DEFAULT_VIEWPORT,
-            locale=DEFAULT_LOCALE,
-        )
-        page = context.new_page()
-        page.set_default_timeout(DEFAULT_PAGE_TIMEOUT)
+def launch_browser(playwright, headless: bool = DEFAULT_HEADLESS, proxy: Optional[str] = DEFAULT_PROXY):
+    """Launch Chromium with the configured arguments."""
+    return playwright.chromium.launch(**build_launch_kwargs(headless, proxy))
 
-        try:
-            # Navigate and search with retry
-            for nav_attempt in range(NAVIGATION_RETRY_COUNT):
-                try:
-                    page.goto(MAPS_START_URL, timeout=NAVIGATION_TIMEOUT)
-                    page.wait_for_load_state("domcontentloaded")
 
-                    # Dismiss Google cookie consent dialog if present
-                    _dismiss_consent(page)
+def browser_context_options(proxy: Optional[str] = None) -> dict:
+    """Keyword arguments for browser.new_context: a random User-Agent and the default viewport/locale.
 
-                    # Find and fill the search input (selector varies by region/version)
-                    search_input = _find_search_input(page)
-                    search_input.fill(search_for)
-                    page.keyboard.press("Enter")
-                    page.wait_for_selector('//a[contains(@href, "https://www.google.com/maps/place")]')
-                    page.hover('//a[contains(@href, "https://www.google.com/maps/place")]')
-                    break
-                except Exception as e:
-                    if nav_attempt < NAVIGATION_RETRY_COUNT - 1:
-                        logging.warning(f"Navigation attempt {nav_attempt+1} failed: {e}, retrying...")
-                        time.sleep(2)
-                    else:
-                        raise
-
-            previously_counted = 0
-            no_change_count = 0
-
-            # Scroll until we have slightly more listings than requested (small buffer for duplicates/empties)
-            target_results = total + 10
-
-            while True:
-                page.mouse.wheel(0, 15000)
-                page.wait_for_timeout(SCROLL_WAIT_MS)
-                page.wait_for_selector('//a[contains(@href, "https://www.google.com/maps/place")]')
-                found = page.locator('//a[contains(@href, "https://www.google.com/maps/place")]').count()
-                logging.info(f"Currently Found: {found} (Target: {target_results})")
-
-                if found >= target_results:
-                    logging.info(f"Reached target of {target_results} results")
-                    break
+    With PERSIST_SESSION_STATE, the storage state saved by a previous run for
+    this locale and proxy is loaded, so its consent cookies are reused.
+    """
+    options = {
+        "user_agent": random.choice(USER_AGENTS),
+        "viewport": DEFAULT_VIEWPORT,
+        "locale": DEFAULT_LOCALE,
+    }
+    state = load_storage_state(DEFAULT_LOCALE, proxy) if PERSIST_SESSION_STATE else None
+    if state:
+        options["storage_state"] = state
+    return options
 
-                if found == previously_counted:
-                    no_change_count += 1
-                    logging.info(f"No new results found, attempt {no_change_count}/{MAX_NO_CHANGE_SCROLLS}")
-                    if no_change_count >= MAX_NO_CHANGE_SCROLLS:
-                        logging.info("Reached maximum attempts with no new results")
-                        break
-                    page.mouse.wheel(0, 20000)
-                    page.wait_for_timeout(2000)
-                    page.mouse.wheel(0, -5000)
-                    page.wait_for_timeout(1000)
-                else:
-                    no_change_count = 0
 
-                previously_counted = found
+def new_browser_context(
+    browser, block_resources: bool = BLOCK_RESOURCES, response_cache: bool = RESPONSE_CACHE,
+    proxy: Optional[str] = None,
+):
+    """Create a browser context with a random User-Agent and the default viewport/locale.
 
-                random_scroll = random.randint(8000, 12000)
-                page.mouse.wheel(0, random_scroll)
-                page.wait_for_timeout(random.randint(1000, 2000))
+    With block_resources, images, fonts and map tiles are aborted (see scraper.network);
+    with response_cache, place and search fetches go through the shared on-disk
+    cache (see scraper.response_cache).
+    """
+    context = browser.new_context(**browser_context_options(proxy))
+    if block_resources:
+        install_resource_blocking(context)
+    if response_cache:
+        # Registered last so it runs first and falls back to the blocker
+        install_response_cache(context)
+    return context
 
-            all_listings = page.locator('//a[contains(@href, "https://www.google.com/maps/place")]').all()
-            listings = [listing.locator("xpath=..") for listing in all_listings]
 
-            logging.info(f"Total Found: {len(listings)}, Processing all to ensure minimum {total} valid results")
+def feed_listings_wanted(total: int, produced: int, processed: int) -> int:
+    """How many more feed listings to load for `total - produced` more places.
 
-            for idx, listing in enumerate(listings):
-                try:
-                    page.wait_for_timeout(500)
-                    listing.click()
+    The yield of the listings processed so far (new places per listing, after
+    empty names and duplicates) is blended with FEED_YIELD_PRIOR, weighted as
+    FEED_YIELD_PRIOR_WEIGHT listings, so the first round loads a little more
+    than `total` and later rounds follow the observed rate.
+    """
+    rate = (produced + FEED_YIELD_PRIOR * FEED_YIELD_PRIOR_WEIGHT) / (processed + FEED_YIELD_PRIOR_WEIGHT)
+    return max(FEED_MIN_BATCH, math.ceil((total - produced) / max(rate, 0.05)))
 
-                    try:
-                        page.wait_for_selector(XPATHS["name"], timeout=PLACE_DETAIL_TIMEOUT)
-                    except:
-                        try:
-                            page.wait_for_selector('//h1[contains(@class, "DUwDvf")]', timeout=PLACE_DETAIL_FALLBACK_TIMEOUT)
-                        except:
-                            logging.warning(f"Could not load details for listing {idx+1}, skipping")
-                            continue
 
-                    page.wait_for_load_state("domcontentloaded")
-                    place = extract_place(page, listing=listing)
-                    if place.name:
-                        dedup_key = (place.name.strip().lower(), place.address.strip().lower())
-                        if dedup_key in seen:
-                            logging.info(f"Skipping duplicate: {place.name}")
-                        else:
-                            seen.add(dedup_key)
-                            places.append(place)
-                            logging.info(f"Extracted place {len(places)}: {place.name}")
-                            if len(places) >= total:
-                                logging.info(f"Reached target of {total} results")
-                                break
-                    else:
-                        logging.warning(f"No name found for listing {idx+1}, skipping.")
+def _iter_listing_places(
+    context, search_for: str, total: int, concurrency: int, mode: str = DEFAULT_SCRAPE_MODE,
+    place_cache=None, max_age: Optional[float] = None, stats: Optional[ScrapeStats] = None,
+    start_url: str = MAPS_START_URL, dedup: Optional[DedupIndex] = None,
+) -> Iterator[Tuple[Place, bool]]:
+    """Search on a new page of `context` and yield (place, from_cache) for up to `total` new places."""
+    stats = stats if stats is not None else ScrapeStats()
+    dedup = dedup if dedup is not None else DedupIndex()
+    feed_ids: Set[str] = set()  # IDs of the listings of earlier rounds
+
+    def known(href):
+        if dedup.seen(href=href):
+            logging.info(f"Skipping listing already collected: {href}")
+            stats.count("duplicate")
+            return True
+        return False
+
+    def cached(href):
+        if place_cache is None:
+            return None
+        return place_cache.get(parse_place_id(href), max_age=max_age)
+
+    # Each *_batch(start) reads the listings loaded from index `start` on and
+    # returns (end index, iterator of (place, from_cache, href) candidates)
+
+    def cards_batch(start):
+        with stats.phase("extract"):
+            cards = extract_cards(page)
+
+        def candidates():
+            for place in cards[start:]:
+                if place.name:
+                    yield place, False, None
+                else:
+                    stats.count("skipped_no_name")
+        return len(cards), candidates()
+
+    def tabs_batch(start):
+        hrefs = collect_place_hrefs(page)
+        new = [hrefs[start + i] for i in new_listing_indexes(hrefs[start:], dedup, stats, feed_ids)]
+        logging.info(f"Opening {len(new)} new detail pages on {concurrency} tabs")
+
+        def candidates():
+            to_open = []
+            href_by_id = {}
+            for href in new:
+                hit = cached(href)
+                if hit is not None:
+                    yield hit, True, href
+                else:
+                    to_open.append(href)
+                    href_by_id.update((place_id, href) for place_id in listing_ids(href))
+            for place in iter_places_from_urls(context, to_open, concurrency, stats=stats):
+                if place.name:
+                    yield place, False, href_by_id.get(place.place_id)
+                else:
+                    logging.warning("No name found for listing, skipping.")
+                    stats.count("skipped_no_name")
+        return len(hrefs), candidates()
+
+    def click_batch(start):
+        all_listings = page.locator(PLACE_LINK_XPATH).all()
+        # Same XPath, same document order: hrefs[idx] belongs to all_listings[idx]
+        hrefs = collect_place_hrefs(page)
+        end = len(all_listings)
+        new = {start + i for i in new_listing_indexes(hrefs[start:end], dedup, stats, feed_ids)}
+
+        def candidates():
+            for idx in range(start, end):
+                href = hrefs[idx] if idx < len(hrefs) else None
+                if href is not None and (idx not in new or known(href)):
+                    continue
+                hit = cached(href)
+                if hit is not None:
+                    yield hit, True, href
+                    continue
+                listing = all_listings[idx].locator("xpath=..")
+                try:
+                    with stats.phase("click"):
+                        page.wait_for_timeout(500)
+                        listing.click()
+                        loaded = _wait_for_place_details(page, idx)
+                    if not loaded:
+                        stats.count("skipped_no_details")
+                        continue
+
+                    with stats.phase("extract"):
+                        page.wait_for_load_state("domcontentloaded")
+                        place = extract_place(page, listing=listing, stats=stats)
+                    place.place_id = parse_place_id(href) or parse_place_id(page.url) or ""
                 except Exception as e:
                     logging.warning(f"Failed to extract listing {idx+1}: {e}")
+                    stats.count("skipped_error")
                     page.wait_for_timeout(1000)
                     continue
+                if place.name:
+                    yield place, False, href
+                else:
+                    logging.warning(f"No name found for listing {idx+1}, skipping.")
+                    stats.count("skipped_no_name")
+        return end, candidates()
+
+    if mode == "list":
+        read_batch = cards_batch
+    elif concurrency > 1:
+        read_batch = tabs_batch
+    else:
+        read_batch = click_batch
+
+    page = context.new_page()
+    page.set_default_timeout(DEFAULT_PAGE_TIMEOUT)
+
+    try:
+        # Navigate and search with retry
+        for nav_attempt in range(NAVIGATION_RETRY_COUNT):
+            try:
+                with stats.phase("navigation"):
+                    page.goto(start_url, timeout=NAVIGATION_TIMEOUT)
+                    page.wait_for_load_state("domcontentloaded")
+
+                # Dismiss Google cookie consent dialog if present (not shown once a
+                # persisted session carries the consent cookie)
+                with stats.phase("consent"):
+                    if not has_consent_cookie(context.cookies()):
+                        _dismiss_consent(page)
+
+                # Find and fill the search input (selector varies by region/version)
+                with stats.phase("search"):
+                    search_input = _find_search_input(page)
+                    search_input.fill(search_for)
+                    page.keyboard.press("Enter")
+                    page.wait_for_selector(PLACE_LINK_XPATH)
+                    page.hover(PLACE_LINK_XPATH)
+                break
+            except Exception as e:
+                if nav_attempt < NAVIGATION_RETRY_COUNT - 1:
+                    logging.warning(f"Navigation attempt {nav_attempt+1} failed: {e}, retrying...")
+                    stats.count("navigation_retry")
+                    time.sleep(2)
+                else:
+                    raise
+
+        processed = produced = 0
+        while produced < total:
+            target = processed + feed_listings_wanted(total, produced, processed)
+            stats.feed_listings, stats.feed_ended = scroll_feed(page, target, stats=stats)
+            end, candidates = read_batch(processed)
+            if end <= processed:
+                break
+            logging.info(f"Total Found: {end}, processing listings {processed + 1}-{end} "
+                         f"({produced}/{total} places so far)")
+            processed = end
+            try:
+                for place, from_cache, href in candidates:
+                    if not dedup.add(place, href=href):
+                        logging.info(f"Skipping duplicate: {place.name}")
+                        stats.count("duplicate")
+                        continue
+                    produced += 1
+                    yield place, from_cache
+                    if produced >= total:
+                        return
+            finally:
+                candidates.close()
+            if stats.feed_ended:
+                break
+    finally:
+        page.close()
+
 
+@contextmanager
+def _browser_context(
+    headless: bool, proxy: Optional[str], pool=None,
+    block_resources: bool = BLOCK_RESOURCES, response_cache: bool = RESPONSE_CACHE,
+    stats: Optional[ScrapeStats] = None,
+):
+    """Yield a browser context borrowed from `pool`, or from a browser launched for this block.
+
+    Unless the block raises, the context's storage state is saved for the next
+    run. The time to get the context is added to the "launch" phase of `stats`.
+    """
+    stats = stats if stats is not None else ScrapeStats()
+    if pool is not None:
+        start = time.perf_counter()
+        with pool.context(headless=headless, proxy=proxy, block_resources=block_resources,
+                          response_cache=response_cache) as context:
+            stats.add_time("launch", time.perf_counter() - start)
+            with _persisted_session(context, proxy):
+                yield context
+        return
+    start = time.perf_counter()
+    with sync_playwright() as p:
+        browser = launch_browser(p, headless=headless, proxy=proxy)
+        context = new_browser_context(browser, block_resources=block_resources, response_cache=response_cache,
+                                      proxy=proxy)
+        stats.add_time("launch", time.perf_counter() - start)
+        try:
+            with _persisted_session(context, proxy):
+                yield context
         finally:
             context.close()
             browser.close()
 
+
+@contextmanager
+def _persisted_session(context, proxy: Optional[str]):
+    # Closing a generator early (GeneratorExit) still counts as a successful run
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        if PERSIST_SESSION_STATE and not failed:
+            save_storage_state(context, DEFAULT_LOCALE, proxy)
+
+
+def _resolve_place_cache(place_cache):
+    """None -> the shared PlaceCache if PLACE_CACHE is on; False -> no cache."""
+    if place_cache is False:
+        return None
+    if place_cache is None:
+        if not PLACE_CACHE:
+            return None
+        from scraper.place_cache import shared_place_cache
+        return shared_place_cache()
+    return place_cache
+
+
+def iter_places(
+    search_for: str,
+    total: int,
+    headless: bool = DEFAULT_HEADLESS,
+    proxy: Optional[str] = DEFAULT_PROXY,
+    concurrency: int = DETAIL_CONCURRENCY,
+    pool=None,
+    mode: str = DEFAULT_SCRAPE_MODE,
+    block_resources: bool = BLOCK_RESOURCES,
+    response_cache: bool = RESPONSE_CACHE,
+    place_cache=None,
+    max_age: Optional[float] = None,
+    stats: Optional[ScrapeStats] = None,
+    start_url: str = MAPS_START_URL,
+    dedup: Optional[DedupIndex] = None,
+) -> Iterator[Place]:
+    """Search Google Maps and yield up to `total` unique places as they are extracted.
+
+    Consume it on the thread that started it; the browser closes when it is exhausted or closed.
+    """
+    if mode not in SCRAPE_MODES:
+        raise ValueError(f"Unknown scrape mode {mode!r}, expected one of {SCRAPE_MODES}")
+    setup_logging()
+    place_cache = _resolve_place_cache(place_cache)
+    # List mode reads partial places: never cache them or serve detail records for them
+    if mode == "list":
+        place_cache = None
+    stats = stats if stats is not None else ScrapeStats()
+    dedup = dedup if dedup is not None else DedupIndex()
+    count = 0
+
+    with _browser_context(headless, proxy, pool, block_resources, response_cache, stats=stats) as context:
+        # Closed before the context exits, so the search page goes before its browser
+        with closing(_iter_listing_places(context, search_for, total, concurrency, mode,
+                                          place_cache=place_cache, max_age=max_age, stats=stats,
+                                          start_url=start_url, dedup=dedup)) as listings:
+            for place, from_cache in listings:
+                count += 1
+                if from_cache:
+                    stats.cache_hits += 1
+                    stats.cached_place_ids.add(place.place_id)
+                    logging.info(f"Cached place {count}: {place.name}")
+                else:
+                    stats.scraped += 1
+                    if place_cache is not None:
+                        place_cache.put(place)
+                    logging.info(f"Extracted place {count}: {place.name}")
+                yield place
+                if count >= total:
+                    logging.info(f"Reached target of {total} results")
+                    break
+
+
+def scrape_places(
+    search_for: str,
+    total: int,
+    headless: bool = DEFAULT_HEADLESS,
+    proxy: Optional[str] = DEFAULT_PROXY,
+    concurrency: int = DETAIL_CONCURRENCY,
+    pool=None,
+    mode: str = DEFAULT_SCRAPE_MODE,
+    block_resources: bool = BLOCK_RESOURCES,
+    response_cache: bool = RESPONSE_CACHE,
+    place_cache=None,
+    max_age: Optional[float] = None,
+    stats: Optional[ScrapeStats] = None,
+    start_url: str = MAPS_START_URL,
+    dedup: Optional[DedupIndex] = None,
+) -> List[Place]:
+    """Collect the places of iter_places into a list."""
+    places = list(iter_places(search_for, total, headless=headless, proxy=proxy,
+                              concurrency=concurrency, pool=pool, mode=mode,
+                              block_resources=block_resources, response_cache=response_cache,
+                              place_cache=place_cache, max_age=max_age, stats=stats,
+                              start_url=start_url, dedup=dedup))
+    logging.info(f"Final result: {len(places)} places extracted")
+    return places
+
+def iter_places_by_url(
+    refs: List[str],
+    headless: bool = DEFAULT_HEADLESS,
+    proxy: Optional[str] = DEFAULT_PROXY,
+    concurrency: int = PLACE_URL_CONCURRENCY,
+    pool=None,
+    block_resources: bool = BLOCK_RESOURCES,
+    response_cache: bool = RESPONSE_CACHE,
+    place_cache=None,
+    stats: Optional[ScrapeStats] = None,
+    with_urls: bool = False,
+) -> Iterator[Place]:
+    """Open known places directly and yield their Places in input order.
+
+    `refs` are /maps/place/... URLs or place IDs (see scraper.place_ids). There
+    is no search, scroll or click phase: each place is loaded on one of
+    `concurrency` tabs and extracted. Places that fail to load are skipped.
+    Every place is scraped fresh and stored in `place_cache` (see iter_places).
+    With `with_urls`, (url, Place) pairs are yielded, `url` being the
+    normalized URL of the ref the place was opened from.
+    """
+    urls = place_urls(refs)
+    place_cache = _resolve_place_cache(place_cache)
+    stats = stats if stats is not None else ScrapeStats()
+    setup_logging()
+    count = 0
+    with _browser_context(headless, proxy, pool, block_resources, response_cache, stats=stats) as context:
+        for url, place in iter_places_from_urls(context, urls, concurrency, stats=stats, with_urls=True):
+            if not place.name:
+                logging.warning("No name found for place, skipping.")
+                stats.count("skipped_no_name")
+                continue
+            count += 1
+            stats.scraped += 1
+            if place_cache is not None:
+                place_cache.put(place)
+            logging.info(f"Extracted place {count}/{len(urls)}: {place.name}")
+            yield (url, place) if with_urls else place
+
+
+def scrape_places_by_url(
+    refs: List[str],
+    headless: bool = DEFAULT_HEADLESS,
+    proxy: Optional[str] = DEFAULT_PROXY,
+    concurrency: int = PLACE_URL_CONCURRENCY,
+    pool=None,
+    block_resources: bool = BLOCK_RESOURCES,
+    response_cache: bool = RESPONSE_CACHE,
+    place_cache=None,
+    stats: Optional[ScrapeStats] = None,
+) -> List[Place]:
+    """Collect the places of iter_places_by_url into a list."""
+    places = list(iter_places_by_url(refs, headless=headless, proxy=proxy, concurrency=concurrency,
+                                     pool=pool, block_resources=block_resources,
+                                     response_cache=response_cache, place_cache=place_cache, stats=stats))
     logging.info(f"Final result: {len(places)} places extracted")
     return places
 
 def save_places_to_csv(places: List[Place], output_path: str = "result.csv", append: bool = False):
-    df = pd.DataFrame([asdict(place) for place in places])
-    if not df.empty:
-        for column in df.columns:
-            if df[column].nunique() == 1:
-                df.drop(column, axis=1, inplace=True)
-        file_exists = os.path.isfile(output_path)
-        mode = "a" if append else "w"
-        header = not (append and file_exists)
-        df.to_csv(output_path, index=False, mode=mode, header=header)
-        logging.info(f"Saved {len(df)} places to {output_path} (append={append})")
-    else:
-        logging.warning("No data to save. DataFrame is empty.")
+    """Write places to a CSV file with the fixed Place columns."""
+    if not places:
+        logging.warning("No data to save. Place list is empty.")
+        return
+    from scraper.writers import CsvPlaceWriter
+    with CsvPlaceWriter(output_path, append=append) as writer:
+        for place in places:
+            writer.write(place)
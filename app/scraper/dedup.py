@@ -0,0 +1,118 @@
+"""Deduplication index shared by every search of a job, optionally kept across jobs.
+
+A place is known by its IDs when available (its Place's place ID and every
+ID in its listing href, see scraper.place_ids.listing_ids) and by its
+normalized name and address. All keys of a place are recorded, so a listing
+matches whichever of them it carries. Lookups are set operations; with a scope the
+keys are also written to SQLite and loaded again by later jobs.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional
+
+from config import DEDUP_DB_PATH
+from scraper.place_ids import listing_ids
+from scraper.sqlite_util import LazySQLite
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS seen (scope TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (scope, key));"
+
+
+def normalize_text(value: str) -> str:
+    """Case-, accent- and punctuation-insensitive form of `value`."""
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    return _NON_WORD_RE.sub(" ", value.lower()).strip()
+
+
+def dedup_keys(place=None, href: Optional[str] = None) -> List[str]:
+    """Keys of a place and/or listing href: "id:<id>" for each ID and "na:<name>|<address>"."""
+    ids = [place.place_id] if place is not None and place.place_id else []
+    ids += listing_ids(href)
+    keys = [f"id:{place_id}" for place_id in dict.fromkeys(ids)]
+    if place is not None and place.name.strip():
+        keys.append(f"na:{normalize_text(place.name)}|{normalize_text(place.address)}")
+    return keys
+
+
+class DedupIndex:
+    """Thread-safe set of the places already collected.
+
+    With `scope`, keys are persisted in `db_path` under that scope and the
+    keys of earlier jobs of the same scope count as collected.
+    """
+
+    def __init__(self, scope: Optional[str] = None, db_path: str = DEDUP_DB_PATH):
+        self.scope = scope
+        self.db_path = db_path
+        self._keys = set()
+        self._lock = threading.RLock()
+        self._db = LazySQLite(db_path, _SCHEMA)
+        self._loaded = scope is None
+        self.added = 0
+
+    def _load(self) -> None:
+        # Caller holds the lock
+        if self._loaded:
+            return
+        self._loaded = True
+        db = self._db(create=False)
+        if db is not None:
+            self._keys.update(key for (key,) in db.execute("SELECT key FROM seen WHERE scope = ?", (self.scope,)))
+
+    def seen(self, place=None, href: Optional[str] = None) -> bool:
+        """True if the place or listing href matches a collected place."""
+        keys = dedup_keys(place, href)
+        with self._lock:
+            self._load()
+            return any(key in self._keys for key in keys)
+
+    def add(self, place=None, href: Optional[str] = None) -> bool:
+        """Record a place; True if it is new, False if it was already collected.
+
+        Keys a known place did not carry yet are recorded too, so later
+        listings match by any of its IDs or by its name and address.
+        """
+        keys = dedup_keys(place, href)
+        if not keys:
+            return True
+        with self._lock:
+            self._load()
+            new = not any(key in self._keys for key in keys)
+            fresh = [key for key in keys if key not in self._keys]
+            self._keys.update(fresh)
+            if new:
+                self.added += 1
+            if fresh and self.scope is not None:
+                db = self._db()
+                db.executemany("INSERT OR IGNORE INTO seen (scope, key) VALUES (?, ?)",
+                               [(self.scope, key) for key in fresh])
+                db.commit()
+        return new
+
+    def clear(self) -> None:
+        """Forget every key, including the persisted keys of this scope."""
+        with self._lock:
+            self._keys.clear()
+            self.added = 0
+            if self.scope is not None:
+                db = self._db(create=False)
+                if db is not None:
+                    db.execute("DELETE FROM seen WHERE scope = ?", (self.scope,))
+                    db.commit()
+
+
+_scoped_indexes: Dict[str, DedupIndex] = {}
+_scoped_lock = threading.Lock()
+
+
+def scoped_dedup_index(scope: str) -> DedupIndex:
+    """The process-wide persistent DedupIndex of `scope`, so concurrent jobs of a scope share it."""
+    with _scoped_lock:
+        index = _scoped_indexes.get(scope)
+        if index is None:
+            index = _scoped_indexes[scope] = DedupIndex(scope=scope)
+        return index
@@ -0,0 +1,122 @@
+"""Process-wide scrape metrics, rendered in the Prometheus text exposition format.
+
+Every ScrapeStats forwards its timed phases and counted events here, so the
+API server can expose totals across all jobs on /metrics while each job keeps
+its own summary.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from config import METRICS_BUCKETS
+
+PHASE_SECONDS = "gms_phase_seconds"
+SCRAPE_EVENTS = "gms_scrape_events_total"
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: dict) -> _LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: _LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms keyed by metric name and labels."""
+
+    def __init__(self, buckets: Iterable[float] = METRICS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        self._values: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, dict]] = {}
+        self.describe(PHASE_SECONDS, "histogram", "Seconds spent in each scrape phase")
+        self.describe(SCRAPE_EVENTS, "counter", "Retries, skips, duplicates and places produced by scrapes")
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        """Declare the TYPE ("counter", "gauge" or "histogram") and HELP line of a metric."""
+        with self._lock:
+            self._meta[name] = (kind, help_text)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._values.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist["buckets"][i] += 1
+            hist["count"] += 1
+            hist["sum"] += value
+
+    def value(self, name: str, **labels) -> float:
+        """Current value of a counter or gauge (0 if never set)."""
+        with self._lock:
+            return self._values.get(name, {}).get(_label_key(labels), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            names = sorted(set(self._values) | set(self._histograms))
+            for name in names:
+                kind, help_text = self._meta.get(name, ("untyped", ""))
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(self._values.get(name, {}).items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                for key, hist in sorted(self._histograms.get(name, {}).items()):
+                    for bound, count in zip(self.buckets, hist["buckets"]):
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {hist['count']}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {round(hist['sum'], 6)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {hist['count']}")
+        return "\n".join(lines) + "\n"
+
+
+_shared_metrics: Optional[MetricsRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def shared_metrics() -> MetricsRegistry:
+    """The process-wide MetricsRegistry fed by every ScrapeStats (created on first use)."""
+    global _shared_metrics
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = MetricsRegistry()
+        return _shared_metrics
@@ -0,0 +1,65 @@
+"""Request interception for browser contexts: abort the resources the scraper never reads."""
+
+import logging
+from typing import Iterable, Optional
+
+from config import BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PATTERNS, ALLOWED_URL_PATTERNS
+
+
+class ResourceBlocker:
+    """Route handler that aborts images, media, fonts and map tiles.
+
+    A request is aborted when its resource type is in `resource_types` or its
+    URL contains one of `url_patterns`, unless its URL contains one of
+    `allowed_patterns` (the allow-list wins, so the Maps app shell still boots).
+    """
+
+    def __init__(
+        self,
+        resource_types: Optional[Iterable[str]] = None,
+        url_patterns: Optional[Iterable[str]] = None,
+        allowed_patterns: Optional[Iterable[str]] = None,
+    ):
+        self.resource_types = frozenset(BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types)
+        self.url_patterns = tuple(BLOCKED_URL_PATTERNS if url_patterns is None else url_patterns)
+        self.allowed_patterns = tuple(ALLOWED_URL_PATTERNS if allowed_patterns is None else allowed_patterns)
+        self.blocked = 0
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if any(pattern in url for pattern in self.allowed_patterns):
+            return False
+        return resource_type in self.resource_types or any(pattern in url for pattern in self.url_patterns)
+
+    def handle(self, route) -> None:
+        """Sync Playwright route handler."""
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route) -> None:
+        """Async Playwright route handler."""
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+
+def install_resource_blocking(context, blocker: Optional[ResourceBlocker] = None) -> ResourceBlocker:
+    """Route every request of a sync browser context through a ResourceBlocker."""
+    blocker = blocker or ResourceBlocker()
+    context.route("**/*", blocker.handle)
+    logging.debug("Resource blocking enabled on browser context")
+    return blocker
+
+
+async def install_resource_blocking_async(context, blocker: Optional[ResourceBlocker] = None) -> ResourceBlocker:
+    """Route every request of an async browser context through a ResourceBlocker."""
+    blocker = blocker or ResourceBlocker()
+    await context.route("**/*", blocker.handle_async)
+    logging.debug("Resource blocking enabled on browser context")
+    return blocker
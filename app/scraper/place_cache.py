@@ -0,0 +1,85 @@
+"""Persistent cache of extracted places keyed by place ID.
+
+Lets the scraper skip the click-and-extract step for places scraped recently:
+a cached Place is reused while it is younger than the max age.
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict, fields
+from typing import Optional
+
+from config import PLACE_CACHE_DB_PATH, PLACE_CACHE_MAX_AGE_SEC
+from scraper.core import Place
+from scraper.sqlite_util import LazySQLite
+
+_PLACE_FIELDS = {f.name for f in fields(Place)}
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS places (place_id TEXT PRIMARY KEY, place TEXT NOT NULL, scraped REAL NOT NULL);"
+
+
+class PlaceCache:
+    """SQLite-backed Place cache with a freshness policy.
+
+    get() returns a place only while it is younger than `max_age` seconds
+    (overridable per call).
+    """
+
+    def __init__(self, db_path: str = PLACE_CACHE_DB_PATH, max_age: float = PLACE_CACHE_MAX_AGE_SEC):
+        self.db_path = db_path
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._db = LazySQLite(db_path, _SCHEMA)
+
+    def get(self, place_id: str, max_age: Optional[float] = None) -> Optional[Place]:
+        """Return the cached place if it was scraped less than `max_age` seconds ago."""
+        if not place_id:
+            return None
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            db = self._db(create=False)
+            if db is None:
+                return None
+            row = db.execute("SELECT place, scraped FROM places WHERE place_id = ?", (place_id,)).fetchone()
+        if row is None or time.time() - row[1] > max_age:
+            return None
+        data = json.loads(row[0])
+        return Place(**{k: v for k, v in data.items() if k in _PLACE_FIELDS})
+
+    def put(self, place: Place) -> None:
+        """Store a freshly scraped place under its place_id (places without one are ignored)."""
+        if not place.place_id:
+            return
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO places (place_id, place, scraped) VALUES (?, ?, ?)",
+                (place.place_id, json.dumps(asdict(place)), time.time()),
+            )
+            db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            db = self._db(create=False)
+            return db.execute("SELECT COUNT(*) FROM places").fetchone()[0] if db is not None else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._db(create=False)
+            if db is not None:
+                db.execute("DELETE FROM places")
+                db.commit()
+
+
+_shared_cache: Optional[PlaceCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_place_cache() -> PlaceCache:
+    """The process-wide PlaceCache used when PLACE_CACHE is enabled (created on first use)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PlaceCache()
+        return _shared_cache
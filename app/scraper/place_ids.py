@@ -0,0 +1,103 @@
+"""Place references: parse place IDs from Maps URLs and turn URLs or IDs into navigable URLs."""
+
+import re
+from typing import Iterable, List, Optional
+from urllib.parse import quote, unquote
+
+MAPS_BASE_URL = "https://www.google.com"
+
+# Places API ID, e.g. "ChIJN1t_tDeuEmsRUsoyG83frY4"
+_PLACE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{20,}$")
+# Maps feature ID as found in place URLs, e.g. "0x89d4cb90d7c63ba5:0x323555502ab4c477"
+_FEATURE_ID_RE = re.compile(r"^0x[0-9a-f]+:0x[0-9a-f]+$", re.IGNORECASE)
+
+# IDs embedded in place URLs: "!19s<place id>" and "!1s<feature id>" in the data
+# segment, "place_id:<id>" in queries, "?cid=<decimal CID>"
+_URL_PLACE_ID_RE = re.compile(r"(?:!19s|place_id:)([A-Za-z0-9_-]{20,})")
+_URL_FEATURE_ID_RE = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)", re.IGNORECASE)
+_URL_CID_RE = re.compile(r"[?&]cid=(\d+)")
+
+
+def parse_place_id(href: str) -> Optional[str]:
+    """Return the place ID in a place URL, or None if it carries none.
+
+    The Places API ID ("ChIJ...") is preferred; otherwise the Maps feature ID
+    ("0x...:0x...") or the CID ("cid:<n>"). A bare ID is returned unchanged.
+    """
+    if not isinstance(href, str) or not href.strip():
+        return None
+    href = unquote(href.strip())
+    if _FEATURE_ID_RE.match(href):
+        return href.lower()
+    if _PLACE_ID_RE.match(href):
+        return href
+    match = _URL_PLACE_ID_RE.search(href)
+    if match:
+        return match.group(1)
+    match = _URL_FEATURE_ID_RE.search(href)
+    if match:
+        return match.group(1).lower()
+    match = _URL_CID_RE.search(href)
+    if match:
+        return f"cid:{match.group(1)}"
+    return None
+
+
+def listing_ids(href: str) -> List[str]:
+    """Return every stable ID in a place URL: place ID, feature ID and CID, in that order.
+
+    Two listings of the same place may not carry the same kind of ID, so
+    comparing all of them catches repeats that parse_place_id alone would miss.
+    """
+    if not isinstance(href, str) or not href.strip():
+        return []
+    href = unquote(href.strip())
+    if _FEATURE_ID_RE.match(href):
+        return [href.lower()]
+    if _PLACE_ID_RE.match(href):
+        return [href]
+    ids = []
+    match = _URL_PLACE_ID_RE.search(href)
+    if match:
+        ids.append(match.group(1))
+    match = _URL_FEATURE_ID_RE.search(href)
+    if match:
+        ids.append(match.group(1).lower())
+    match = _URL_CID_RE.search(href)
+    if match:
+        ids.append(f"cid:{match.group(1)}")
+    return ids
+
+
+def place_url(ref: str) -> str:
+    """Return a URL that opens the place `ref` directly.
+
+    `ref` may be an absolute or site-relative /maps/place/... URL, a place ID
+    ("ChIJ...") or a feature ID ("0x...:0x..."). Raises ValueError otherwise.
+    """
+    ref = (ref or "").strip()
+    if ref.startswith(("http://", "https://")):
+        if "/maps" not in ref:
+            raise ValueError(f"Not a Google Maps URL: {ref!r}")
+        return ref
+    if ref.startswith("/maps/"):
+        return MAPS_BASE_URL + ref
+    if _FEATURE_ID_RE.match(ref):
+        return f"{MAPS_BASE_URL}/maps/place/data=!4m2!3m1!1s{ref}"
+    if _PLACE_ID_RE.match(ref):
+        return f"{MAPS_BASE_URL}/maps/place/?q=place_id:{quote(ref)}"
+    raise ValueError(f"Not a place URL or place ID: {ref!r}")
+
+
+def place_urls(refs: Iterable[str]) -> List[str]:
+    """Normalize `refs` with place_url, dropping blanks and repeated places."""
+    urls = []
+    seen = set()
+    for ref in refs:
+        if not (ref or "").strip():
+            continue
+        url = place_url(ref)
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
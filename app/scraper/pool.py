@@ -0,0 +1,154 @@
+"""Pool of warm Chromium browsers shared across scrape_places calls."""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from playwright.sync_api import sync_playwright
+
+from config import (
+    BROWSER_POOL_SIZE, BROWSER_MAX_USES, BROWSER_POOL_ACQUIRE_TIMEOUT_SEC,
+    DEFAULT_HEADLESS, DEFAULT_PROXY, BLOCK_RESOURCES, RESPONSE_CACHE,
+)
+from scraper.core import launch_browser, new_browser_context
+
+
+class _PooledBrowser:
+    def __init__(self, key, browser, context):
+        self.key = key
+        self.browser = browser
+        self.context = context
+        self.uses = 0
+
+
+class BrowserPool:
+    """Keeps Chromium processes and their contexts alive between scrapes.
+
+    Playwright's sync API binds every object to the thread that created it, so
+    each thread gets its own driver and its own idle browsers. `max_size` caps
+    the number of browsers alive across all threads; a browser is recycled
+    after `max_uses` checkouts and health-checked before it is handed out.
+    """
+
+    def __init__(
+        self,
+        max_size: int = BROWSER_POOL_SIZE,
+        max_uses: int = BROWSER_MAX_USES,
+        acquire_timeout: float = BROWSER_POOL_ACQUIRE_TIMEOUT_SEC,
+    ):
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self._cond = threading.Condition()
+        self._live = 0
+        self._local = threading.local()
+
+    @property
+    def live(self) -> int:
+        """Number of browsers currently alive in the pool."""
+        return self._live
+
+    @contextmanager
+    def context(self, headless: bool = DEFAULT_HEADLESS, proxy: Optional[str] = DEFAULT_PROXY,
+                block_resources: bool = BLOCK_RESOURCES, response_cache: bool = RESPONSE_CACHE):
+        """Borrow a warm browser context for the duration of the block."""
+        entry = self._checkout((headless, proxy, block_resources, response_cache))
+        try:
+            yield entry.context
+        finally:
+            self._checkin(entry)
+
+    def close(self) -> None:
+        """Close the browsers and driver owned by the calling thread."""
+        state = self._state()
+        while state["idle"]:
+            self._discard(state["idle"].pop())
+        if state["playwright"] is not None:
+            try:
+                state["playwright"].stop()
+            except Exception as e:
+                logging.warning(f"Failed to stop Playwright driver: {e}")
+            state["playwright"] = None
+
+    def _state(self) -> dict:
+        state = getattr(self._local, "state", None)
+        if state is None:
+            state = self._local.state = {"playwright": None, "idle": []}
+        return state
+
+    def _checkout(self, key) -> _PooledBrowser:
+        state = self._state()
+        for entry in [e for e in state["idle"] if e.key == key]:
+            state["idle"].remove(entry)
+            if self._is_healthy(entry):
+                entry.uses += 1
+                return entry
+            logging.warning("Pooled browser failed health check, replacing it")
+            self._discard(entry)
+
+        self._reserve_slot(state)
+        try:
+            if state["playwright"] is None:
+                state["playwright"] = sync_playwright().start()
+            headless, proxy, block_resources, response_cache = key
+            browser = launch_browser(state["playwright"], headless=headless, proxy=proxy)
+            context = new_browser_context(browser, block_resources=block_resources, response_cache=response_cache,
+                                          proxy=proxy)
+            entry = _PooledBrowser(key, browser, context)
+        except Exception:
+            self._release_slot()
+            raise
+        entry.uses = 1
+        return entry
+
+    def _checkin(self, entry: _PooledBrowser) -> None:
+        if entry.uses >= self.max_uses:
+            logging.info(f"Recycling browser after {entry.uses} uses")
+            self._discard(entry)
+        elif not self._is_healthy(entry):
+            self._discard(entry)
+        else:
+            self._state()["idle"].append(entry)
+
+    def _is_healthy(self, entry: _PooledBrowser) -> bool:
+        try:
+            if not entry.browser.is_connected():
+                return False
+            for page in entry.context.pages:
+                page.close()
+            entry.context.cookies()
+            return True
+        except Exception:
+            return False
+
+    def _reserve_slot(self, state: dict) -> None:
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._cond:
+                if self._live < self.max_size:
+                    self._live += 1
+                    return
+                victim = state["idle"].pop(0) if state["idle"] else None
+                if victim is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(f"Browser pool exhausted: {self.max_size} browsers in use")
+                    self._cond.wait(remaining)
+                    continue
+            # Free a slot held by one of our own idle browsers (different launch options)
+            self._discard(victim)
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    def _discard(self, entry: _PooledBrowser) -> None:
+        for closeable in (entry.context, entry.browser):
+            try:
+                closeable.close()
+            except Exception:
+                pass
+        self._release_slot()
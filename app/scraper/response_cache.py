@@ -0,0 +1,262 @@
+"""On-disk HTTP response cache plugged into browser contexts through request routing.
+
+Response bodies are stored once per content hash under `<cache dir>/blobs`;
+a SQLite index maps each request (method + URL) to its blob, status and
+headers. Entries expire after `ttl` seconds and the least recently used ones
+are evicted once the cache holds more than `max_bytes`.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from config import (
+    RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTL_SEC, RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_URL_PATTERNS, RESPONSE_CACHE_RESOURCE_TYPES,
+)
+from scraper.sqlite_util import LazySQLite
+
+# Not replayed from the cache: the stored body is already decoded, and cookies belong to the original session
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses ("
+    "key TEXT PRIMARY KEY, blob TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, "
+    "size INTEGER NOT NULL, stored REAL NOT NULL, accessed REAL NOT NULL);"
+    "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);"
+)
+
+
+class ResponseCache:
+    """Content-addressed response cache with TTL, LRU size cap and hit/miss stats.
+
+    Only GET requests of `resource_types` whose URL contains one of
+    `url_patterns` are cached, and only 200 responses are stored: redirects are
+    not followed, so a redirect to the consent page is never stored under the
+    URL that was requested. Safe to share between threads and contexts.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = RESPONSE_CACHE_DIR,
+        ttl: float = RESPONSE_CACHE_TTL_SEC,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        url_patterns: Optional[Iterable[str]] = None,
+        resource_types: Optional[Iterable[str]] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.url_patterns = tuple(RESPONSE_CACHE_URL_PATTERNS if url_patterns is None else url_patterns)
+        self.resource_types = frozenset(RESPONSE_CACHE_RESOURCE_TYPES if resource_types is None else resource_types)
+        self._lock = threading.RLock()
+        self._db = LazySQLite(os.path.join(cache_dir, "index.sqlite3"), _SCHEMA)
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    # ---------- index ----------
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest)
+
+    def _drop_blob_if_unused(self, db: sqlite3.Connection, digest: str) -> None:
+        if db.execute("SELECT 1 FROM responses WHERE blob = ? LIMIT 1", (digest,)).fetchone() is None:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+
+    # ---------- public API ----------
+
+    @staticmethod
+    def key_for(method: str, url: str) -> str:
+        return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+
+    def cacheable(self, method: str, resource_type: str, url: str) -> bool:
+        return (method.upper() == "GET" and resource_type in self.resource_types
+                and any(pattern in url for pattern in self.url_patterns))
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return {"status", "headers", "body"} for a fresh entry, or None (counted as a miss)."""
+        with self._lock:
+            db = self._db(create=False)
+            row = None if db is None else db.execute(
+                "SELECT blob, status, headers, stored FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and time.time() - row[3] > self.ttl:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._drop_blob_if_unused(db, row[0])
+                db.commit()
+                self._stats["expired"] += 1
+                row = None
+            body = None
+            if row is not None:
+                try:
+                    with open(self._blob_path(row[0]), "rb") as f:
+                        body = f.read()
+                except OSError:
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    db.commit()
+            if body is None:
+                self._stats["misses"] += 1
+                return None
+            db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+            self._stats["hits"] += 1
+        return {"status": row[1], "headers": json.loads(row[2]), "body": body}
+
+    def put(self, key: str, status: int, headers: dict, body: bytes) -> None:
+        """Store a response body and evict least recently used entries beyond max_bytes."""
+        if len(body) > self.max_bytes:
+            return
+        digest = hashlib.sha256(body).hexdigest()
+        headers = {k: v for k, v in (headers or {}).items() if k.lower() not in _DROPPED_HEADERS}
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            path = self._blob_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(body)
+                os.replace(tmp, path)
+            previous = db.execute("SELECT blob FROM responses WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, blob, status, headers, size, stored, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, digest, status, json.dumps(headers), len(body), now, now),
+            )
+            if previous is not None and previous[0] != digest:
+                self._drop_blob_if_unused(db, previous[0])
+            self._stats["stores"] += 1
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, digest, size in db.execute(
+            "SELECT key, blob, size FROM responses ORDER BY accessed ASC"
+        ).fetchall():
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._drop_blob_if_unused(db, digest)
+            self._stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        """Hit/miss counters since start-up plus the current entry count and size."""
+        with self._lock:
+            db = self._db(create=False)
+            entries, size = (0, 0) if db is None else db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            stats = dict(self._stats, entries=entries, bytes=size)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._db(create=False)
+            if db is None:
+                return
+            for (digest,) in db.execute("SELECT DISTINCT blob FROM responses").fetchall():
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+            db.execute("DELETE FROM responses")
+            db.commit()
+
+    # ---------- Playwright route handlers ----------
+
+    def handle(self, route) -> None:
+        """Sync Playwright route handler: serve from the cache or fetch and store."""
+        request = route.request
+        if not self.cacheable(request.method, request.resource_type, request.url):
+            route.fallback()
+            return
+        key = self.key_for(request.method, request.url)
+        cached = self.get(key)
+        if cached is not None:
+            route.fulfill(status=cached["status"], headers=cached["headers"], body=cached["body"])
+            return
+        try:
+            # Redirects (e.g. to the consent page) go back to the browser uncached
+            response = route.fetch(max_redirects=0)
+            body = response.body()
+        except Exception as e:
+            logging.warning(f"Response cache fetch failed for {request.url}: {e}")
+            route.fallback()
+            return
+        if response.status == 200:
+            self._put_quietly(key, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    async def handle_async(self, route) -> None:
+        """Async Playwright route handler: serve from the cache or fetch and store."""
+        request = route.request
+        if not self.cacheable(request.method, request.resource_type, request.url):
+            await route.fallback()
+            return
+        key = self.key_for(request.method, request.url)
+        cached = self.get(key)
+        if cached is not None:
+            await route.fulfill(status=cached["status"], headers=cached["headers"], body=cached["body"])
+            return
+        try:
+            response = await route.fetch(max_redirects=0)
+            body = await response.body()
+        except Exception as e:
+            logging.warning(f"Response cache fetch failed for {request.url}: {e}")
+            await route.fallback()
+            return
+        if response.status == 200:
+            self._put_quietly(key, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    def _put_quietly(self, key, status, headers, body) -> None:
+        # A full disk or a locked index must not break the page load
+        try:
+            self.put(key, status, headers, body)
+        except Exception as e:
+            logging.warning(f"Response cache write failed: {e}")
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_response_cache() -> ResponseCache:
+    """The process-wide ResponseCache used by browser contexts (created on first use)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
+
+
+def install_response_cache(context, cache: Optional[ResponseCache] = None) -> ResponseCache:
+    """Serve cacheable requests of a sync browser context from `cache` (default: the shared one).
+
+    Install it after resource blocking: non-cacheable requests fall back to the
+    previously registered handlers.
+    """
+    cache = cache or shared_response_cache()
+    context.route("**/*", cache.handle)
+    return cache
+
+
+async def install_response_cache_async(context, cache: Optional[ResponseCache] = None) -> ResponseCache:
+    """Async counterpart of install_response_cache."""
+    cache = cache or shared_response_cache()
+    await context.route("**/*", cache.handle_async)
+    return cache
@@ -0,0 +1,72 @@
+"""Persisted browser storage state (cookies and consent) reused across runs.
+
+One state file is kept per locale and proxy, so a consent cookie accepted
+through one exit IP/region is only replayed through the same one.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from config import DEFAULT_LOCALE, SESSION_STATE_DIR, SESSION_STATE_MAX_AGE_SEC
+
+# Cookies Google sets once the consent dialog has been answered
+CONSENT_COOKIES = ("SOCS", "CONSENT")
+
+
+def storage_state_path(locale: str = DEFAULT_LOCALE, proxy: Optional[str] = None) -> str:
+    # The proxy URL may hold credentials: only a digest of it goes into the file name
+    proxy_key = hashlib.sha256((proxy or "direct").encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SESSION_STATE_DIR, f"state-{locale}-{proxy_key}.json")
+
+
+def load_storage_state(locale: str = DEFAULT_LOCALE, proxy: Optional[str] = None) -> Optional[str]:
+    """Path of the saved state for this locale and proxy, or None if missing or stale."""
+    path = storage_state_path(locale, proxy)
+    try:
+        if time.time() - os.path.getmtime(path) > SESSION_STATE_MAX_AGE_SEC:
+            return None
+    except OSError:
+        return None
+    return path
+
+
+def _write_state(state: dict, locale: str, proxy: Optional[str]) -> None:
+    path = storage_state_path(locale, proxy)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def save_storage_state(context, locale: str = DEFAULT_LOCALE, proxy: Optional[str] = None) -> None:
+    """Write the cookies and local storage of a sync browser context for the next run."""
+    try:
+        _write_state(context.storage_state(), locale, proxy)
+    except Exception as e:
+        logging.warning(f"Could not save browser storage state: {e}")
+
+
+async def save_storage_state_async(context, locale: str = DEFAULT_LOCALE, proxy: Optional[str] = None) -> None:
+    """Async counterpart of save_storage_state."""
+    try:
+        _write_state(await context.storage_state(), locale, proxy)
+    except Exception as e:
+        logging.warning(f"Could not save browser storage state: {e}")
+
+
+def has_consent_cookie(cookies) -> bool:
+    """True if the consent dialog was already answered in a context with these cookies."""
+    try:
+        return any(c.get("name") in CONSENT_COOKIES and "google." in c.get("domain", "") for c in cookies)
+    except Exception:
+        return False
@@ -0,0 +1,32 @@
+"""Lazily opened SQLite databases shared by the on-disk caches and stores."""
+
+import os
+import sqlite3
+from typing import Optional
+
+
+class LazySQLite:
+    """A SQLite connection opened on first use, with `schema` applied.
+
+    Call it to get the connection. With create=False it returns None while
+    the file does not exist, so lookups never create the database and the
+    file appears on the first write. The connection may be used from any
+    thread; callers serialize access with their own lock.
+    """
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.schema = schema
+        self._conn = None
+
+    def __call__(self, create: bool = True) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            if not create and not os.path.exists(self.path):
+                return None
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(self.schema)
+            self._conn.commit()
+        return self._conn
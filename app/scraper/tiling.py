@@ -0,0 +1,226 @@
+"""Grid-tiling search: cover a bounding box with map viewports and search each one.
+
+A single Google Maps search lists about TILE_CELL_RESULTS places. To collect
+more, the area is split into cells the size of one browser viewport at the
+chosen zoom, the query is run from each cell's @lat,lng,zoom URL, and the
+cells' places are merged with global deduplication. A cell whose feed lists
+TILE_CAP_THRESHOLD listings or more was capped (Maps shows its end-of-list
+marker at the cap too), so it is split into four cells one zoom level deeper
+and searched again.
+"""
+
+import logging
+import math
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from config import (
+    DEFAULT_HEADLESS, DEFAULT_PROXY, DEFAULT_VIEWPORT, DETAIL_CONCURRENCY, DEFAULT_SCRAPE_MODE,
+    BLOCK_RESOURCES, RESPONSE_CACHE, TILE_DEFAULT_ZOOM, TILE_CELL_RESULTS, TILE_CAP_THRESHOLD, TILE_MAX_DEPTH,
+    TILE_CONCURRENCY, TILE_MAX_CELLS,
+)
+from scraper.core import Place, ScrapeStats, iter_places, setup_logging, _resolve_place_cache
+from scraper.dedup import DedupIndex
+from scraper.place_ids import MAPS_BASE_URL
+
+# (south, west, north, east) in degrees
+BoundingBox = Tuple[float, float, float, float]
+
+
+@dataclass(frozen=True)
+class Cell:
+    """One viewport of the grid: its bounds, the zoom it is searched at and its subdivision depth."""
+    south: float
+    west: float
+    north: float
+    east: float
+    zoom: float
+    depth: int = 0
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    def url(self) -> str:
+        """Maps start URL centred on the cell, in the format of config.MAPS_START_URL."""
+        lat, lng = self.center
+        return f"{MAPS_BASE_URL}/maps/@{lat:.7f},{lng:.7f},{self.zoom:g}z?"
+
+    def subdivide(self) -> List["Cell"]:
+        """The four quarters of the cell, searched one zoom level deeper."""
+        lat, lng = self.center
+        zoom, depth = self.zoom + 1, self.depth + 1
+        return [
+            Cell(self.south, self.west, lat, lng, zoom, depth),
+            Cell(self.south, lng, lat, self.east, zoom, depth),
+            Cell(lat, self.west, self.north, lng, zoom, depth),
+            Cell(lat, lng, self.north, self.east, zoom, depth),
+        ]
+
+
+def parse_bbox(value: Union[str, Sequence[float]]) -> BoundingBox:
+    """Read "south,west,north,east" (or a 4-item sequence) into a validated BoundingBox."""
+    parts = value.split(",") if isinstance(value, str) else list(value)
+    try:
+        south, west, north, east = (float(p) for p in parts)
+    except (TypeError, ValueError):
+        raise ValueError(f"Bounding box must be south,west,north,east in degrees, got {value!r}")
+    if not (-90 <= south < north <= 90):
+        raise ValueError(f"Bounding box needs -90 <= south < north <= 90, got {south}, {north}")
+    if not (-180 <= west < east <= 180):
+        raise ValueError(f"Bounding box needs -180 <= west < east <= 180, got {west}, {east}")
+    return south, west, north, east
+
+
+def viewport_span(zoom: float, lat: float, viewport: dict = DEFAULT_VIEWPORT) -> Tuple[float, float]:
+    """Degrees of latitude and longitude shown by a browser viewport at `zoom` around `lat`."""
+    # Web Mercator: 256px tiles, the world is 256 * 2^zoom pixels wide
+    degrees_per_px = 360 / (256 * 2 ** zoom)
+    lng_span = viewport["width"] * degrees_per_px
+    lat_span = viewport["height"] * degrees_per_px * math.cos(math.radians(lat))
+    return lat_span, lng_span
+
+
+def grid_cells(bbox: BoundingBox, zoom: float = TILE_DEFAULT_ZOOM, max_cells: int = TILE_MAX_CELLS) -> List[Cell]:
+    """Split `bbox` into equal cells no larger than one viewport at `zoom`, row by row from the south-west.
+
+    Raises ValueError if that takes more than `max_cells` cells.
+    """
+    south, west, north, east = bbox
+    lat_span, lng_span = viewport_span(zoom, (south + north) / 2)
+    rows = max(1, math.ceil((north - south) / lat_span))
+    cols = max(1, math.ceil((east - west) / lng_span))
+    if rows * cols > max_cells:
+        raise ValueError(f"Zoom {zoom:g} needs {rows * cols} cells for this area (limit {max_cells}); "
+                         f"use a lower zoom or a smaller bounding box")
+    cell_lat, cell_lng = (north - south) / rows, (east - west) / cols
+    return [
+        Cell(south + r * cell_lat, west + c * cell_lng, south + (r + 1) * cell_lat, west + (c + 1) * cell_lng, zoom)
+        for r in range(rows) for c in range(cols)
+    ]
+
+
+def iter_places_tiled(
+    search_for: str,
+    bbox: Union[str, Sequence[float]],
+    zoom: float = TILE_DEFAULT_ZOOM,
+    total: Optional[int] = None,
+    headless: bool = DEFAULT_HEADLESS,
+    proxy: Optional[str] = DEFAULT_PROXY,
+    concurrency: int = DETAIL_CONCURRENCY,
+    pool=None,
+    mode: str = DEFAULT_SCRAPE_MODE,
+    block_resources: bool = BLOCK_RESOURCES,
+    response_cache: bool = RESPONSE_CACHE,
+    place_cache=None,
+    max_age: Optional[float] = None,
+    stats: Optional[ScrapeStats] = None,
+    cell_concurrency: int = TILE_CONCURRENCY,
+    max_depth: int = TILE_MAX_DEPTH,
+    executor: Optional[Executor] = None,
+    dedup: Optional[DedupIndex] = None,
+) -> Iterator[Place]:
+    """Search every grid cell of `bbox` and yield unique places as they arrive (up to `total` if given).
+
+    Cells run on `cell_concurrency` threads, each through iter_places with the
+    cell's viewport URL as start page; the other arguments are passed on to it.
+    A capped cell is subdivided up to `max_depth` times. All cells share one
+    DedupIndex (`dedup`, or a new one), so a place seen by one cell is not
+    opened again by its neighbours.
+
+    Pass `executor` to run the cells on an existing thread pool (at most
+    `cell_concurrency` at a time) and a BrowserPool as `pool` to reuse warm
+    browsers; each cell's generator stays on the worker thread that runs it.
+    """
+    setup_logging()
+    cells = deque(grid_cells(parse_bbox(bbox), zoom))
+    # Resolve once so every cell shares the same cache (False keeps iter_places from resolving it again)
+    place_cache = _resolve_place_cache(place_cache)
+    if place_cache is None:
+        place_cache = False
+    stats = stats if stats is not None else ScrapeStats()
+    dedup = dedup if dedup is not None else DedupIndex()
+    logging.info(f"Tiling search for {search_for!r}: {len(cells)} cells at zoom {zoom:g}")
+
+    events: "queue.Queue" = queue.Queue()
+    stop = threading.Event()
+
+    def run_cell(cell: Cell) -> None:
+        cell_stats = ScrapeStats()
+        error = None
+        if stop.is_set():
+            events.put(("done", cell, cell_stats, error))
+            return
+        places = iter_places(search_for, TILE_CELL_RESULTS, headless=headless, proxy=proxy,
+                             concurrency=concurrency, pool=pool, mode=mode, block_resources=block_resources,
+                             response_cache=response_cache, place_cache=place_cache, max_age=max_age,
+                             stats=cell_stats, start_url=cell.url(), dedup=dedup)
+        try:
+            for place in places:
+                if stop.is_set():
+                    break
+                events.put(("place", place, place.place_id in cell_stats.cached_place_ids))
+        except Exception as e:
+            error = e
+        finally:
+            places.close()
+            events.put(("done", cell, cell_stats, error))
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max(1, cell_concurrency), thread_name_prefix="tile")
+    count = 0
+    running = 0
+    try:
+        while cells or running:
+            while cells and running < max(1, cell_concurrency):
+                executor.submit(run_cell, cells.popleft())
+                running += 1
+            event = events.get()
+            if event[0] == "place":
+                _, place, cached = event
+                count += 1
+                if cached:
+                    # Known before the cell's stats are merged, so callers can flag the place at once
+                    stats.cached_place_ids.add(place.place_id)
+                yield place
+                if total and count >= total:
+                    logging.info(f"Reached target of {total} results")
+                    return
+                continue
+
+            _, cell, cell_stats, error = event
+            running -= 1
+            stats.merge(cell_stats)
+            if error is not None:
+                logging.warning(f"Cell {cell.center} failed: {error}")
+                stats.count("cell_failed")
+            elif cell_stats.feed_listings >= TILE_CAP_THRESHOLD:
+                if cell.depth < max_depth:
+                    logging.info(f"Cell {cell.center} capped at {cell_stats.feed_listings} listings, subdividing")
+                    stats.count("cell_subdivided")
+                    cells.extend(cell.subdivide())
+                else:
+                    logging.warning(f"Cell {cell.center} still capped at zoom {cell.zoom:g} (max depth reached)")
+                    stats.count("cell_capped")
+    finally:
+        stop.set()
+        # Let running cells close their browsers on their own threads
+        while running:
+            event = events.get()
+            if event[0] == "done":
+                running -= 1
+                stats.merge(event[2])
+        if own_executor:
+            executor.shutdown(wait=True)
+        logging.info(f"Tiling search finished: {count} unique places")
+
+
+def scrape_places_tiled(search_for: str, bbox: Union[str, Sequence[float]], zoom: float = TILE_DEFAULT_ZOOM,
+                        total: Optional[int] = None, **kwargs) -> List[Place]:
+    """Collect the places of iter_places_tiled into a list."""
+    return list(iter_places_tiled(search_for, bbox, zoom=zoom, total=total, **kwargs))
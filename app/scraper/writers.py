@@ -0,0 +1,163 @@
+"""Streaming writers that append Places to CSV, JSON Lines or Parquet files.
+
+Every writer uses the full Place schema, so files written by different runs
+(and --append runs) always have the same columns.
+"""
+
+import csv
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from dataclasses import asdict, fields
+from typing import Optional
+
+from config import WRITER_FLUSH_EVERY
+from scraper.core import Place
+
+PLACE_FIELDS = [f.name for f in fields(Place)]
+
+FORMATS_BY_EXTENSION = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+
+class PlaceWriter(ABC):
+    """Write Places one at a time, flushing every `flush_every` rows."""
+
+    def __init__(self, path: str, append: bool = False, flush_every: int = WRITER_FLUSH_EVERY):
+        self.path = path
+        self.append = append
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self._pending = 0
+
+    def write(self, place: Place) -> None:
+        self._write_row(asdict(place))
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+        logging.info(f"Saved {self.count} places to {self.path} (append={self.append})")
+
+    @abstractmethod
+    def _write_row(self, row: dict) -> None:
+        """Write one Place, as a dict of PLACE_FIELDS."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class CsvPlaceWriter(PlaceWriter):
+    def __init__(self, path: str, append: bool = False, flush_every: int = WRITER_FLUSH_EVERY):
+        super().__init__(path, append, flush_every)
+        has_rows = append and os.path.isfile(path) and os.path.getsize(path) > 0
+        if has_rows:
+            with open(path, newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f), [])
+            if header != PLACE_FIELDS:
+                raise ValueError(
+                    f"Cannot append to {path}: its columns {header} differ from {PLACE_FIELDS}"
+                )
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=PLACE_FIELDS)
+        if not has_rows:
+            self._writer.writeheader()
+
+    def _write_row(self, row: dict) -> None:
+        self._writer.writerow(row)
+
+    def flush(self) -> None:
+        self._file.flush()
+        super().flush()
+
+    def close(self) -> None:
+        super().close()
+        self._file.close()
+
+
+class JsonlPlaceWriter(PlaceWriter):
+    def __init__(self, path: str, append: bool = False, flush_every: int = WRITER_FLUSH_EVERY):
+        super().__init__(path, append, flush_every)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def _write_row(self, row: dict) -> None:
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+        super().flush()
+
+    def close(self) -> None:
+        super().close()
+        self._file.close()
+
+
+class ParquetPlaceWriter(PlaceWriter):
+    """Writes one Parquet row group per flush. Requires pyarrow."""
+
+    def __init__(self, path: str, append: bool = False, flush_every: int = WRITER_FLUSH_EVERY):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+        if append and os.path.isfile(path):
+            raise ValueError("Parquet files cannot be appended to; write a new file instead")
+        super().__init__(path, append, flush_every)
+        self._pa = pa
+        self._schema = pa.schema([
+            (name, pa.int64() if name == "reviews_count"
+             else pa.float64() if name == "reviews_average"
+             else pa.string())
+            for name in PLACE_FIELDS
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._rows = []
+
+    def _write_row(self, row: dict) -> None:
+        self._rows.append(row)
+
+    def flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+        super().flush()
+
+    def close(self) -> None:
+        super().close()
+        self._writer.close()
+
+
+WRITERS = {
+    "csv": CsvPlaceWriter,
+    "jsonl": JsonlPlaceWriter,
+    "parquet": ParquetPlaceWriter,
+}
+
+
+def open_place_writer(
+    path: str,
+    fmt: Optional[str] = None,
+    append: bool = False,
+    flush_every: int = WRITER_FLUSH_EVERY,
+) -> PlaceWriter:
+    """Open a writer for `path`. The format defaults to the file extension, then CSV."""
+    if fmt is None:
+        fmt = FORMATS_BY_EXTENSION.get(os.path.splitext(path)[1].lower(), "csv")
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown output format: {fmt} (expected one of {', '.join(WRITERS)})")
+    return WRITERS[fmt](path, append=append, flush_every=flush_every)
@@ -12,6 +12,22 @@ from scraper.core import Place
 from api.server import app, active_searches
 
 
+@pytest.fixture(autouse=True)
+def session_state_dir(tmp_path, monkeypatch):
+    """Keep persisted browser storage state out of the real data directory."""
+    directory = tmp_path / "sessions"
+    monkeypatch.setattr("scraper.session.SESSION_STATE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_db(tmp_path, monkeypatch):
+    """Keep the API server's job checkpoints out of the real data directory."""
+    path = tmp_path / "checkpoints.sqlite3"
+    monkeypatch.setattr("api.server.CHECKPOINT_DB_PATH", str(path))
+    return path
+
+
 @pytest.fixture
 def mock_page():
     """Create a mock Playwright Page object."""
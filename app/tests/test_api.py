@@ -5,10 +5,15 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import json
+import threading
 import time
-from unittest.mock import patch, MagicMock
-from api.server import app, active_searches, _place_to_result_dict
-from scraper.core import Place
+from unittest.mock import patch
+from api.server import (
+    app, active_searches, _job_checkpoint, _place_to_result_dict, _run_scraper_multi_city, _run_scraper_places,
+    _run_search_job,
+)
+from scraper.core import Place, ScrapeStats
+from api.jobs import QueueFullError
 from datetime import datetime
 
 
@@ -35,10 +40,10 @@ def test_health_check(test_client):
 
 # ---------- POST /api/search ----------
 
-@patch("api.server.threading.Thread")
-def test_search_valid_request(mock_thread, test_client):
-    mock_thread_instance = MagicMock()
-    mock_thread.return_value = mock_thread_instance
+@patch("api.server.job_queue")
+def test_search_valid_request(mock_queue, test_client):
+    mock_queue.submit.return_value = 1
+    mock_queue.estimate_wait.return_value = 0
 
     resp = test_client.post(
         "/api/search",
@@ -49,7 +54,39 @@ def test_search_valid_request(mock_thread, test_client):
     data = resp.get_json()
     assert "search_id" in data
     assert data["status"] == "started"
-    mock_thread_instance.start.assert_called_once()
+    assert data["queue_position"] == 1
+    mock_queue.submit.assert_called_once()
+    assert active_searches[data["search_id"]]["status"] == "queued"
+
+
+@patch("api.server.job_queue")
+def test_search_passes_priority(mock_queue, test_client):
+    mock_queue.submit.return_value = 1
+    mock_queue.estimate_wait.return_value = 0
+
+    test_client.post(
+        "/api/search",
+        data=json.dumps({"query": "bars", "cities": "Rome", "priority": 5}),
+        content_type="application/json",
+    )
+    assert mock_queue.submit.call_args.kwargs["priority"] == 5
+
+
+@patch("api.server.job_queue")
+def test_search_rejected_when_queue_full(mock_queue, test_client):
+    mock_queue.submit.side_effect = QueueFullError(20, 1200.0)
+
+    resp = test_client.post(
+        "/api/search",
+        data=json.dumps({"query": "restaurants", "cities": "Milan"}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 429
+    data = resp.get_json()
+    assert data["queue_length"] == 20
+    assert data["estimated_wait_sec"] == 1200.0
+    assert resp.headers["Retry-After"] == "1200"
+    assert len(active_searches) == 0
 
 
 def test_search_missing_query(test_client):
@@ -119,6 +156,23 @@ def test_status_known_id(test_client):
     assert data["results_count"] == 1
 
 
+@patch("api.server.job_queue")
+def test_status_queued_reports_position(mock_queue, test_client):
+    mock_queue.position.return_value = 3
+    mock_queue.estimate_wait.return_value = 600.0
+    active_searches["queued_1"] = {
+        "status": "queued",
+        "query": "test",
+        "results": [],
+        "start_time": datetime.now(),
+    }
+    resp = test_client.get("/api/search/queued_1/status")
+    data = resp.get_json()
+    assert data["status"] == "queued"
+    assert data["queue_position"] == 3
+    assert data["estimated_wait_sec"] == 600.0
+
+
 # ---------- GET /api/search/<id>/results ----------
 
 def test_results_unknown_id(test_client):
@@ -177,3 +231,434 @@ def test_place_to_result_dict_no_reviews():
     place = Place(name="Empty")
     result = _place_to_result_dict(place, "Rome")
     assert result["reviews"] == "0 reviews"
+
+
+# ---------- _run_scraper_multi_city ----------
+
+def _start_record(cities):
+    return {
+        "status": "running",
+        "query": "shops",
+        "results": [],
+        "start_time": datetime.now(),
+        "cities": cities,
+    }
+
+
+def _fake_iter_places(fail_city=None, slow_city=None, cached_city=None):
+    """Stand-in for iter_places that yields `total` places per city, skipping those already in `dedup`."""
+    def fake_iter_places(query, total, pool=None, stats=None, dedup=None):
+        city = query.split()[-1]
+        if city == fail_city:
+            raise RuntimeError("browser crashed")
+        yielded = 0
+        for i in range(100):
+            if yielded >= total:
+                return
+            if city == slow_city:
+                time.sleep(0.02)
+            place = Place(name=f"{city} {i}", address=city, place_id=f"{city}-{i}")
+            if dedup is not None and not dedup.add(place):
+                continue
+            yielded += 1
+            if city == cached_city and stats is not None:
+                stats.cached_place_ids.add(place.place_id)
+            elif stats is not None:
+                stats.scraped += 1
+                stats.add_time("extract", 0.25)
+            yield place
+    return fake_iter_places
+
+
+@patch("api.server.iter_places")
+def test_multi_city_publishes_every_place(mock_iter):
+    mock_iter.side_effect = _fake_iter_places(slow_city="Rome")
+    active_searches["multi_1"] = _start_record(["Rome", "Milan"])
+
+    _run_scraper_multi_city("multi_1", "shops", "", ["Rome", "Milan"], 2, 2, 4)
+
+    info = active_searches["multi_1"]
+    assert info["status"] == "completed"
+    assert sorted(r["name"] for r in info["results"]) == ["Milan 0", "Milan 1", "Rome 0", "Rome 1"]
+    # Milan finishes first, so its places arrive first
+    assert info["results"][-1]["city"] == "Rome"
+    assert info["cities_progress"]["Rome"] == {"status": "completed", "results": 2}
+    assert info["cities_progress"]["Milan"] == {"status": "completed", "results": 2}
+
+
+@patch("api.server.iter_places")
+def test_multi_city_reports_failed_city(mock_iter):
+    mock_iter.side_effect = _fake_iter_places(fail_city="Rome")
+    active_searches["multi_2"] = _start_record(["Rome", "Milan"])
+
+    _run_scraper_multi_city("multi_2", "shops", "", ["Rome", "Milan"], 2, 2, 2)
+
+    info = active_searches["multi_2"]
+    assert info["status"] == "completed"
+    assert info["cities_progress"]["Rome"]["status"] == "error"
+    assert info["current_city"] == "2/2 done"
+
+
+@patch("api.server.iter_places")
+def test_multi_city_reports_cache_hits_separately(mock_iter, test_client):
+    mock_iter.side_effect = _fake_iter_places(cached_city="Rome")
+    active_searches["multi_5"] = _start_record(["Rome", "Milan"])
+
+    _run_scraper_multi_city("multi_5", "shops", "", ["Rome", "Milan"], 2, 2, 4)
+
+    info = active_searches["multi_5"]
+    assert {r["name"]: r["cached"] for r in info["results"]} == {
+        "Rome 0": True, "Rome 1": True, "Milan 0": False, "Milan 1": False,
+    }
+    status = test_client.get("/api/search/multi_5/status").get_json()
+    assert status["cache_hits"] == 2
+    assert status["fresh_results"] == 2
+
+
+@patch("api.server.iter_places")
+def test_multi_city_status_includes_job_summary(mock_iter, test_client):
+    mock_iter.side_effect = _fake_iter_places(cached_city="Rome")
+    active_searches["multi_6"] = _start_record(["Rome", "Milan", "Naples"])
+
+    _run_scraper_multi_city("multi_6", "shops", "", ["Rome", "Milan", "Naples"], 2, 2, 6)
+
+    summary = test_client.get("/api/search/multi_6/status").get_json()["summary"]
+    assert summary["scraped"] == 4
+    assert summary["phases"]["extract"] == {"count": 4, "seconds": 1.0}
+
+
+@patch("api.server.iter_places")
+def test_multi_city_publishes_place_found_in_two_cities_once(mock_iter):
+    def fake_iter_places(query, total, pool=None, stats=None, dedup=None):
+        for place in (Place(name="Chain HQ", address="Border Rd"), Place(name=query.split()[-1])):
+            if dedup.add(place):
+                yield place
+    mock_iter.side_effect = fake_iter_places
+    active_searches["multi_6"] = _start_record(["Rome", "Milan"])
+
+    _run_scraper_multi_city("multi_6", "shops", "", ["Rome", "Milan"], 2, 2, 3)
+
+    names = sorted(r["name"] for r in active_searches["multi_6"]["results"])
+    assert names == ["Chain HQ", "Milan", "Rome"]
+    # Every iter_places call of the job got the same index
+    assert len({id(c.kwargs["dedup"]) for c in mock_iter.call_args_list}) == 1
+
+
+@patch("api.server.scoped_dedup_index")
+@patch("api.server._run_scraper_multi_city")
+def test_search_job_uses_dedup_scope_index(mock_run, mock_scoped):
+    params = {"query": "shops", "filters": "", "cities": ["Rome"], "max_results": 2, "dedup_scope": "shops-it"}
+
+    _run_search_job("multi_7", params)
+
+    mock_scoped.assert_called_once_with("shops-it")
+    assert mock_run.call_args.kwargs["dedup"] is mock_scoped.return_value
+
+
+@patch("api.server.iter_places")
+def test_multi_city_does_not_rescrape_short_cities(mock_iter):
+    # Rome's feed ends after 2 of the 5 places asked for
+    mock_iter.side_effect = lambda query, total, **kwargs: iter([Place(name="Rome 0"), Place(name="Rome 1")])
+    active_searches["multi_4"] = _start_record(["Rome"])
+
+    _run_scraper_multi_city("multi_4", "shops", "", ["Rome"], 5, 5, 5)
+
+    info = active_searches["multi_4"]
+    assert [r["name"] for r in info["results"]] == ["Rome 0", "Rome 1"]
+    assert mock_iter.call_count == 1
+    assert mock_iter.call_args.args[1] == 5
+
+
+@patch("api.server.iter_places")
+def test_multi_city_resumes_from_checkpoint(mock_iter):
+    mock_iter.side_effect = _fake_iter_places()
+    checkpoint = _job_checkpoint("multi_8")
+    checkpoint.add_place(Place(name="Rome 0", address="Rome", place_id="Rome-0"), "Rome")
+    checkpoint.add_place(Place(name="Rome 1", address="Rome", place_id="Rome-1"), "Rome")
+    checkpoint.complete_city("Rome", 2)
+    checkpoint.add_place(Place(name="Milan 0", address="Milan", place_id="Milan-0"), "Milan", cached=True)
+    active_searches["multi_8"] = _start_record(["Rome", "Milan"])
+
+    _run_scraper_multi_city("multi_8", "shops", "", ["Rome", "Milan"], 2, 2, 4, checkpoint=checkpoint)
+
+    info = active_searches["multi_8"]
+    assert [r["name"] for r in info["results"]] == ["Rome 0", "Rome 1", "Milan 0", "Milan 1"]
+    assert info["results"][2]["cached"] is True
+    assert info["cities_progress"]["Rome"] == {"status": "completed", "results": 2}
+    assert info["cities_progress"]["Milan"] == {"status": "completed", "results": 2}
+    # Rome is not searched again and Milan only for the place it still misses
+    assert [(c.args[0], c.args[1]) for c in mock_iter.call_args_list] == [("shops Milan", 1)]
+    assert checkpoint.places() == []
+
+
+@patch("api.server.iter_places")
+def test_multi_city_keeps_checkpoint_of_failed_city(mock_iter):
+    mock_iter.side_effect = _fake_iter_places(fail_city="Rome")
+    checkpoint = _job_checkpoint("multi_9")
+    active_searches["multi_9"] = _start_record(["Rome", "Milan"])
+
+    _run_scraper_multi_city("multi_9", "shops", "", ["Rome", "Milan"], 2, 2, 4, checkpoint=checkpoint)
+
+    assert checkpoint.completed_cities() == {"Milan": 2}
+    assert [place.name for place, _, _ in checkpoint.places()] == ["Milan 0", "Milan 1"]
+
+
+@patch("api.server.iter_places")
+def test_search_job_checkpoints_its_params(mock_iter):
+    mock_iter.side_effect = _fake_iter_places(fail_city="Rome")
+    params = {"query": "shops", "filters": "", "cities": ["Rome"], "max_results": 2}
+
+    _run_search_job("multi_10", params)
+
+    assert _job_checkpoint("multi_10").params() == params
+
+
+# ---------- POST /api/search/<id>/resume ----------
+
+def test_resume_without_checkpoint(test_client):
+    resp = test_client.post("/api/search/nope/resume")
+    assert resp.status_code == 404
+
+
+def test_resume_rejects_active_search(test_client):
+    _job_checkpoint("resume_1").save_params({"query": "shops", "filters": "", "cities": ["Rome"], "max_results": 2})
+    active_searches["resume_1"] = _start_record(["Rome"])
+
+    resp = test_client.post("/api/search/resume_1/resume")
+    assert resp.status_code == 409
+
+
+@patch("api.server.job_queue")
+def test_resume_queues_saved_params(mock_queue, test_client):
+    mock_queue.submit.return_value = 1
+    mock_queue.estimate_wait.return_value = 0
+    params = {"query": "shops", "filters": "", "cities": ["Rome"], "max_results": 2}
+    _job_checkpoint("resume_2").save_params(params)
+    active_searches["resume_2"] = dict(_start_record(["Rome"]), status="error")
+
+    resp = test_client.post("/api/search/resume_2/resume", data=json.dumps({"priority": 3}),
+                            content_type="application/json")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["search_id"] == "resume_2"
+    mock_queue.submit.assert_called_once_with("resume_2", params, priority=3)
+    assert active_searches["resume_2"]["status"] == "queued"
+
+
+@patch("api.server.job_queue")
+def test_resume_rejected_when_queue_full_keeps_the_record(mock_queue, test_client):
+    mock_queue.submit.side_effect = QueueFullError(20, 1200.0)
+    _job_checkpoint("resume_3").save_params({"query": "shops", "filters": "", "cities": ["Rome"], "max_results": 2})
+    active_searches["resume_3"] = dict(_start_record(["Rome"]), status="error", error="boom")
+
+    resp = test_client.post("/api/search/resume_3/resume")
+
+    assert resp.status_code == 429
+    assert active_searches["resume_3"]["status"] == "error"
+    assert active_searches["resume_3"]["error"] == "boom"
+
+
+# ---------- POST /api/places ----------
+
+@patch("api.server.job_queue")
+def test_places_refresh_queues_normalized_urls(mock_queue, test_client):
+    mock_queue.submit.return_value = 1
+    mock_queue.estimate_wait.return_value = 0
+
+    resp = test_client.post(
+        "/api/places",
+        data=json.dumps({"places": ["/maps/place/A", "ChIJN1t_tDeuEmsRUsoyG83frY4"], "concurrency": 3}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    search_id = resp.get_json()["search_id"]
+    params = mock_queue.submit.call_args.args[1]
+    assert params["kind"] == "places"
+    assert params["places"][0] == "https://www.google.com/maps/place/A"
+    assert params["concurrency"] == 3
+    assert active_searches[search_id]["total_target"] == 2
+
+
+def test_places_refresh_rejects_bad_refs(test_client):
+    for body in ({"places": []}, {"places": ["pizza"]}, {"places": "/maps/place/A"}):
+        resp = test_client.post("/api/places", data=json.dumps(body), content_type="application/json")
+        assert resp.status_code == 400
+
+
+@patch("api.server.iter_places_by_url")
+def test_places_refresh_job_publishes_places(mock_iter, test_client):
+    mock_iter.return_value = iter([("https://www.google.com/maps/place/A", Place(name="A", address="1 Road")),
+                                   ("https://www.google.com/maps/place/A", Place(name="B"))])
+    params = {"kind": "places", "places": ["https://www.google.com/maps/place/A"], "concurrency": 2}
+
+    _run_search_job("places_1", params)
+
+    info = active_searches["places_1"]
+    assert info["status"] == "completed"
+    assert [r["name"] for r in info["results"]] == ["A", "B"]
+    assert mock_iter.call_args.kwargs["concurrency"] == 2
+
+
+@patch("api.server.iter_places_by_url")
+def test_places_refresh_resumes_by_input_url(mock_iter):
+    url_a = "https://www.google.com/maps/place/A/data=!19sChIJ" + "a" * 20
+    url_b = "https://www.google.com/maps/place/B/data=!19sChIJ" + "b" * 20
+
+    def fake_iter(urls, **kwargs):
+        # Landed on a page without a place ID, still saved under its input URL
+        yield url_b, Place(name="B")
+        raise RuntimeError("browser crashed")
+    mock_iter.side_effect = fake_iter
+    checkpoint = _job_checkpoint("places_2")
+    # Saved under the feature ID of the page it landed on, not the ID of its input URL
+    checkpoint.add_place(Place(name="A", place_id="0x1:0x2"), url=url_a)
+    active_searches["places_2"] = _start_record([])
+
+    _run_scraper_places("places_2", [url_a, url_b], 2, checkpoint=checkpoint)
+
+    assert mock_iter.call_args.args[0] == [url_b]
+    assert [r["name"] for r in active_searches["places_2"]["results"]] == ["A", "B"]
+    assert checkpoint.urls() == {url_a, url_b}
+
+
+
+# ---------- GET /metrics ----------
+
+def test_metrics_endpoint_renders_prometheus_text(test_client):
+    ScrapeStats().add_time("scroll", 0.3)
+    resp = test_client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    body = resp.get_data(as_text=True)
+    assert "# TYPE gms_phase_seconds histogram" in body
+    assert 'gms_phase_seconds_count{phase="scroll"}' in body
+    assert "gms_searches_queued " in body
+
+# ---------- POST /api/area ----------
+
+@patch("api.server.job_queue")
+def test_area_search_queues_validated_bbox(mock_queue, test_client):
+    mock_queue.submit.return_value = 1
+    mock_queue.estimate_wait.return_value = 0
+
+    resp = test_client.post(
+        "/api/area",
+        data=json.dumps({"query": "bakeries", "bbox": "43.58,-79.64,43.86,-79.12", "zoom": 13}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    search_id = resp.get_json()["search_id"]
+    params = mock_queue.submit.call_args[0][1]
+    assert params["kind"] == "area"
+    assert params["bbox"] == [43.58, -79.64, 43.86, -79.12]
+    assert active_searches[search_id]["status"] == "queued"
+
+
+def test_area_search_rejects_bad_bbox(test_client):
+    resp = test_client.post(
+        "/api/area", data=json.dumps({"query": "bakeries", "bbox": "43.86,-79.64,43.58,-79.12"}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 400
+
+
+@patch("api.server.iter_places_tiled")
+def test_area_job_publishes_places(mock_tiled, test_client):
+    def fake_tiled(query, bbox, zoom=None, total=None, stats=None, **kwargs):
+        stats.cached_place_ids.add("b")
+        yield Place(name="A", place_id="a")
+        yield Place(name="B", place_id="b")
+    mock_tiled.side_effect = fake_tiled
+    params = {"kind": "area", "query": "bakeries", "filters": "", "bbox": [43.6, -79.4, 43.7, -79.3],
+              "zoom": 14, "max_results": 0}
+
+    _run_search_job("area_1", params)
+
+    info = active_searches["area_1"]
+    assert info["status"] == "completed"
+    assert [(r["name"], r["cached"]) for r in info["results"]] == [("A", False), ("B", True)]
+    assert mock_tiled.call_args.kwargs["total"] is None
+
+def test_status_includes_per_city_progress(test_client):
+    active_searches["multi_3"] = _start_record(["Rome", "Milan"])
+    active_searches["multi_3"]["cities_progress"] = {
+        "Rome": {"status": "completed", "results": 5},
+        "Milan": {"status": "running", "results": 0},
+    }
+    active_searches["multi_3"]["current_city"] = "1/2 done - Milan"
+    resp = test_client.get("/api/search/multi_3/status")
+    data = resp.get_json()
+    assert data["current_city"] == "1/2 done - Milan"
+    assert data["cities_progress"]["Milan"]["status"] == "running"
+
+
+# ---------- GET /api/search/<id>/stream ----------
+
+def _parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_unknown_id(test_client):
+    resp = test_client.get("/api/search/nonexistent/stream")
+    assert resp.status_code == 404
+
+
+def test_stream_completed_search_sends_results_then_done(test_client):
+    active_searches["done_2"] = {
+        "status": "completed",
+        "query": "test",
+        "results": [{"name": "A"}, {"name": "B"}],
+        "start_time": datetime.now(),
+    }
+    resp = test_client.get("/api/search/done_2/stream")
+    assert resp.mimetype == "text/event-stream"
+    events = _parse_sse(resp.get_data(as_text=True))
+    assert [e for e, _ in events] == ["result", "result", "status", "done"]
+    assert events[1][1] == {"index": 2, "result": {"name": "B"}}
+    assert events[-1][1]["total_results"] == 2
+
+
+def test_stream_resumes_from_last_event_id(test_client):
+    active_searches["done_3"] = {
+        "status": "completed",
+        "query": "test",
+        "results": [{"name": "A"}, {"name": "B"}, {"name": "C"}],
+        "start_time": datetime.now(),
+    }
+    resp = test_client.get("/api/search/done_3/stream", headers={"Last-Event-ID": "2"})
+    results = [d["result"]["name"] for e, d in _parse_sse(resp.get_data(as_text=True)) if e == "result"]
+    assert results == ["C"]
+
+
+def test_stream_ndjson_follows_running_search(test_client):
+    from api.server import _append_search_results, _update_search
+
+    active_searches["live_1"] = {
+        "status": "running",
+        "query": "test",
+        "results": [],
+        "start_time": datetime.now(),
+    }
+
+    def producer():
+        time.sleep(0.05)
+        _append_search_results("live_1", [{"name": "First"}])
+        time.sleep(0.05)
+        _append_search_results("live_1", [{"name": "Second"}])
+        _update_search("live_1", status="completed")
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    resp = test_client.get("/api/search/live_1/stream?format=ndjson")
+    lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    thread.join()
+
+    assert resp.mimetype == "application/x-ndjson"
+    assert [l["result"]["name"] for l in lines if l["type"] == "result"] == ["First", "Second"]
+    assert lines[-1]["type"] == "done"
+    assert lines[-1]["status"] == "completed"
@@ -0,0 +1,140 @@
+"""Tests for the asyncio engine in scraper/async_core.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from scraper.core import Place
+from scraper import async_core
+from scraper.async_core import (
+    async_extract_place, async_iter_places, async_iter_places_from_urls, async_scrape_many,
+)
+
+
+class _FakePage:
+    """Async page whose goto takes `delays[url]` seconds; tracks open pages."""
+
+    open_pages = 0
+    max_open = 0
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.url = None
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+        await asyncio.sleep(self.delays.get(url, 0))
+
+    async def close(self):
+        _FakePage.open_pages -= 1
+
+
+class _FakeContext:
+    def __init__(self, delays):
+        self.delays = delays
+
+    async def new_page(self):
+        _FakePage.open_pages += 1
+        _FakePage.max_open = max(_FakePage.max_open, _FakePage.open_pages)
+        return _FakePage(self.delays)
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+def test_iter_places_from_urls_keeps_order_and_limits_pages():
+    _FakePage.open_pages = _FakePage.max_open = 0
+    delays = {"u0": 0.05, "u1": 0.0, "u2": 0.02, "u3": 0.0}
+
+    async def fake_extract(page):
+        return Place(name=page.url)
+
+    with patch.object(async_core, "_wait_for_place_details", AsyncMock(return_value=True)), \
+            patch.object(async_core, "async_extract_place", side_effect=fake_extract):
+        result = asyncio.run(_collect(async_iter_places_from_urls(_FakeContext(delays), list(delays), 2)))
+
+    assert [p.name for p in result] == ["u0", "u1", "u2", "u3"]
+    assert _FakePage.max_open == 2
+    assert _FakePage.open_pages == 0
+
+
+def test_iter_places_from_urls_skips_failures():
+    _FakePage.open_pages = _FakePage.max_open = 0
+
+    async def fake_extract(page):
+        if page.url == "bad":
+            raise RuntimeError("boom")
+        return Place(name=page.url)
+
+    with patch.object(async_core, "_wait_for_place_details", AsyncMock(return_value=True)), \
+            patch.object(async_core, "async_extract_place", side_effect=fake_extract):
+        result = asyncio.run(_collect(async_iter_places_from_urls(_FakeContext({}), ["bad", "good"], 2)))
+
+    assert [p.name for p in result] == ["good"]
+
+
+@patch("scraper.async_core.asyncio.sleep", new_callable=AsyncMock)
+def test_async_extract_place_retries_on_empty_name(mock_sleep):
+    page = MagicMock()
+    page.evaluate = AsyncMock(side_effect=[{"name": ""}, {"name": "Found"}])
+    place = asyncio.run(async_extract_place(page))
+    assert place.name == "Found"
+    assert page.evaluate.await_count == 2
+
+
+@patch("scraper.async_core.async_playwright")
+@patch("scraper.async_core.async_scrape_places")
+def test_async_scrape_many_shares_browser_and_isolates_failures(mock_scrape, mock_ap):
+    driver = MagicMock()
+    browser = MagicMock()
+    browser.close = AsyncMock()
+    driver.chromium.launch = AsyncMock(return_value=browser)
+    mock_ap.return_value.__aenter__ = AsyncMock(return_value=driver)
+    mock_ap.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    async def fake_scrape(query, total, concurrency=1, browser=None, **kwargs):
+        if query == "broken":
+            raise RuntimeError("page crashed")
+        return [Place(name=f"{query} {i}") for i in range(total)]
+
+    mock_scrape.side_effect = fake_scrape
+
+    result = asyncio.run(async_scrape_many(["pizza", "broken", "sushi"], 2, max_concurrent_queries=2,
+                                           proxy="http://proxy:8080"))
+    assert [p.name for p in result["pizza"]] == ["pizza 0", "pizza 1"]
+    assert result["broken"] == []
+    assert len(result["sushi"]) == 2
+    driver.chromium.launch.assert_awaited_once()
+    assert all(call.kwargs["browser"] is browser for call in mock_scrape.call_args_list)
+    # Each query's context keeps the proxy's own storage state
+    assert all(call.kwargs["proxy"] == "http://proxy:8080" for call in mock_scrape.call_args_list)
+    browser.close.assert_awaited_once()
+
+
+@patch("scraper.async_core.browser_context_options", return_value={})
+@patch("scraper.async_core.async_playwright")
+def test_async_iter_places_passes_proxy_to_its_own_browser_run(mock_ap, mock_options):
+    driver = MagicMock()
+    browser = MagicMock()
+    browser.close = AsyncMock()
+    browser.new_context = AsyncMock(side_effect=RuntimeError("stop here"))
+    driver.chromium.launch = AsyncMock(return_value=browser)
+    mock_ap.return_value.__aenter__ = AsyncMock(return_value=driver)
+    mock_ap.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    async def consume():
+        return [place async for place in async_iter_places("pizza", 1, proxy="http://proxy:8080")]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(consume())
+    mock_options.assert_called_once_with("http://proxy:8080")
+    browser.close.assert_awaited_once()
@@ -0,0 +1,79 @@
+"""Tests for the benchmark fixture server (the benchmark itself needs Chromium)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.fixtures import FEED_BATCH_SIZE, expected_place, fixture_places
+from benchmarks.server import FixtureServer
+from scraper.place_ids import parse_place_id
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(25, load_delay_ms=0) as running:
+        yield running
+
+
+def _get(url, cookie=None):
+    request = urllib.request.Request(url, headers={"Cookie": cookie} if cookie else {})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+def test_fixture_places_are_deterministic_and_distinct():
+    first, second = fixture_places(30), fixture_places(30)
+    assert first == second
+    assert len({p.place_id for p in first}) == 30
+    assert all(parse_place_id(p.path) == p.place_id for p in first)
+
+
+def test_start_page_shows_consent_until_accepted(server):
+    page = _get(server.start_url)
+    assert 'id="searchboxinput"' in page and 'role="feed"' in page
+    assert 'aria-label="Accept all"' in page
+    assert 'aria-label="Accept all"' not in _get(server.start_url, cookie="SOCS=bench")
+
+
+def test_feed_is_served_in_batches_with_end_marker(server):
+    first = _get(f"{server.base_url}/bench/feed?offset=0&limit={FEED_BATCH_SIZE}")
+    assert first.count('class="hfpxzc"') == FEED_BATCH_SIZE
+    assert "HlvSq" not in first
+    last = _get(f"{server.base_url}/bench/feed?offset=20&limit={FEED_BATCH_SIZE}")
+    assert last.count('class="hfpxzc"') == 5
+    assert "HlvSq" in last
+
+
+def test_place_panel_follows_config_xpaths(server):
+    place = server.places[3]
+    panel = _get(server.place_url(place) + "?panel=1")
+    assert '<div class="TIHn2 ">' in panel
+    assert f'<h1 class="DUwDvf lfPIob">{place.name}</h1>' in panel
+    assert 'data-item-id="address"' in panel and 'data-item-id="authority"' in panel
+    assert 'role="feed"' not in panel
+    assert place.name in _get(server.place_url(place))
+
+
+def test_unknown_place_is_404(server):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _get(f"{server.base_url}/maps/place/Nope/data=!19sChIJunknownPlace0000000")
+    assert excinfo.value.code == 404
+
+
+def test_expected_place_per_mode():
+    place = fixture_places(3)[2]
+    detail = expected_place(place)
+    assert detail.name == place.name
+    assert detail.address == place.address
+    assert detail.reviews_count == place.reviews_count
+    assert detail.place_id == place.place_id
+    assert detail.store_shopping == "Yes" and detail.store_delivery == "Yes"
+    listed = expected_place(place, mode="list")
+    assert listed.address == place.street
+    assert listed.place_type == place.place_type
+    assert listed.website == ""
@@ -0,0 +1,55 @@
+"""Tests for job checkpoints (scraper.checkpoint)."""
+
+from scraper.checkpoint import JobCheckpoint
+from scraper.core import Place
+
+
+def test_params_places_and_cities_round_trip(tmp_path):
+    db_path = str(tmp_path / "checkpoints.sqlite3")
+    checkpoint = JobCheckpoint("job-1", db_path=db_path)
+    checkpoint.save_params({"query": "shops", "cities": ["Rome", "Milan"]})
+    checkpoint.add_place(Place(name="A", address="1 Road", reviews_count=3), city="Rome")
+    checkpoint.add_place(Place(name="B", place_id="ChIJN1t_tDeuEmsRUsoyG83frY4"), city="Milan", cached=True,
+                         url="https://www.google.com/maps/place/B")
+    checkpoint.complete_city("Rome", 1)
+
+    # A new instance, as after a restart
+    again = JobCheckpoint("job-1", db_path=db_path)
+    assert again.params() == {"query": "shops", "cities": ["Rome", "Milan"]}
+    assert again.places() == [
+        (Place(name="A", address="1 Road", reviews_count=3), "Rome", False),
+        (Place(name="B", place_id="ChIJN1t_tDeuEmsRUsoyG83frY4"), "Milan", True),
+    ]
+    assert again.completed_cities() == {"Rome": 1}
+    assert again.urls() == {"https://www.google.com/maps/place/B"}
+
+
+def test_jobs_are_kept_apart(tmp_path):
+    db_path = str(tmp_path / "checkpoints.sqlite3")
+    JobCheckpoint("job-1", db_path=db_path).add_place(Place(name="A"))
+    other = JobCheckpoint("job-2", db_path=db_path)
+    assert other.places() == []
+    assert other.params() is None
+
+
+def test_clear_deletes_the_job_only(tmp_path):
+    db_path = str(tmp_path / "checkpoints.sqlite3")
+    first, second = JobCheckpoint("job-1", db_path=db_path), JobCheckpoint("job-2", db_path=db_path)
+    for checkpoint in (first, second):
+        checkpoint.save_params({})
+        checkpoint.add_place(Place(name="A"))
+        checkpoint.complete_city("Rome", 1)
+
+    first.clear()
+
+    assert (first.params(), first.places(), first.completed_cities()) == (None, [], {})
+    assert second.completed_cities() == {"Rome": 1}
+
+
+def test_reads_never_create_the_database(tmp_path):
+    db_path = tmp_path / "checkpoints.sqlite3"
+    checkpoint = JobCheckpoint("job-1", db_path=str(db_path))
+    assert checkpoint.params() is None
+    assert checkpoint.places() == []
+    checkpoint.clear()
+    assert not db_path.exists()
@@ -0,0 +1,104 @@
+"""Tests for the deduplication index (scraper.dedup)."""
+
+import threading
+
+from scraper.core import Place
+from scraper.dedup import DedupIndex, dedup_keys, normalize_text, scoped_dedup_index
+
+PLACE_ID = "ChIJN1t_tDeuEmsRUsoyG83frY4"
+HREF = "https://www.google.com/maps/place/Caf%C3%A9/data=!4m7!3m6!1s0x1:0x2!19sChIJN1t_tDeuEmsRUsoyG83frY4"
+
+
+def test_normalize_text_ignores_case_accents_and_punctuation():
+    assert normalize_text("  Café  de l'Époque, 12 ") == "cafe de l epoque 12"
+    assert normalize_text(None) == ""
+
+
+def test_dedup_keys_use_place_id_and_name_address():
+    place = Place(name="Café Roma", address="Via Roma, 1", place_id=PLACE_ID)
+    assert dedup_keys(place) == [f"id:{PLACE_ID}", "na:cafe roma|via roma 1"]
+    assert dedup_keys(href=HREF) == [f"id:{PLACE_ID}", "id:0x1:0x2"]
+    assert dedup_keys(place, href=HREF) == [f"id:{PLACE_ID}", "id:0x1:0x2", "na:cafe roma|via roma 1"]
+    assert dedup_keys(Place(name=" ")) == []
+
+
+def test_add_reports_new_places_only():
+    index = DedupIndex()
+    assert index.add(Place(name="Café Roma", address="Via Roma 1"))
+    assert not index.add(Place(name="CAFE ROMA", address="via roma, 1"))
+    assert index.add(Place(name="Café Roma", address="Via Milano 2"))
+    assert index.added == 2
+
+
+def test_listing_href_matches_place_collected_by_id():
+    index = DedupIndex()
+    assert not index.seen(href=HREF)
+    index.add(Place(name="Café", address="Via Roma 1", place_id=PLACE_ID))
+    assert index.seen(href=HREF)
+    assert not index.seen(href="https://www.google.com/maps/place/Other")
+
+
+def test_keys_of_a_known_place_are_aliased():
+    index = DedupIndex()
+    index.add(Place(name="Café", address="Via Roma 1"))
+    # Same place, now carrying its ID: a duplicate, and its ID is remembered
+    assert not index.add(Place(name="Cafe", address="Via Roma 1", place_id=PLACE_ID))
+    assert index.seen(href=HREF)
+
+
+def test_listing_matches_by_feature_id_when_place_id_is_missing():
+    index = DedupIndex()
+    index.add(Place(name="Café", place_id=PLACE_ID), href=HREF)
+    assert index.seen(href="https://www.google.com/maps/place/Caf%C3%A9/data=!4m2!3m1!1s0x1:0x2")
+
+
+def test_places_without_keys_are_never_duplicates():
+    index = DedupIndex()
+    assert index.add(Place())
+    assert index.add(Place())
+
+
+def test_scoped_index_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "dedup.sqlite3")
+    first = DedupIndex(scope="bakeries", db_path=db_path)
+    assert first.add(Place(name="A", address="1 Road", place_id="ChIJa1b2c3d4e5f6g7h8i9j0"))
+
+    again = DedupIndex(scope="bakeries", db_path=db_path)
+    assert again.seen(href="https://www.google.com/maps/place/A/data=!19sChIJa1b2c3d4e5f6g7h8i9j0")
+    assert not again.add(Place(name="a", address="1 road"))
+    other = DedupIndex(scope="cafes", db_path=db_path)
+    assert other.add(Place(name="A", address="1 Road"))
+
+
+def test_clear_forgets_persisted_keys(tmp_path):
+    db_path = str(tmp_path / "dedup.sqlite3")
+    index = DedupIndex(scope="bakeries", db_path=db_path)
+    index.add(Place(name="A", address="1 Road"))
+    index.clear()
+    assert DedupIndex(scope="bakeries", db_path=db_path).add(Place(name="A", address="1 Road"))
+
+
+def test_unscoped_index_never_touches_disk(tmp_path):
+    db_path = tmp_path / "dedup.sqlite3"
+    DedupIndex(db_path=str(db_path)).add(Place(name="A"))
+    assert not db_path.exists()
+
+
+def test_concurrent_adds_accept_each_place_once():
+    index = DedupIndex()
+    accepted = []
+
+    def worker():
+        accepted.extend(p for p in (Place(name=f"P{i}") for i in range(200)) if index.add(p))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(accepted) == 200
+
+
+def test_scoped_dedup_index_is_shared_per_scope():
+    assert scoped_dedup_index("shared-scope") is scoped_dedup_index("shared-scope")
+    assert scoped_dedup_index("shared-scope") is not scoped_dedup_index("other-scope")
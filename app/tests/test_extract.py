@@ -5,7 +5,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from unittest.mock import MagicMock, patch
-from scraper.core import extract_text, extract_place, _do_extract_place, Place
+from scraper.core import extract_text, extract_place, _do_extract_place, extract_fields, parse_place, parse_card, Place
 from config import XPATHS
 
 
@@ -156,6 +156,84 @@ def test_do_extract_place_opens_at_fallback():
     assert place.opens_at == "Opens 10AM"
 
 
+# ---------- extract_fields / parse_place (batched) ----------
+
+def test_extract_fields_batched_uses_single_evaluate():
+    raw = {key: "" for key in XPATHS}
+    raw["name"] = "Batched"
+    page = MagicMock()
+    page.evaluate.return_value = raw
+    result = extract_fields(page, batched=True)
+    assert result["name"] == "Batched"
+    page.evaluate.assert_called_once()
+    page.locator.assert_not_called()
+
+
+def test_extract_fields_falls_back_when_evaluate_fails():
+    page = _make_page_with_texts({XPATHS["name"]: "Fallback"})
+    page.evaluate.side_effect = Exception("evaluate failed")
+    result = extract_fields(page, batched=True)
+    assert result["name"] == "Fallback"
+    assert result["reviews_count_aria"] == []
+
+
+def test_extract_fields_per_field_mode_skips_evaluate():
+    page = _make_page_with_texts({XPATHS["address"]: "1 Road"})
+    result = extract_fields(page, batched=False)
+    assert result["address"] == "1 Road"
+    page.evaluate.assert_not_called()
+
+
+def test_parse_place_reviews_count_from_aria_labels():
+    raw = {
+        "name": "Shop",
+        "reviews_count_aria": ["4.5 stars", "2\u202f948 reviews"],
+    }
+    place = parse_place(raw)
+    assert place.reviews_count == 2948
+
+
+def test_parse_place_matches_per_field_extraction():
+    mapping = {
+        XPATHS["name"]: "Coffee Shop",
+        XPATHS["reviews_count"]: "(1,234)",
+        XPATHS["reviews_average"]: "4,5",
+        XPATHS["info1"]: "Services\u00b7Delivery",
+        XPATHS["opens_at2"]: "Closed\u22c5Opens 10\u202fAM",
+    }
+    per_field = _do_extract_place(_make_page_with_texts(mapping), batched=False)
+    raw = {key: mapping.get(xpath, "") for key, xpath in XPATHS.items()}
+    raw["reviews_count_aria"] = []
+    assert parse_place(raw) == per_field
+
+
+# ---------- parse_card (list mode) ----------
+
+def test_parse_card_fills_feed_fields():
+    raw = {
+        "name": "Anatolia Market",
+        "href": "https://www.google.com/maps/place/Anatolia",
+        "reviews_average": "4,6",
+        "reviews_count": "(1,234)",
+        "reviews_count_aria": ["4.6 stars 1,234 Reviews"],
+        "summary": "Grocery store · $$ · 1 Main St",
+    }
+    place = parse_card(raw)
+    assert place.name == "Anatolia Market"
+    assert place.reviews_average == 4.6
+    assert place.reviews_count == 1234
+    assert place.place_type == "Grocery store"
+    assert place.address == "1 Main St"
+    assert place.website == "" and place.phone_number == "" and place.introduction == ""
+
+
+def test_parse_card_without_summary_or_rating():
+    place = parse_card({"name": "New Shop", "reviews_count_aria": []})
+    assert place.name == "New Shop"
+    assert place.reviews_count is None and place.reviews_average is None
+    assert place.place_type == "" and place.address == ""
+
+
 # ---------- extract_place (with retry) ----------
 
 @patch("scraper.core.time.sleep")
@@ -0,0 +1,104 @@
+"""Tests for the persistent JobQueue in api/jobs.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import threading
+import pytest
+from api.jobs import JobQueue, QueueFullError
+
+
+class _Recorder:
+    """Job handler that records job ids and signals when `expected` jobs ran."""
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.calls = []
+        self.done = threading.Event()
+
+    def __call__(self, job_id, params):
+        self.calls.append((job_id, params))
+        if len(self.calls) >= self.expected:
+            self.done.set()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+
+def test_jobs_run_by_priority_then_submission_order(db_path):
+    recorder = _Recorder(expected=3)
+    queue = JobQueue(recorder, db_path=db_path, workers=1)
+    queue.submit("low", {"n": 1}, priority=0)
+    queue.submit("high", {"n": 2}, priority=5)
+    queue.submit("low2", {"n": 3}, priority=0)
+    queue.start()
+    assert recorder.done.wait(5)
+    queue.stop(timeout=5)
+    assert [job_id for job_id, _ in recorder.calls] == ["high", "low", "low2"]
+
+
+def test_submit_returns_queue_position(db_path):
+    queue = JobQueue(lambda *_: None, db_path=db_path, workers=1)
+    assert queue.submit("a", {}) == 1
+    assert queue.submit("b", {}) == 2
+    assert queue.submit("urgent", {}, priority=1) == 1
+    assert queue.position("b") == 3
+    assert queue.position("missing") is None
+
+
+def test_submit_rejects_when_full(db_path):
+    queue = JobQueue(lambda *_: None, db_path=db_path, workers=2, max_queued=2)
+    queue.submit("a", {})
+    queue.submit("b", {})
+    with pytest.raises(QueueFullError) as excinfo:
+        queue.submit("c", {})
+    assert excinfo.value.queued == 2
+    assert excinfo.value.estimated_wait_sec > 0
+
+
+def test_queued_jobs_survive_restart(db_path):
+    first = JobQueue(lambda *_: None, db_path=db_path, workers=1)
+    first.submit("persisted", {"query": "pizza"}, priority=2)
+
+    recorder = _Recorder(expected=1)
+    second = JobQueue(recorder, db_path=db_path, workers=1)
+    restored = second.start()
+    assert recorder.done.wait(5)
+    second.stop(timeout=5)
+    assert restored == [{"id": "persisted", "params": {"query": "pizza"}, "priority": 2}]
+    assert recorder.calls == [("persisted", {"query": "pizza"})]
+
+
+def test_finished_jobs_are_removed_from_storage(db_path):
+    recorder = _Recorder(expected=1)
+    queue = JobQueue(recorder, db_path=db_path, workers=1)
+    queue.start()
+    queue.submit("once", {})
+    assert recorder.done.wait(5)
+    queue.stop(timeout=5)
+
+    restarted = JobQueue(lambda *_: None, db_path=db_path, workers=1)
+    assert restarted.start() == []
+    restarted.stop(timeout=5)
+
+
+def test_failing_handler_does_not_stop_worker(db_path):
+    calls = []
+    done = threading.Event()
+
+    def handler(job_id, params):
+        calls.append(job_id)
+        if job_id == "bad":
+            raise RuntimeError("boom")
+        done.set()
+
+    queue = JobQueue(handler, db_path=db_path, workers=1)
+    queue.submit("bad", {})
+    queue.submit("good", {})
+    queue.start()
+    assert done.wait(5)
+    queue.stop(timeout=5)
+    assert calls == ["bad", "good"]
@@ -0,0 +1,59 @@
+"""Tests for the metrics registry and the ScrapeStats summaries that feed it."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.core import ScrapeStats
+from scraper.metrics import MetricsRegistry, SCRAPE_EVENTS, shared_metrics
+
+
+def test_counters_and_gauges_render_with_labels():
+    metrics = MetricsRegistry()
+    metrics.describe("jobs_total", "counter", "Jobs")
+    metrics.inc("jobs_total", status="done")
+    metrics.inc("jobs_total", 2, status="done")
+    metrics.set("depth", 4)
+    text = metrics.render()
+    assert "# HELP jobs_total Jobs\n# TYPE jobs_total counter\n" in text
+    assert 'jobs_total{status="done"} 3\n' in text
+    assert "# TYPE depth untyped\ndepth 4\n" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = MetricsRegistry(buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        metrics.observe("t", value, phase="scroll")
+    text = metrics.render()
+    assert 't_bucket{phase="scroll",le="0.1"} 1' in text
+    assert 't_bucket{phase="scroll",le="1"} 2' in text
+    assert 't_bucket{phase="scroll",le="+Inf"} 3' in text
+    assert 't_sum{phase="scroll"} 5.55' in text
+    assert 't_count{phase="scroll"} 3' in text
+
+
+def test_label_values_are_escaped():
+    metrics = MetricsRegistry()
+    metrics.inc("x", reason='say "hi"\\\n')
+    assert 'x{reason="say \\"hi\\"\\\\\\n"} 1' in metrics.render()
+
+
+def test_scrape_stats_forward_to_shared_registry():
+    before = shared_metrics().value(SCRAPE_EVENTS, event="extract_retry")
+    stats = ScrapeStats()
+    stats.count("extract_retry")
+    stats.add_time("extract", 0.2)
+    assert shared_metrics().value(SCRAPE_EVENTS, event="extract_retry") == before + 1
+    assert 'gms_phase_seconds_count{phase="extract"}' in shared_metrics().render()
+    assert stats.summary()["counters"] == {"extract_retry": 1}
+
+
+def test_combined_stats_sum_phases_and_counters():
+    a, b = ScrapeStats(scraped=2), ScrapeStats(scraped=1, cache_hits=3)
+    a.add_time("scroll", 1.0)
+    b.add_time("scroll", 0.5)
+    b.count("duplicate", 2)
+    summary = ScrapeStats.combined([a, b]).summary()
+    assert summary["scraped"] == 3 and summary["cache_hits"] == 3
+    assert summary["phases"]["scroll"] == {"count": 2, "seconds": 1.5}
+    assert summary["counters"] == {"duplicate": 2}
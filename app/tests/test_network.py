@@ -0,0 +1,57 @@
+"""Tests for request interception in scraper/network.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+from scraper.network import ResourceBlocker, install_resource_blocking, install_resource_blocking_async
+
+
+def _route(resource_type, url, route_cls=MagicMock):
+    route = route_cls()
+    route.request.resource_type = resource_type
+    route.request.url = url
+    return route
+
+
+def test_blocks_images_fonts_and_tiles():
+    blocker = ResourceBlocker()
+    assert blocker.should_block("image", "https://lh5.googleusercontent.com/p/photo.jpg")
+    assert blocker.should_block("font", "https://fonts.gstatic.com/s/roboto.woff2")
+    assert blocker.should_block("fetch", "https://www.google.com/maps/vt/pb=!1m5")
+    assert not blocker.should_block("document", "https://www.google.com/maps/place/Cafe")
+    assert not blocker.should_block("script", "https://www.google.com/maps/_/js/k=maps.m.en")
+
+
+def test_allow_list_wins_over_block_rules():
+    blocker = ResourceBlocker(resource_types=["image"], allowed_patterns=["/maps/_/ss"])
+    assert not blocker.should_block("image", "https://www.google.com/maps/_/ss/sprite.png")
+
+
+def test_handle_aborts_or_continues_and_counts():
+    blocker = ResourceBlocker()
+    image = _route("image", "https://example.com/a.png")
+    page = _route("document", "https://www.google.com/maps")
+    blocker.handle(image)
+    blocker.handle(page)
+    image.abort.assert_called_once()
+    page.continue_.assert_called_once()
+    assert blocker.blocked == 1
+
+
+def test_install_routes_every_request():
+    context = MagicMock()
+    blocker = install_resource_blocking(context)
+    context.route.assert_called_once_with("**/*", blocker.handle)
+
+
+def test_async_handler():
+    context = MagicMock()
+    context.route = AsyncMock()
+    blocker = asyncio.run(install_resource_blocking_async(context))
+    route = _route("media", "https://example.com/v.mp4", route_cls=AsyncMock)
+    asyncio.run(blocker.handle_async(route))
+    route.abort.assert_awaited_once()
+    context.route.assert_awaited_once_with("**/*", blocker.handle_async)
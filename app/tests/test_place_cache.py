@@ -0,0 +1,45 @@
+"""Tests for the SQLite place cache in scraper/place_cache.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from unittest.mock import patch
+from scraper.core import Place
+from scraper.place_cache import PlaceCache
+
+
+def _cache(tmp_path, **kwargs):
+    return PlaceCache(db_path=str(tmp_path / "places.sqlite3"), **kwargs)
+
+
+def test_put_then_get_returns_place(tmp_path):
+    cache = _cache(tmp_path)
+    place = Place(name="Cafe", address="1 St", reviews_count=3, place_id="ChIJcafe")
+    cache.put(place)
+    assert cache.get("ChIJcafe") == place
+    assert len(cache) == 1
+
+
+def test_get_respects_max_age(tmp_path):
+    cache = _cache(tmp_path, max_age=60)
+    with patch("scraper.place_cache.time.time", return_value=1000.0):
+        cache.put(Place(name="Cafe", place_id="ChIJcafe"))
+    with patch("scraper.place_cache.time.time", return_value=1100.0):
+        assert cache.get("ChIJcafe") is None
+        assert cache.get("ChIJcafe", max_age=200) is not None
+
+
+def test_places_without_id_are_not_cached(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put(Place(name="No id"))
+    assert cache.get("") is None
+    assert not (tmp_path / "places.sqlite3").exists()
+
+
+def test_put_replaces_older_record(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put(Place(name="Old name", place_id="ChIJcafe"))
+    cache.put(Place(name="New name", place_id="ChIJcafe"))
+    assert cache.get("ChIJcafe").name == "New name"
+    assert len(cache) == 1
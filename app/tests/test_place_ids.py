@@ -0,0 +1,70 @@
+"""Tests for place URL/ID normalization in scraper/place_ids.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from scraper.place_ids import listing_ids, parse_place_id, place_url, place_urls
+
+
+def test_place_url_keeps_absolute_maps_url():
+    url = "https://www.google.com/maps/place/Cafe/@43.6,-79.3,17z"
+    assert place_url(url) == url
+
+
+def test_place_url_prefixes_relative_url():
+    assert place_url(" /maps/place/Cafe ") == "https://www.google.com/maps/place/Cafe"
+
+
+def test_place_url_from_place_id():
+    assert place_url("ChIJN1t_tDeuEmsRUsoyG83frY4") == \
+        "https://www.google.com/maps/place/?q=place_id:ChIJN1t_tDeuEmsRUsoyG83frY4"
+
+
+def test_place_url_from_feature_id():
+    assert place_url("0x89d4cb90d7c63ba5:0x323555502ab4c477").endswith("!1s0x89d4cb90d7c63ba5:0x323555502ab4c477")
+
+
+@pytest.mark.parametrize("ref", ["", "pizza", "https://example.com/place/1"])
+def test_place_url_rejects_other_strings(ref):
+    with pytest.raises(ValueError):
+        place_url(ref)
+
+
+def test_place_urls_drops_blanks_and_repeats():
+    refs = ["/maps/place/A", "", "https://www.google.com/maps/place/A", "/maps/place/B"]
+    assert place_urls(refs) == [
+        "https://www.google.com/maps/place/A",
+        "https://www.google.com/maps/place/B",
+    ]
+
+
+FEED_HREF = ("https://www.google.com/maps/place/Cafe/data=!4m7!3m6!1s0x89D4cb90d7c63ba5:0x323555502ab4c477"
+             "!8m2!3d43.6!4d-79.3!16s%2Fg%2F11c!19sChIJpTvG15DL1IkRd8S0KlBVNTI?authuser=0")
+
+
+def test_parse_place_id_prefers_places_api_id():
+    assert parse_place_id(FEED_HREF) == "ChIJpTvG15DL1IkRd8S0KlBVNTI"
+
+
+def test_parse_place_id_falls_back_to_feature_id_and_cid():
+    assert parse_place_id(FEED_HREF.split("!19s")[0]) == "0x89d4cb90d7c63ba5:0x323555502ab4c477"
+    assert parse_place_id("https://maps.google.com/?cid=123456") == "cid:123456"
+
+
+def test_parse_place_id_round_trips_place_url():
+    assert parse_place_id(place_url("ChIJN1t_tDeuEmsRUsoyG83frY4")) == "ChIJN1t_tDeuEmsRUsoyG83frY4"
+
+
+def test_parse_place_id_without_id():
+    assert parse_place_id("https://www.google.com/maps/place/Cafe") is None
+    assert parse_place_id(None) is None
+
+
+def test_listing_ids_returns_every_id_in_the_url():
+    assert listing_ids(FEED_HREF) == ["ChIJpTvG15DL1IkRd8S0KlBVNTI", "0x89d4cb90d7c63ba5:0x323555502ab4c477"]
+    assert listing_ids("https://maps.google.com/?cid=123456") == ["cid:123456"]
+    assert listing_ids("0x89D4cb90d7c63ba5:0x323555502ab4c477") == ["0x89d4cb90d7c63ba5:0x323555502ab4c477"]
+    assert listing_ids("https://www.google.com/maps/place/Cafe") == []
+    assert listing_ids(None) == []
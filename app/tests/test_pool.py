@@ -0,0 +1,138 @@
+"""Tests for BrowserPool in scraper/pool.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from scraper.pool import BrowserPool
+from scraper.core import scrape_places, Place, _PROBE_SELECTORS_JS
+
+
+@pytest.fixture
+def mock_driver():
+    """Patch sync_playwright so every launch returns a fresh mock browser."""
+    with patch("scraper.pool.sync_playwright") as mock_sp, \
+            patch("scraper.core.find_chromium", return_value=None):
+        driver = mock_sp.return_value.start.return_value
+        driver.chromium.launch.side_effect = lambda **kwargs: MagicMock()
+        yield driver
+
+
+def test_pool_reuses_browser_across_checkouts(mock_driver):
+    pool = BrowserPool(max_size=2, max_uses=10)
+    with pool.context() as first:
+        pass
+    with pool.context() as second:
+        pass
+    assert first is second
+    assert mock_driver.chromium.launch.call_count == 1
+    assert pool.live == 1
+
+
+def test_pool_recycles_after_max_uses(mock_driver):
+    pool = BrowserPool(max_size=2, max_uses=2)
+    contexts = []
+    for _ in range(3):
+        with pool.context() as ctx:
+            contexts.append(ctx)
+    assert contexts[0] is contexts[1]
+    assert contexts[2] is not contexts[0]
+    contexts[0].close.assert_called_once()
+    assert mock_driver.chromium.launch.call_count == 2
+
+
+def test_pool_replaces_unhealthy_browser(mock_driver):
+    pool = BrowserPool(max_size=1, max_uses=10)
+    with pool.context() as first:
+        pass
+    pool._state()["idle"][0].browser.is_connected.return_value = False
+    with pool.context() as second:
+        pass
+    assert second is not first
+    assert mock_driver.chromium.launch.call_count == 2
+    assert pool.live == 1
+
+
+def test_pool_separates_launch_options(mock_driver):
+    pool = BrowserPool(max_size=2, max_uses=10)
+    with pool.context(headless=True) as headless_ctx:
+        pass
+    with pool.context(headless=False) as visible_ctx:
+        pass
+    assert headless_ctx is not visible_ctx
+    assert pool.live == 2
+
+
+def test_pool_installs_resource_blocking_once_per_context(mock_driver):
+    pool = BrowserPool(max_size=2, max_uses=10)
+    with pool.context(block_resources=True) as blocking:
+        pass
+    with pool.context(block_resources=True) as again:
+        pass
+    with pool.context(block_resources=False) as plain:
+        pass
+    assert again is blocking and plain is not blocking
+    blocking.route.assert_called_once()
+    plain.route.assert_not_called()
+
+
+def test_pool_evicts_own_idle_browser_when_full(mock_driver):
+    pool = BrowserPool(max_size=1, max_uses=10)
+    with pool.context(proxy=None) as first:
+        pass
+    with pool.context(proxy="http://proxy:8080") as second:
+        pass
+    assert second is not first
+    first.close.assert_called_once()
+    assert pool.live == 1
+
+
+def test_pool_raises_when_exhausted(mock_driver):
+    pool = BrowserPool(max_size=1, max_uses=10, acquire_timeout=0.05)
+    errors = []
+    with pool.context():
+        def other_thread():
+            try:
+                with pool.context():
+                    pass
+            except RuntimeError as e:
+                errors.append(e)
+        t = threading.Thread(target=other_thread)
+        t.start()
+        t.join()
+    assert len(errors) == 1
+
+
+def test_pool_close_releases_thread_browsers(mock_driver):
+    pool = BrowserPool(max_size=2, max_uses=10)
+    with pool.context() as ctx:
+        pass
+    pool.close()
+    ctx.close.assert_called_once()
+    mock_driver.stop.assert_called_once()
+    assert pool.live == 0
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_with_pool_skips_launch(mock_sp, mock_extract, mock_sleep, mock_driver):
+    mock_extract.return_value = Place(name="Pooled", address="A")
+    pool = BrowserPool(max_size=1, max_uses=10)
+    with pool.context() as ctx:
+        ctx.new_page.return_value.locator.return_value.count.return_value = 1
+        ctx.new_page.return_value.locator.return_value.all.return_value = [MagicMock()]
+        # Selector probes match their first candidate; the feed holds one listing
+        ctx.new_page.return_value.wait_for_function.side_effect = lambda script, **kwargs: MagicMock(
+            **{"json_value.return_value": {"index": 0} if script == _PROBE_SELECTORS_JS
+               else {"count": 1, "ended": True}}
+        )
+
+    result = scrape_places("query", total=1, pool=pool)
+    assert [p.name for p in result] == ["Pooled"]
+    mock_sp.assert_not_called()
+    ctx.close.assert_not_called()
+    ctx.new_page.return_value.close.assert_called_once()
@@ -0,0 +1,143 @@
+"""Tests for the on-disk response cache in scraper/response_cache.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+from unittest.mock import MagicMock, AsyncMock, patch
+from scraper.response_cache import ResponseCache
+
+PLACE_URL = "https://www.google.com/maps/place/Cafe"
+
+
+def _cache(tmp_path, **kwargs):
+    return ResponseCache(cache_dir=str(tmp_path / "cache"), **kwargs)
+
+
+def _route(url=PLACE_URL, resource_type="document", method="GET", route_cls=MagicMock):
+    route = route_cls()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    route.request.method = method
+    return route
+
+
+def test_put_then_get_round_trips_and_drops_transport_headers(tmp_path):
+    cache = _cache(tmp_path)
+    key = cache.key_for("GET", PLACE_URL)
+    cache.put(key, 200, {"content-type": "text/html", "content-encoding": "br", "set-cookie": "a=1"}, b"<html>")
+    hit = cache.get(key)
+    assert hit == {"status": 200, "headers": {"content-type": "text/html"}, "body": b"<html>"}
+    assert cache.stats()["hits"] == 1
+
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put(cache.key_for("GET", "u1"), 200, {}, b"same body")
+    cache.put(cache.key_for("GET", "u2"), 200, {}, b"same body")
+    blobs = [f for _, _, files in os.walk(tmp_path / "cache" / "blobs") for f in files]
+    assert len(blobs) == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = _cache(tmp_path, ttl=60)
+    key = cache.key_for("GET", PLACE_URL)
+    with patch("scraper.response_cache.time.time", return_value=1000.0):
+        cache.put(key, 200, {}, b"old")
+    with patch("scraper.response_cache.time.time", return_value=1100.0):
+        assert cache.get(key) is None
+    stats = cache.stats()
+    assert stats["expired"] == 1 and stats["misses"] == 1 and stats["entries"] == 0
+
+
+def test_evicts_least_recently_used_beyond_size_cap(tmp_path):
+    cache = _cache(tmp_path, max_bytes=10, ttl=float("inf"))
+    keys = [cache.key_for("GET", f"u{i}") for i in range(3)]
+    with patch("scraper.response_cache.time.time", side_effect=[1.0, 1.0, 2.0, 2.0, 3.0]):
+        cache.put(keys[0], 200, {}, b"aaaa")
+        cache.put(keys[1], 200, {}, b"bbbb")
+        cache.get(keys[0])  # keys[1] is now the least recently used
+        cache.put(keys[2], 200, {}, b"cccc")
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_stats_without_index_does_not_create_files(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.stats()["entries"] == 0
+    assert not (tmp_path / "cache").exists()
+
+
+def test_handle_fetches_and_stores_on_miss_then_serves_hit(tmp_path):
+    cache = _cache(tmp_path)
+    first = _route()
+    first.fetch.return_value.status = 200
+    first.fetch.return_value.headers = {"content-type": "text/html"}
+    first.fetch.return_value.body.return_value = b"<html>"
+    cache.handle(first)
+    first.fulfill.assert_called_once_with(response=first.fetch.return_value, body=b"<html>")
+
+    second = _route()
+    cache.handle(second)
+    second.fetch.assert_not_called()
+    second.fulfill.assert_called_once_with(status=200, headers={"content-type": "text/html"}, body=b"<html>")
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_handle_falls_back_for_uncacheable_requests(tmp_path):
+    cache = _cache(tmp_path)
+    for route in (_route(resource_type="image"), _route(method="POST"),
+                  _route(url="https://www.google.com/maps/vt/tile")):
+        cache.handle(route)
+        route.fallback.assert_called_once()
+        route.fetch.assert_not_called()
+
+
+def test_handle_does_not_store_errors(tmp_path):
+    cache = _cache(tmp_path)
+    route = _route()
+    route.fetch.return_value.status = 500
+    route.fetch.return_value.body.return_value = b"oops"
+    cache.handle(route)
+    assert cache.stats()["stores"] == 0
+
+
+def test_handle_passes_redirects_through_uncached(tmp_path):
+    cache = _cache(tmp_path)
+    route = _route()
+    route.fetch.return_value.status = 302
+    route.fetch.return_value.headers = {"location": "https://consent.google.com/m?continue=..."}
+    route.fetch.return_value.body.return_value = b""
+    cache.handle(route)
+    route.fetch.assert_called_once_with(max_redirects=0)
+    route.fulfill.assert_called_once_with(response=route.fetch.return_value, body=b"")
+    assert cache.stats()["stores"] == 0
+
+
+def test_handle_falls_back_when_fetch_fails(tmp_path):
+    cache = _cache(tmp_path)
+    route = _route()
+    route.fetch.side_effect = RuntimeError("net::ERR_PROXY_CONNECTION_FAILED")
+    cache.handle(route)
+    route.fallback.assert_called_once()
+    route.fulfill.assert_not_called()
+
+
+def test_async_handler_falls_back_when_fetch_fails(tmp_path):
+    cache = _cache(tmp_path)
+    route = _route(route_cls=AsyncMock)
+    route.fetch.side_effect = RuntimeError("net::ERR_PROXY_CONNECTION_FAILED")
+    asyncio.run(cache.handle_async(route))
+    route.fallback.assert_awaited_once()
+    route.fulfill.assert_not_called()
+
+
+def test_async_handler_serves_hits(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put(cache.key_for("GET", PLACE_URL), 200, {}, b"cached")
+    route = _route(route_cls=AsyncMock)
+    asyncio.run(cache.handle_async(route))
+    route.fulfill.assert_awaited_once_with(status=200, headers={}, body=b"cached")
@@ -4,8 +4,29 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from unittest.mock import MagicMock, patch, PropertyMock
-from scraper.core import scrape_places, Place
+import pytest
+from unittest.mock import MagicMock, patch
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from scraper.core import (
+    scrape_places, iter_places, iter_places_from_urls, iter_places_by_url, scroll_feed, new_listing_indexes,
+    feed_listings_wanted, Place, ScrapeStats,
+    _PROBE_SELECTORS_JS, _probe_selectors, _dismiss_consent, _find_search_input,
+)
+from scraper.place_cache import PlaceCache
+from scraper.dedup import DedupIndex
+from config import CONSENT_SELECTORS
+from scraper.session import load_storage_state
+
+
+def fake_wait_for_function(feed_state, probe_result=None):
+    """page.wait_for_function stand-in answering each in-page script with a canned result."""
+    probe_result = {"index": 0} if probe_result is None else probe_result
+
+    def wait_for_function(script, arg=None, **kwargs):
+        handle = MagicMock()
+        handle.json_value.return_value = probe_result if script == _PROBE_SELECTORS_JS else feed_state
+        return handle
+    return wait_for_function
 
 
 def _build_mock_playwright(places_to_return, listing_count=None):
@@ -45,6 +66,10 @@ def _build_mock_playwright(places_to_return, listing_count=None):
     place_locator.all.return_value = listing_mocks
 
     mock_page.locator.return_value = place_locator
+    # In-page waits: selector probes find their first candidate, the feed is complete
+    mock_page.wait_for_function.side_effect = fake_wait_for_function(
+        {"count": listing_count, "ended": True}
+    )
 
     return mock_cm, mock_page, places_to_return
 
@@ -65,6 +90,134 @@ def test_scrape_places_returns_list_of_places(mock_sp, mock_extract, mock_sleep)
     assert result[1].name == "Place B"
 
 
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_closes_search_page_before_browser_when_target_is_met(mock_sp, mock_extract, mock_sleep):
+    places = [Place(name=f"Place {i}", address=f"Addr {i}") for i in range(3)]
+    mock_cm, mock_page, _ = _build_mock_playwright(places)
+    mock_sp.return_value = mock_cm
+    mock_extract.side_effect = places
+    context = mock_cm.__enter__.return_value.chromium.launch.return_value.new_context.return_value
+    closed = []
+    mock_page.close.side_effect = lambda: closed.append("page")
+    context.close.side_effect = lambda: closed.append("context")
+
+    assert len(scrape_places("test query", total=2)) == 2
+    assert closed == ["page", "context"]
+
+
+def _build_growing_feed(size, batch=10):
+    """Mocked playwright whose results feed loads `batch` more listings per scroll, up to `size`.
+
+    Returns (mock_pw_cm, mock_page, feed) where feed["loaded"] counts the listings loaded so far.
+    """
+    mock_cm, mock_page, _ = _build_mock_playwright([], listing_count=0)
+    feed = {"loaded": batch}
+    hrefs = [f"https://www.google.com/maps/place/P{i}/data=!1s0x1:0x{i + 1:x}" for i in range(size)]
+    links = [MagicMock() for _ in range(size)]
+
+    def wheel(dx, dy):
+        if dy > 0:
+            feed["loaded"] = min(size, feed["loaded"] + batch)
+
+    def wait_for_function(script, arg=None, **kwargs):
+        handle = MagicMock()
+        if script == _PROBE_SELECTORS_JS:
+            handle.json_value.return_value = {"index": 0}
+            return handle
+        count, ended = feed["loaded"], feed["loaded"] >= size
+        if count <= arg[2] and not ended:
+            raise PlaywrightTimeoutError("feed did not grow")
+        handle.json_value.return_value = {"count": count, "ended": ended}
+        return handle
+
+    mock_page.mouse.wheel.side_effect = wheel
+    mock_page.wait_for_function.side_effect = wait_for_function
+    mock_page.evaluate.side_effect = lambda script, arg=None: hrefs[:feed["loaded"]]
+    mock_page.locator.return_value.all.side_effect = lambda: links[:feed["loaded"]]
+    return mock_cm, mock_page, feed
+
+
+def test_feed_listings_wanted_follows_observed_yield():
+    # Nothing processed yet: the prior yield of 0.8 asks for a few more than total
+    assert feed_listings_wanted(20, 0, 0) == 25
+    # Half the listings were empty or duplicates: ask for about twice the missing places
+    assert feed_listings_wanted(20, 10, 20) == 17
+    assert feed_listings_wanted(20, 19, 20) == 5
+    assert feed_listings_wanted(20, 0, 200) > 20
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_iter_places_stops_scrolling_once_total_is_reached(mock_sp, mock_extract, mock_sleep):
+    mock_cm, mock_page, feed = _build_growing_feed(200)
+    mock_sp.return_value = mock_cm
+    mock_extract.side_effect = lambda page, listing=None, stats=None: Place(name=f"P{mock_extract.call_count}")
+
+    result = scrape_places("test query", total=12, place_cache=False)
+    assert len(result) == 12
+    assert mock_extract.call_count == 12
+    # ceil(12 / 0.8) = 15 listings wanted: two lazy loads, not the whole feed
+    assert feed["loaded"] == 20
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_iter_places_scrolls_further_when_yield_is_low(mock_sp, mock_extract, mock_sleep):
+    mock_cm, mock_page, feed = _build_growing_feed(200)
+    mock_sp.return_value = mock_cm
+    # Every other listing has no name
+    mock_extract.side_effect = lambda page, listing=None, stats=None: Place(
+        name=f"P{mock_extract.call_count}" if mock_extract.call_count % 2 else "")
+    stats = ScrapeStats()
+
+    result = scrape_places("test query", total=12, place_cache=False, stats=stats)
+    assert len(result) == 12
+    assert stats.counters["skipped_no_name"] == 11
+    assert 23 <= feed["loaded"] <= 40
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_iter_places_stops_at_end_of_short_feed(mock_sp, mock_extract, mock_sleep):
+    mock_cm, mock_page, feed = _build_growing_feed(25)
+    mock_sp.return_value = mock_cm
+    mock_extract.side_effect = lambda page, listing=None, stats=None: Place(name=f"P{mock_extract.call_count}")
+    stats = ScrapeStats()
+
+    result = scrape_places("test query", total=50, place_cache=False, stats=stats)
+    assert len(result) == 25
+    assert stats.feed_ended
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_list_mode_reads_cards_without_clicking(mock_sp, mock_extract, mock_sleep):
+    mock_cm, mock_page, _ = _build_mock_playwright([], listing_count=3)
+    mock_sp.return_value = mock_cm
+    mock_page.evaluate.return_value = [
+        {"name": "Card A", "summary": "Bakery · 1 Road", "reviews_average": "4.2"},
+        {"name": "", "summary": "Bakery · 2 Road"},
+        {"name": "Card A", "summary": "Bakery · 1 Road"},
+    ]
+
+    result = scrape_places("test query", total=5, mode="list")
+    assert [(p.name, p.address, p.reviews_average) for p in result] == [("Card A", "1 Road", 4.2)]
+    mock_extract.assert_not_called()
+    for listing in mock_page.locator.return_value.all.return_value:
+        listing.locator.return_value.click.assert_not_called()
+
+
+def test_scrape_places_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        scrape_places("test query", total=5, mode="cards")
+
+
 @patch("scraper.core.time.sleep")
 @patch("scraper.core.extract_place")
 @patch("scraper.core.sync_playwright")
@@ -111,3 +264,342 @@ def test_scrape_places_closes_browser(mock_sp, mock_extract, mock_sleep):
 
     # Verify cleanup happened via context manager __exit__
     mock_cm.__exit__.assert_called_once()
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_parallel_mode_opens_urls_in_order(mock_sp, mock_extract, mock_sleep):
+    p1 = Place(name="First", address="A1")
+    p2 = Place(name="Second", address="A2")
+    p3 = Place(name="Third", address="A3")
+    mock_cm, mock_page, _ = _build_mock_playwright([p1, p2, p3])
+    mock_sp.return_value = mock_cm
+    mock_page.evaluate.return_value = ["u1", "u2", "u3"]
+    mock_extract.side_effect = [p1, p2, p3]
+
+    result = scrape_places("test query", total=3, concurrency=2)
+    assert [p.name for p in result] == ["First", "Second", "Third"]
+    visited = [c.args[0] for c in mock_page.goto.call_args_list[1:]]
+    assert visited == ["u1", "u2", "u3"]
+
+
+@patch("scraper.core.extract_place")
+def test_iter_places_from_urls_limits_open_tabs(mock_extract):
+    context = MagicMock()
+    mock_extract.side_effect = [Place(name=str(i)) for i in range(5)]
+
+    result = list(iter_places_from_urls(context, [f"u{i}" for i in range(5)], concurrency=3))
+    assert [p.name for p in result] == ["0", "1", "2", "3", "4"]
+    assert context.new_page.call_count == 3
+
+
+@patch("scraper.core.extract_place")
+def test_iter_places_from_urls_skips_failed_navigation(mock_extract):
+    context = MagicMock()
+    tab = context.new_page.return_value
+    tab.goto.side_effect = [Exception("net error"), None]
+    mock_extract.return_value = Place(name="Loaded")
+
+    result = list(iter_places_from_urls(context, ["bad", "good"], concurrency=1))
+    assert [p.name for p in result] == ["Loaded"]
+    tab.close.assert_called_once()
+
+
+@patch("scraper.core.extract_place")
+def test_iter_places_from_urls_pairs_places_with_their_input_url(mock_extract):
+    context = MagicMock()
+    context.new_page.return_value.goto.side_effect = [Exception("net error"), None, None]
+    mock_extract.side_effect = [Place(name="B"), Place(name="C")]
+
+    result = list(iter_places_from_urls(context, ["a", "b", "c"], concurrency=1, with_urls=True))
+    assert [(url, p.name) for url, p in result] == [("b", "B"), ("c", "C")]
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_serves_fresh_places_from_cache(mock_sp, mock_extract, mock_sleep, tmp_path):
+    cache = PlaceCache(db_path=str(tmp_path / "places.sqlite3"))
+    cache.put(Place(name="Cached", address="1 Road", place_id="ChIJ" + "a" * 20))
+    mock_cm, mock_page, _ = _build_mock_playwright([], listing_count=2)
+    mock_sp.return_value = mock_cm
+    mock_page.evaluate.return_value = [
+        "https://www.google.com/maps/place/A/data=!19sChIJ" + "a" * 20,
+        "https://www.google.com/maps/place/B/data=!19sChIJ" + "b" * 20,
+    ]
+    mock_extract.return_value = Place(name="Fresh", address="2 Road")
+    stats = ScrapeStats()
+
+    result = scrape_places("test query", total=2, place_cache=cache, stats=stats)
+    assert [p.name for p in result] == ["Cached", "Fresh"]
+    assert mock_extract.call_count == 1
+    assert (stats.cache_hits, stats.scraped) == (1, 1)
+    # The fresh place is stored under the ID parsed from its href
+    assert cache.get("ChIJ" + "b" * 20).name == "Fresh"
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_parallel_mode_skips_cached_urls(mock_sp, mock_extract, mock_sleep, tmp_path):
+    cache = PlaceCache(db_path=str(tmp_path / "places.sqlite3"), max_age=3600)
+    cache.put(Place(name="Cached", place_id="0xa:0xb"))
+    mock_cm, mock_page, _ = _build_mock_playwright([], listing_count=2)
+    mock_sp.return_value = mock_cm
+    fresh_href = "https://g/maps/place/B/data=!1s0xc:0xd!19sChIJ" + "b" * 20
+    mock_page.evaluate.return_value = ["https://g/maps/place/A/data=!1s0xa:0xb", fresh_href]
+    # Maps rewrites the address bar after load, dropping the place ID
+    mock_page.url = "https://g/maps/place/B/data=!1s0xc:0xd"
+    mock_extract.return_value = Place(name="Fresh")
+
+    result = scrape_places("test query", total=2, concurrency=2, place_cache=cache)
+    assert [p.name for p in result] == ["Cached", "Fresh"]
+    assert [c.args[0] for c in mock_page.goto.call_args_list][-1] == fresh_href
+    # Stored under the ID of the requested URL, as the other modes do
+    assert result[1].place_id == "ChIJ" + "b" * 20
+    assert cache.get("ChIJ" + "b" * 20).name == "Fresh"
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_skips_known_listings_before_clicking(mock_sp, mock_extract, mock_sleep):
+    dedup = DedupIndex()
+    dedup.add(Place(name="Known", place_id="ChIJ" + "a" * 20))
+    mock_cm, mock_page, _ = _build_mock_playwright([], listing_count=2)
+    mock_sp.return_value = mock_cm
+    mock_page.evaluate.return_value = [
+        "https://www.google.com/maps/place/A/data=!19sChIJ" + "a" * 20,
+        "https://www.google.com/maps/place/B/data=!19sChIJ" + "b" * 20,
+    ]
+    mock_extract.return_value = Place(name="Fresh", address="2 Road")
+    stats = ScrapeStats()
+
+    result = scrape_places("test query", total=2, stats=stats, dedup=dedup, place_cache=False)
+    assert [p.name for p in result] == ["Fresh"]
+    assert mock_extract.call_count == 1
+    assert stats.counters["duplicate"] == 1
+    assert dedup.seen(href="/maps/place/B/data=!19sChIJ" + "b" * 20)
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_parallel_mode_skips_known_urls(mock_sp, mock_extract, mock_sleep):
+    dedup = DedupIndex()
+    dedup.add(Place(name="Known", place_id="0xa:0xb"))
+    mock_cm, mock_page, _ = _build_mock_playwright([], listing_count=2)
+    mock_sp.return_value = mock_cm
+    mock_page.evaluate.return_value = ["https://g/maps/place/A/data=!1s0xa:0xb", "https://g/maps/place/B"]
+    mock_extract.return_value = Place(name="Fresh")
+
+    result = scrape_places("test query", total=2, concurrency=2, dedup=dedup, place_cache=False)
+    assert [p.name for p in result] == ["Fresh"]
+    opened = [c.args[0] for c in mock_page.goto.call_args_list]
+    assert opened[-1] == "https://g/maps/place/B"
+    assert "https://g/maps/place/A/data=!1s0xa:0xb" not in opened
+
+
+FEATURE_HREF = "https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x1a:0x2b!8m2!3d43.6!4d-79.3"
+
+
+def test_new_listing_indexes_drops_repeats_and_known_places():
+    dedup = DedupIndex()
+    dedup.add(Place(name="Known", place_id="0x9:0x9"))
+    hrefs = [
+        FEATURE_HREF + "!19sChIJ" + "a" * 20,
+        "https://www.google.com/maps/place/B/data=!1s0x3c:0x4d",
+        FEATURE_HREF,                                  # A again, without its place ID
+        "https://www.google.com/maps/place/Known/data=!1s0x9:0x9",
+        "https://www.google.com/maps/place/NoId",
+        "https://www.google.com/maps/place/NoId",
+    ]
+    stats = ScrapeStats()
+    assert new_listing_indexes(hrefs, dedup, stats) == [0, 1, 4, 5]
+    assert stats.counters["duplicate"] == 2
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_clicks_repeated_feed_listing_once(mock_sp, mock_extract, mock_sleep):
+    mock_cm, mock_page, _ = _build_mock_playwright([], listing_count=3)
+    mock_sp.return_value = mock_cm
+    mock_page.evaluate.return_value = [FEATURE_HREF, "https://www.google.com/maps/place/B/data=!1s0x3c:0x4d",
+                                       FEATURE_HREF + "!19sChIJ" + "a" * 20]
+    mock_extract.side_effect = [Place(name="A", address="1 Road"), Place(name="B", address="2 Road")]
+    stats = ScrapeStats()
+
+    result = scrape_places("test query", total=3, stats=stats, place_cache=False)
+    assert [p.name for p in result] == ["A", "B"]
+    assert mock_extract.call_count == 2
+    assert stats.counters["duplicate"] == 1
+
+
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_iter_places_by_url_skips_search(mock_sp, mock_extract):
+    mock_cm, mock_page, _ = _build_mock_playwright([])
+    mock_sp.return_value = mock_cm
+    mock_extract.side_effect = [Place(name="A"), Place(name=""), Place(name="C")]
+
+    result = list(iter_places_by_url(["/maps/place/A", "ChIJN1t_tDeuEmsRUsoyG83frY4", "/maps/place/C"],
+                                     concurrency=2))
+    assert [p.name for p in result] == ["A", "C"]
+    opened = [c.args[0] for c in mock_page.goto.call_args_list]
+    assert opened[0] == "https://www.google.com/maps/place/A"
+    assert "https://www.google.com/maps/@" not in " ".join(opened)
+    mock_page.keyboard.press.assert_not_called()
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_iter_places_yields_before_all_listings_are_done(mock_sp, mock_extract, mock_sleep):
+    p1 = Place(name="Early", address="A")
+    p2 = Place(name="Late", address="B")
+    mock_cm, _, _ = _build_mock_playwright([p1, p2])
+    mock_sp.return_value = mock_cm
+    mock_extract.side_effect = [p1, p2]
+
+    gen = iter_places("test query", total=2)
+    assert next(gen).name == "Early"
+    assert mock_extract.call_count == 1
+    assert next(gen).name == "Late"
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_iter_places_closing_early_closes_browser(mock_sp, mock_extract, mock_sleep):
+    p1 = Place(name="Only", address="A")
+    p2 = Place(name="Never", address="B")
+    mock_cm, _, _ = _build_mock_playwright([p1, p2])
+    mock_sp.return_value = mock_cm
+    mock_extract.side_effect = [p1, p2]
+    browser = mock_cm.__enter__.return_value.chromium.launch.return_value
+
+    gen = iter_places("test query", total=2)
+    next(gen)
+    gen.close()
+    browser.close.assert_called_once()
+    mock_cm.__exit__.assert_called_once()
+    assert mock_extract.call_count == 1
+
+
+def _scroll_page(states):
+    """Page whose feed-state waits resolve to `states` in order (None = timeout)."""
+    page = MagicMock()
+
+    def wait_for_function(*args, **kwargs):
+        state = states.pop(0)
+        if state is None:
+            raise PlaywrightTimeoutError("timeout")
+        handle = MagicMock()
+        handle.json_value.return_value = state
+        return handle
+
+    page.wait_for_function.side_effect = wait_for_function
+    return page
+
+
+def test_scroll_feed_stops_at_end_of_list_marker():
+    page = _scroll_page([{"count": 5, "ended": False}, {"count": 9, "ended": True}])
+    assert scroll_feed(page, target=50) == (9, True)
+    assert page.mouse.wheel.call_count == 1
+    page.wait_for_timeout.assert_not_called()
+
+
+def test_scroll_feed_stops_at_target():
+    page = _scroll_page([{"count": 5, "ended": False}, {"count": 12, "ended": False}])
+    assert scroll_feed(page, target=10) == (12, False)
+
+
+def test_scroll_feed_gives_up_after_max_no_change(monkeypatch):
+    monkeypatch.setattr("scraper.core.MAX_NO_CHANGE_SCROLLS", 3)
+    page = _scroll_page([{"count": 5, "ended": False}, None, None, None])
+    assert scroll_feed(page, target=50) == (5, False)
+    page.wait_for_timeout.assert_not_called()
+
+
+# ---------- selector probing ----------
+
+def test_probe_selectors_checks_all_candidates_in_one_wait():
+    page = MagicMock()
+    page.wait_for_function.return_value.json_value.return_value = {"index": 2}
+    assert _probe_selectors(page, ["a", "b", "c"], timeout=500) == 2
+    page.wait_for_function.assert_called_once()
+    assert page.wait_for_function.call_args.kwargs["arg"] == ["a", "b", "c"]
+
+
+def test_dismiss_consent_returns_at_once_when_no_dialog():
+    page = MagicMock()
+    page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+    _dismiss_consent(page)
+    page.wait_for_function.assert_called_once()
+    page.locator.assert_not_called()
+
+
+def test_dismiss_consent_clicks_matching_selector():
+    page = MagicMock()
+    page.wait_for_function.return_value.json_value.return_value = {"index": 1}
+    _dismiss_consent(page)
+    page.locator.assert_called_once_with(CONSENT_SELECTORS[1])
+    page.locator.return_value.first.click.assert_called_once()
+
+
+def test_find_search_input_raises_when_nothing_matches():
+    page = MagicMock()
+    page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+    with pytest.raises(Exception, match="Could not find search input"):
+        _find_search_input(page)
+
+
+CONSENT_COOKIES = [{"name": "SOCS", "value": "x", "domain": ".google.com"}]
+
+
+@patch("scraper.core._dismiss_consent")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_saves_state_and_skips_consent_probe_when_cookie_present(mock_sp, mock_extract, mock_dismiss,
+                                                                         session_state_dir):
+    mock_cm, mock_page, _ = _build_mock_playwright([], listing_count=1)
+    mock_sp.return_value = mock_cm
+    context = mock_cm.__enter__.return_value.chromium.launch.return_value.new_context.return_value
+    context.cookies.return_value = CONSENT_COOKIES
+    context.storage_state.return_value = {"cookies": CONSENT_COOKIES, "origins": []}
+    mock_extract.return_value = Place(name="A")
+
+    scrape_places("query", total=1)
+    mock_dismiss.assert_not_called()
+    assert load_storage_state() is not None
+
+
+@patch("scraper.core.time.sleep")
+@patch("scraper.core.extract_place")
+@patch("scraper.core.sync_playwright")
+def test_scrape_places_opens_start_url_and_times_phases(mock_sp, mock_extract, mock_sleep):
+    p1 = Place(name="Place A", address="Addr A")
+    mock_cm, mock_page, _ = _build_mock_playwright([p1])
+    mock_sp.return_value = mock_cm
+    mock_extract.side_effect = [p1]
+    stats = ScrapeStats()
+
+    scrape_places("test query", total=1, stats=stats, start_url="http://127.0.0.1:8000/")
+    assert mock_page.goto.call_args[0][0] == "http://127.0.0.1:8000/"
+    assert set(stats.phase_seconds) == {"launch", "navigation", "consent", "search", "scroll", "click", "extract"}
+    assert stats.phase_counts["click"] == 1 and stats.phase_counts["extract"] == 1
+    assert all(seconds >= 0 for seconds in stats.phase_seconds.values())
+
+
+def test_scrape_stats_phase_accumulates():
+    stats = ScrapeStats()
+    with stats.phase("scroll"):
+        pass
+    stats.add_time("scroll", 1.5)
+    with pytest.raises(RuntimeError):
+        with stats.phase("extract"):
+            raise RuntimeError("boom")
+    assert stats.phase_seconds["scroll"] >= 1.5
+    assert "extract" in stats.phase_seconds
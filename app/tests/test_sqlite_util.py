@@ -0,0 +1,24 @@
+"""Tests for the lazily opened SQLite helper (scraper.sqlite_util)."""
+
+from scraper.sqlite_util import LazySQLite
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY);"
+
+
+def test_reads_do_not_create_the_database(tmp_path):
+    path = tmp_path / "nested" / "items.sqlite3"
+    db = LazySQLite(str(path), _SCHEMA)
+    assert db(create=False) is None
+    assert not path.exists()
+
+
+def test_first_write_creates_file_and_schema_once(tmp_path):
+    path = tmp_path / "nested" / "items.sqlite3"
+    db = LazySQLite(str(path), _SCHEMA)
+    conn = db()
+    conn.execute("INSERT INTO items (key) VALUES ('a')")
+    conn.commit()
+    assert path.exists()
+    assert db(create=False) is conn
+    # A second instance opens the existing file and keeps its rows
+    assert LazySQLite(str(path), _SCHEMA)(create=False).execute("SELECT key FROM items").fetchall() == [("a",)]
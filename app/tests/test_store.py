@@ -0,0 +1,161 @@
+"""Tests for the result stores in api/store.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from api.store import MemoryResultStore, ResultStore, SQLiteResultStore, create_result_store
+
+
+def _record(status="running", results=None):
+    return {
+        "status": status,
+        "query": "test",
+        "results": results or [],
+        "start_time": datetime(2024, 1, 1, 12, 0),
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryResultStore(ttl=3600, max_finished=10)
+    return SQLiteResultStore(db_path=str(tmp_path / "results.sqlite3"))
+
+
+def test_store_roundtrip(store):
+    store["s1"] = _record()
+    assert "s1" in store
+    assert store["s1"]["start_time"] == datetime(2024, 1, 1, 12, 0)
+    assert len(store) == 1
+
+
+def test_store_update_and_append(store):
+    store["s1"] = _record()
+    store.update("s1", status="completed")
+    store.append_results("s1", [{"name": "A"}])
+    store.append_results("s1", [{"name": "B"}])
+    record = store.get("s1")
+    assert record["status"] == "completed"
+    assert [r["name"] for r in record["results"]] == ["A", "B"]
+
+
+def test_store_summary_and_results_since(store):
+    store["s1"] = _record(results=[{"name": "A"}])
+    store.append_results("s1", [{"name": "B"}, {"name": "C"}])
+    summary = store.summary("s1")
+    assert "results" not in summary
+    assert summary["results_count"] == 3
+    assert summary["start_time"] == datetime(2024, 1, 1, 12, 0)
+    assert [r["name"] for r in store.results("s1", 1)] == ["B", "C"]
+    assert store.results("s1", 3) == []
+    assert store.summary("missing") is None
+    store.update("s1", results=[{"name": "Z"}])
+    assert store.summary("s1")["results_count"] == 1
+
+
+def test_append_to_missing_record_is_ignored(store):
+    store.append_results("missing", [{"name": "A"}])
+    assert "missing" not in store
+
+
+def test_result_store_is_abstract():
+    with pytest.raises(TypeError):
+        ResultStore()
+
+
+def test_store_missing_and_delete(store):
+    assert store.get("missing") is None
+    assert "missing" not in store
+    with pytest.raises(KeyError):
+        store.update("missing", status="completed")
+    store["s1"] = _record()
+    del store["s1"]
+    assert "s1" not in store
+
+
+def test_store_clear(store):
+    store["s1"] = _record()
+    store["s2"] = _record()
+    store.clear()
+    assert len(store) == 0
+
+
+def test_memory_store_evicts_finished_after_ttl():
+    store = MemoryResultStore(ttl=60, max_finished=10)
+    with patch("api.store.time.monotonic", return_value=1000.0):
+        store["done"] = _record(status="completed")
+        store["busy"] = _record(status="running")
+    with patch("api.store.time.monotonic", return_value=1061.0):
+        assert store.get("done") is None
+        assert store.get("busy") is not None
+
+
+def test_memory_store_lru_keeps_running_searches():
+    store = MemoryResultStore(ttl=3600, max_finished=2)
+    store["running"] = _record(status="running")
+    store["a"] = _record(status="completed")
+    store["b"] = _record(status="completed")
+    store.get("a")  # "b" is now least recently used
+    store["c"] = _record(status="completed")
+    assert "running" in store
+    assert "a" in store
+    assert "c" in store
+    assert "b" not in store
+
+
+def test_memory_store_spills_evicted_records_to_disk(tmp_path):
+    disk = SQLiteResultStore(db_path=str(tmp_path / "spill.sqlite3"))
+    store = MemoryResultStore(ttl=3600, max_finished=1, spill=disk)
+    store["old"] = _record(status="completed", results=[{"name": "Kept"}])
+    store["new"] = _record(status="completed")
+    assert len(store) == 1
+    assert store["old"]["results"] == [{"name": "Kept"}]
+    store.update("old", status="error")
+    assert disk.get("old")["status"] == "error"
+
+
+def test_sqlite_store_purges_old_finished_records(tmp_path):
+    store = SQLiteResultStore(db_path=str(tmp_path / "results.sqlite3"), ttl=60)
+    with patch("api.store.time.time", return_value=1000.0):
+        store["done"] = _record(status="completed")
+        store["busy"] = _record(status="running")
+    with patch("api.store.time.time", return_value=1100.0):
+        store["new"] = _record(status="running")
+    assert "done" not in store
+    assert "busy" in store
+
+
+def test_sqlite_store_appends_rows_without_rewriting_the_record(tmp_path):
+    store = SQLiteResultStore(db_path=str(tmp_path / "results.sqlite3"))
+    store["s1"] = _record()
+    with patch.object(store, "_write_record") as write_record:
+        store.append_results("s1", [{"name": "A"}])
+        store.append_results("s1", [{"name": "B"}])
+    write_record.assert_not_called()
+    assert [r["name"] for r in store.get("s1")["results"]] == ["A", "B"]
+
+
+def test_sqlite_store_purge_drops_result_rows(tmp_path):
+    store = SQLiteResultStore(db_path=str(tmp_path / "results.sqlite3"), ttl=60)
+    with patch("api.store.time.time", return_value=1000.0):
+        store["done"] = _record(status="completed", results=[{"name": "A"}])
+    with patch("api.store.time.time", return_value=1100.0):
+        store["new"] = _record(status="running")
+    assert store.results("done") == []
+
+
+def test_sqlite_store_reads_nothing_before_first_write(tmp_path):
+    path = tmp_path / "never.sqlite3"
+    store = SQLiteResultStore(db_path=str(path))
+    assert store.get("x") is None
+    assert len(store) == 0
+    assert not path.exists()
+
+
+def test_create_result_store_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        create_result_store("redis")
@@ -0,0 +1,149 @@
+"""Tests for the grid-tiling search."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from config import MAPS_START_URL
+from scraper.core import Place, ScrapeStats
+from scraper.tiling import Cell, grid_cells, iter_places_tiled, parse_bbox, viewport_span
+
+TORONTO = (43.58, -79.64, 43.86, -79.12)
+_VIEWPORT_URL_RE = re.compile(r"^https://www\.google\.com/maps/@-?[\d.]+,-?[\d.]+,[\d.]+z\?$")
+
+
+def test_parse_bbox_accepts_string_and_sequence():
+    assert parse_bbox("43.58,-79.64,43.86,-79.12") == TORONTO
+    assert parse_bbox(list(TORONTO)) == TORONTO
+
+
+@pytest.mark.parametrize("bad", ["1,2,3", "a,b,c,d", "10,0,5,1", "0,10,1,5", "-91,0,0,1"])
+def test_parse_bbox_rejects_bad_boxes(bad):
+    with pytest.raises(ValueError):
+        parse_bbox(bad)
+
+
+def test_grid_cells_cover_bbox_with_viewport_sized_cells():
+    cells = grid_cells(TORONTO, zoom=14)
+    lat_span, lng_span = viewport_span(14, (TORONTO[0] + TORONTO[2]) / 2)
+    assert len(cells) > 1
+    assert all(c.north - c.south <= lat_span + 1e-9 and c.east - c.west <= lng_span + 1e-9 for c in cells)
+    assert min(c.south for c in cells) == TORONTO[0] and max(c.north for c in cells) == pytest.approx(TORONTO[2])
+    area = sum((c.north - c.south) * (c.east - c.west) for c in cells)
+    assert area == pytest.approx((TORONTO[2] - TORONTO[0]) * (TORONTO[3] - TORONTO[1]))
+    assert len(grid_cells(TORONTO, zoom=12)) < len(cells)
+
+
+def test_grid_cells_refuses_too_many_cells():
+    with pytest.raises(ValueError):
+        grid_cells(TORONTO, zoom=18, max_cells=50)
+
+
+def test_cell_url_matches_start_url_format_and_subdivides():
+    assert _VIEWPORT_URL_RE.match(MAPS_START_URL)
+    cell = Cell(43.0, -80.0, 44.0, -79.0, 13)
+    assert cell.url() == "https://www.google.com/maps/@43.5000000,-79.5000000,13z?"
+    quarters = cell.subdivide()
+    assert [q.zoom for q in quarters] == [14] * 4 and all(q.depth == 1 for q in quarters)
+    assert sum((q.north - q.south) * (q.east - q.west) for q in quarters) == pytest.approx(1.0)
+
+
+def _fake_iter_places(capped_zooms=(), places_per_cell=3, shared=("shared",), marker_at_cap=False):
+    """iter_places stand-in: each cell yields its own places plus `shared` ones (deduplicated
+    through the shared index, as iter_places does); cells at capped zooms are capped, with
+    the end-of-list marker shown if `marker_at_cap`."""
+    calls = []
+    lock = threading.Lock()
+
+    def fake(query, total, stats=None, start_url=None, dedup=None, **kwargs):
+        zoom = float(start_url.rsplit(",", 1)[1].rstrip("z?"))
+        with lock:
+            calls.append((start_url, zoom, threading.current_thread().name))
+        stats.feed_listings = 120 if zoom in capped_zooms else places_per_cell
+        stats.feed_ended = marker_at_cap or zoom not in capped_zooms
+        stats.scraped += places_per_cell
+        places = [Place(name=f"{start_url} {i}", place_id=f"{start_url}#{i}") for i in range(places_per_cell)]
+        places += [Place(name=place_id, place_id=place_id) for place_id in shared]
+        for place in places:
+            if dedup.add(place):
+                yield place
+            else:
+                stats.count("duplicate")
+    return fake, calls
+
+
+@patch("scraper.tiling.iter_places")
+def test_tiled_search_merges_cells_with_global_dedup(mock_iter):
+    fake, calls = _fake_iter_places()
+    mock_iter.side_effect = fake
+    cells = grid_cells(TORONTO, zoom=13)
+    stats = ScrapeStats()
+
+    places = list(iter_places_tiled("shops", TORONTO, zoom=13, stats=stats, place_cache=False))
+    assert len(calls) == len(cells)
+    assert len(places) == 3 * len(cells) + 1
+    assert len({p.place_id for p in places}) == len(places)
+    assert stats.counters["duplicate"] == len(cells) - 1
+    assert stats.scraped == 3 * len(cells)
+    assert all(name.startswith("tile") for _, _, name in calls)
+
+
+@patch("scraper.tiling.iter_places")
+def test_tiled_search_subdivides_capped_cells_up_to_max_depth(mock_iter):
+    fake, calls = _fake_iter_places(capped_zooms=(12, 13))
+    mock_iter.side_effect = fake
+    bbox = (43.60, -79.40, 43.62, -79.38)
+    assert len(grid_cells(bbox, zoom=12)) == 1
+
+    stats = ScrapeStats()
+    list(iter_places_tiled("shops", bbox, zoom=12, max_depth=1, stats=stats, place_cache=False))
+    assert sorted(zoom for _, zoom, _ in calls) == [12, 13, 13, 13, 13]
+    assert stats.counters["cell_subdivided"] == 1
+    assert stats.counters["cell_capped"] == 4
+
+
+@patch("scraper.tiling.iter_places")
+def test_tiled_search_subdivides_capped_cells_with_end_marker(mock_iter):
+    # Maps shows "You've reached the end of the list" at the cap too
+    fake, calls = _fake_iter_places(capped_zooms=(12,), marker_at_cap=True)
+    mock_iter.side_effect = fake
+    bbox = (43.60, -79.40, 43.62, -79.38)
+
+    stats = ScrapeStats()
+    list(iter_places_tiled("shops", bbox, zoom=12, max_depth=1, stats=stats, place_cache=False))
+    assert sorted(zoom for _, zoom, _ in calls) == [12, 13, 13, 13, 13]
+    assert stats.counters["cell_subdivided"] == 1
+    assert "cell_capped" not in stats.counters
+
+
+@patch("scraper.tiling.iter_places")
+def test_tiled_search_skips_queued_cells_once_total_is_reached(mock_iter):
+    def fake(query, total, **kwargs):
+        for i in range(10):
+            yield Place(name=f"{query} {i}", place_id=str(i))
+        # Hold the worker until the consumer has stopped
+        time.sleep(0.1)
+    mock_iter.side_effect = fake
+    # One worker for two cells: the second is still queued when the target is reached
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        places = list(iter_places_tiled("shops", TORONTO, zoom=13, total=5, cell_concurrency=2,
+                                        executor=executor, place_cache=False))
+    assert len(places) == 5
+    assert mock_iter.call_count == 1
+
+
+@patch("scraper.tiling.iter_places")
+def test_tiled_search_stops_at_total(mock_iter):
+    fake, calls = _fake_iter_places(places_per_cell=10)
+    mock_iter.side_effect = fake
+
+    places = list(iter_places_tiled("shops", TORONTO, zoom=13, total=5, cell_concurrency=1, place_cache=False))
+    assert len(places) == 5
@@ -0,0 +1,100 @@
+"""Tests for the streaming Place writers in scraper/writers.py."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import csv
+import json
+import pytest
+from scraper.core import Place, save_places_to_csv
+from scraper.writers import (
+    PLACE_FIELDS, CsvPlaceWriter, JsonlPlaceWriter, open_place_writer,
+)
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_csv_writer_keeps_constant_columns(tmp_path, sample_place):
+    path = str(tmp_path / "out.csv")
+    with CsvPlaceWriter(path) as writer:
+        writer.write(sample_place)
+        writer.write(Place(name="Other", address="2 Side St", store_shopping="Yes"))
+    rows = _read_csv(path)
+    assert rows[0] == PLACE_FIELDS
+    assert len(rows) == 3
+    assert rows[2][PLACE_FIELDS.index("reviews_count")] == ""
+
+
+def test_csv_writer_append_writes_header_once(tmp_path):
+    path = str(tmp_path / "out.csv")
+    with CsvPlaceWriter(path) as writer:
+        writer.write(Place(name="First"))
+    with CsvPlaceWriter(path, append=True) as writer:
+        writer.write(Place(name="Second"))
+    rows = _read_csv(path)
+    assert [r[0] for r in rows] == ["name", "First", "Second"]
+
+
+def test_csv_writer_append_rejects_mismatched_header(tmp_path):
+    path = tmp_path / "old.csv"
+    path.write_text("name,address\nA,B\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        CsvPlaceWriter(str(path), append=True)
+
+
+def test_csv_writer_flushes_periodically(tmp_path):
+    path = str(tmp_path / "out.csv")
+    writer = CsvPlaceWriter(path, flush_every=2)
+    writer.write(Place(name="A"))
+    writer.write(Place(name="B"))
+    assert len(_read_csv(path)) == 3
+    writer.close()
+
+
+def test_jsonl_writer(tmp_path, sample_place):
+    path = str(tmp_path / "out.jsonl")
+    with JsonlPlaceWriter(path) as writer:
+        writer.write(sample_place)
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert rows[0]["name"] == "Test Store"
+    assert rows[0]["reviews_count"] == 42
+    assert list(rows[0]) == PLACE_FIELDS
+
+
+def test_open_place_writer_infers_format(tmp_path):
+    with open_place_writer(str(tmp_path / "out.ndjson")) as writer:
+        assert isinstance(writer, JsonlPlaceWriter)
+    with open_place_writer(str(tmp_path / "out.txt")) as writer:
+        assert isinstance(writer, CsvPlaceWriter)
+    with pytest.raises(ValueError):
+        open_place_writer(str(tmp_path / "out.csv"), fmt="xml")
+
+
+def test_parquet_writer(tmp_path, sample_place):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "out.parquet")
+    with open_place_writer(path, flush_every=1) as writer:
+        writer.write(sample_place)
+        writer.write(Place(name="No reviews"))
+    table = pq.read_table(path)
+    assert table.column_names == PLACE_FIELDS
+    assert table.column("reviews_count").to_pylist() == [42, None]
+
+
+def test_save_places_to_csv_skips_empty_list(tmp_path):
+    path = tmp_path / "empty.csv"
+    save_places_to_csv([], str(path))
+    assert not path.exists()
+
+
+def test_save_places_to_csv_writes_all_columns(tmp_path, sample_place):
+    path = str(tmp_path / "out.csv")
+    save_places_to_csv([sample_place], path)
+    rows = _read_csv(path)
+    assert rows[0] == PLACE_FIELDS
+    assert rows[1][0] == "Test Store"